@@ -0,0 +1,321 @@
+import argparse
+import json
+import traceback
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import startup
+from batcher import MicroBatcher
+from cache import PredictionCache
+from metrics import CONTENT_TYPE, cache_collector, metrics, near_duplicate_collector
+from near_duplicates import NearDuplicateIndex
+from backends import BACKENDS, MODEL_BACKEND, default_model_path
+from pipeline import WINDOW_COMBINE_RULES, model_version, setup_nltk, stop_words
+from prefork import configure_threads, default_threads, listen, run_workers
+from registry import RELOAD_INTERVAL, SHADOW_METRICS, ModelManager, ModelRegistry
+from vocab import VOCAB_PATH
+
+# Batas jumlah teks dalam satu permintaan /predict/batch
+MAX_BATCH_TEXTS = 256
+
+# Antrean koneksi yang menunggu accept(); default socketserver (5) membuat koneksi
+# bersamaan ditolak dengan reset saat beban tinggi
+LISTEN_BACKLOG = 128
+
+UNPROCESSABLE_MESSAGE = "Teks tidak dapat diproses. Pastikan teks relevan dan mengandung kata-kata yang bermakna."
+
+TIMEOUT_MESSAGE = "Server sedang sibuk, prediksi tidak selesai tepat waktu. Silakan coba lagi."
+
+INTERNAL_ERROR_MESSAGE = "Terjadi kesalahan saat memproses permintaan."
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """
+    Endpoint HTTP tanpa UI untuk prediksi hoax
+
+    GET  /health         -> status server
+    GET  /stats          -> penghitung cache prediksi, indeks near-duplicate dan versi model / shadow
+    GET  /metrics        -> metrik Prometheus (latensi per tahap, cache, fallback)
+    POST /predict        -> {"text": "..."}
+    POST /predict/batch  -> {"texts": ["...", "..."]}
+    POST /explain        -> {"text": "..."} token yang paling memengaruhi skor (oklusi)
+    """
+
+    batcher = None
+    detector = None
+    request_timeout = 30.0
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            return None
+        if length < 0:
+            return None
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            # Dibaca dari detector setiap kali: dengan registry, cache berganti bersama versi model
+            cache, near_duplicates = self.detector.cache, self.detector.near_duplicates
+            self._send_json(200, {
+                "prediction_cache": cache.stats() if cache is not None else None,
+                "near_duplicates": near_duplicates.stats() if near_duplicates is not None else None,
+                "model": self.detector.stats() if isinstance(self.detector, ModelManager) else None,
+            })
+        elif self.path == "/metrics":
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": "Endpoint tidak ditemukan"})
+
+    def do_POST(self):
+        payload = self._read_json()
+        if not isinstance(payload, dict):
+            # Sisa body yang tidak valid tidak boleh terbaca sebagai permintaan berikutnya
+            self.close_connection = True
+            self._send_json(400, {"error": "Body harus berupa objek JSON"})
+            return
+        try:
+            self._dispatch(payload)
+        except FutureTimeoutError:
+            self._send_json(503, {"error": TIMEOUT_MESSAGE})
+        except Exception:
+            traceback.print_exc()
+            self._send_json(500, {"error": INTERNAL_ERROR_MESSAGE})
+
+    def _dispatch(self, payload):
+        if self.path == "/predict":
+            text = payload.get("text")
+            if not isinstance(text, str) or not text.strip():
+                self._send_json(400, {"error": "Field 'text' wajib diisi"})
+                return
+            result = self.batcher.predict(text, timeout=self.request_timeout)
+            if result is None:
+                self._send_json(422, {"error": UNPROCESSABLE_MESSAGE})
+            else:
+                self._send_json(200, result)
+
+        elif self.path == "/explain":
+            text = payload.get("text")
+            if not isinstance(text, str) or not text.strip():
+                self._send_json(400, {"error": "Field 'text' wajib diisi"})
+                return
+            # Satu panggilan model untuk semua varian, dijalankan langsung tanpa MicroBatcher
+            explanation = self.detector.explain(text)
+            if explanation is None:
+                self._send_json(422, {"error": UNPROCESSABLE_MESSAGE})
+            else:
+                self._send_json(200, explanation)
+
+        elif self.path == "/predict/batch":
+            texts = payload.get("texts")
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                self._send_json(400, {"error": "Field 'texts' harus berupa daftar string"})
+                return
+            if len(texts) > MAX_BATCH_TEXTS:
+                self._send_json(413, {"error": f"Maksimal {MAX_BATCH_TEXTS} teks per permintaan"})
+                return
+            results = self.batcher.predict_many(texts, timeout=self.request_timeout)
+            self._send_json(200, {
+                "results": [r if r is not None else {"error": UNPROCESSABLE_MESSAGE} for r in results]
+            })
+
+        else:
+            self._send_json(404, {"error": "Endpoint tidak ditemukan"})
+
+    def log_message(self, format, *args):
+        pass
+
+class APIServer(ThreadingHTTPServer):
+    request_queue_size = LISTEN_BACKLOG
+    daemon_threads = True
+
+def create_server(detector, host="127.0.0.1", port=8000, max_batch_size=32, max_wait_ms=10.0, sock=None):
+    """
+    Membuat server HTTP yang berbagi satu MicroBatcher untuk semua koneksi; sock diisi
+    socket yang sudah listen (diwarisi dari proses induk pada mode prefork)
+    """
+    handler = type("BoundPredictionHandler", (PredictionHandler,), {
+        "batcher": MicroBatcher(detector.predict_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms),
+        "detector": detector,
+    })
+    if sock is None:
+        return APIServer((host, port), handler)
+    server = APIServer(sock.getsockname()[:2], handler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = sock
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="API prediksi hoax dengan micro-batching")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--backend", default=MODEL_BACKEND, choices=sorted(BACKENDS))
+    parser.add_argument("--model", default=None, help="default sesuai backend (.h5 untuk keras, .npz untuk numpy)")
+    parser.add_argument("--vocab", default=VOCAB_PATH)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--long-documents", default=None, choices=WINDOW_COMBINE_RULES,
+                        help="skor teks > 300 token per jendela dan gabungkan dengan aturan ini")
+    parser.add_argument("--cache-size", type=int, default=10000, help="0 untuk menonaktifkan cache prediksi")
+    parser.add_argument("--cache-ttl", type=float, default=24 * 3600)
+    parser.add_argument("--cache-db", default=None, help="path SQLite untuk cache yang bertahan setelah restart")
+    parser.add_argument("--near-duplicates", type=int, default=100000,
+                        help="kapasitas indeks near-duplicate (0 untuk menonaktifkan)")
+    parser.add_argument("--near-duplicate-snapshot", default=None,
+                        help="file .npz untuk menyimpan indeks near-duplicate secara berkala (hanya --workers 1)")
+    parser.add_argument("--registry", default=None,
+                        help="direktori registry model (registry.py); versi aktif ditukar tanpa restart")
+    parser.add_argument("--reload-interval", type=float, default=RELOAD_INTERVAL)
+    parser.add_argument("--shadow-rate", type=float, default=0.0,
+                        help="proporsi batch yang juga diskor versi CANDIDATE di registry (0 = mati)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="jumlah proses worker (prefork); bobot backend numpy dimuat sekali dan dipakai bersama")
+    parser.add_argument("--intra-op-threads", type=int, default=None,
+                        help="thread BLAS/TensorFlow intra-op per worker (default: core / worker jika --workers > 1)")
+    parser.add_argument("--inter-op-threads", type=int, default=None, help="thread inter-op TensorFlow per worker")
+    args = parser.parse_args()
+    args.model = args.model or default_model_path(args.backend)
+    intra_op = args.intra_op_threads or (default_threads(args.workers) if args.workers > 1 else None)
+    inter_op = args.inter_op_threads or (1 if args.workers > 1 else None)
+    registry = ModelRegistry(args.registry) if args.registry else None
+    if registry is not None:
+        current = registry.current()
+        backend = registry.manifest(current)["backend"] if current else args.backend
+        tensorflow = backend == "keras"
+    else:
+        tensorflow = args.backend == "keras"
+
+    def make_cache(version=None):
+        if args.cache_size <= 0:
+            return None
+        return PredictionCache(
+            version or model_version(args.model, args.vocab),
+            maxsize=args.cache_size,
+            ttl=args.cache_ttl,
+            path=args.cache_db,
+        )
+
+    def make_near_duplicates(snapshot=None, version=None):
+        if args.near_duplicates <= 0:
+            return None
+        index = NearDuplicateIndex.open(
+            snapshot,
+            stop_words=stop_words,
+            model_version=version or model_version(args.model, args.vocab),
+            capacity=args.near_duplicates,
+        )
+        if snapshot:
+            index.start_autosave(snapshot)
+        return index
+
+    def load(cache, near_duplicates=None):
+        return startup.load_detector(
+            args.model, args.vocab, cache=cache, backend=args.backend,
+            long_documents=args.long_documents, near_duplicates=near_duplicates,
+        )
+
+    def load_version(manifest, shadow):
+        # Skor tersimpan hanya berlaku untuk satu versi, jadi setiap versi mendapat cache dan
+        # indeks near-duplicate (di memori) sendiri; kandidat shadow selalu menjalankan model
+        # dan mencatat metriknya di registry terpisah
+        version = model_version(manifest["model"], manifest["vocab"])
+        return startup.load_detector(
+            manifest["model"], manifest["vocab"],
+            cache=None if shadow else make_cache(version),
+            backend=manifest["backend"],
+            long_documents=args.long_documents,
+            near_duplicates=None if shadow else make_near_duplicates(version=version),
+            threshold=manifest["threshold"],
+            metrics=SHADOW_METRICS if shadow else metrics,
+        )
+
+    def make_manager():
+        manager = ModelManager(registry, load_version, shadow_rate=args.shadow_rate)
+        manager.reload()
+        manager.start_watching(args.reload_interval)
+        return manager
+
+    with startup.timer.stage("data nltk"):
+        setup_nltk()
+    if args.workers > 1:
+        serve_prefork(args, load, make_cache, make_near_duplicates, make_manager if registry else None,
+                      intra_op, inter_op, tensorflow)
+        return
+
+    configure_threads(intra_op, inter_op, tensorflow)
+    if registry is not None:
+        detector = make_manager()
+    else:
+        detector = load(make_cache(), make_near_duplicates(args.near_duplicate_snapshot))
+    add_collectors(detector)
+    server = create_server(detector, args.host, args.port, args.max_batch_size, args.max_wait_ms)
+    print(startup.timer.format_report())
+    print(f"Validin API berjalan di http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if registry is None and detector.near_duplicates is not None and args.near_duplicate_snapshot:
+            detector.near_duplicates.save(args.near_duplicate_snapshot)
+
+def add_collectors(detector):
+    # Collector dibuat ulang setiap render agar mengikuti cache milik versi model yang aktif
+    metrics.add_collector(lambda: cache_collector("prediction", detector.cache)())
+    metrics.add_collector(lambda: near_duplicate_collector(detector.near_duplicates)())
+
+def serve_prefork(args, load, make_cache, make_near_duplicates, make_manager, intra_op, inter_op, tensorflow):
+    """
+    Proses induk membuka socket dan (untuk backend tanpa TensorFlow) memuat serta memanaskan
+    model sekali; worker hasil fork memakai bobot itu bersama dan hanya membuat cache,
+    indeks near-duplicate (di memori, tanpa snapshot), MicroBatcher dan thread HTTP-nya
+    sendiri. TensorFlow tidak aman di-fork sehingga backend keras dimuat oleh tiap worker
+    setelah fork. Dengan registry (make_manager), tiap worker memuat dan menukar versinya sendiri.
+    """
+    sock = listen(args.host, args.port, LISTEN_BACKLOG)
+    shared = None
+    if not tensorflow and make_manager is None:
+        configure_threads(intra_op, inter_op)
+        shared = load(None)
+    print(startup.timer.format_report())
+    print(f"Validin API berjalan di http://{args.host}:{args.port} dengan {args.workers} worker "
+          f"(thread intra-op {intra_op}, inter-op {inter_op})", flush=True)
+
+    def serve_worker(index):
+        configure_threads(intra_op, inter_op, tensorflow)
+        if make_manager is not None:
+            detector = make_manager()
+        else:
+            detector = shared if shared is not None else load(None)
+            # Cache (termasuk koneksi SQLite) dibuat setelah fork, satu per worker
+            detector.cache = make_cache()
+            detector.near_duplicates = make_near_duplicates()
+        add_collectors(detector)
+        create_server(detector, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms, sock=sock).serve_forever()
+
+    try:
+        run_workers(args.workers, serve_worker)
+    finally:
+        sock.close()
+
+if __name__ == "__main__":
+    main()
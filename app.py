@@ -1,247 +1,199 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import nltk
-import re
-import string
 import os
-import requests
-import json
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.text import Tokenizer
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-import pickle
-import time
+from concurrent.futures import ThreadPoolExecutor
+import startup
+from cache import PredictionCache, RecommendationCache
+from grok import PROMPT_VERSION, get_fallback_recommendations, get_health_monitor, grok_available
+from metrics import cache_collector, metrics, near_duplicate_collector, start_metrics_server
+from near_duplicates import NearDuplicateIndex
+from recommendations import RecommendationService
+from backends import MODEL_BACKEND, default_model_path
+from pipeline import model_version, setup_nltk, stop_words
+from registry import SHADOW_METRICS, ModelManager, ModelRegistry
+from vocab import VOCAB_PATH
 
 # Set page config
 st.set_page_config(page_title="Validin", page_icon="📰", layout="wide")
 
-# Set custom NLTK data directory to a writable location
-nltk_data_dir = os.path.join(os.getcwd(), "nltk_data")
-if not os.path.exists(nltk_data_dir):
-    os.makedirs(nltk_data_dir)
-nltk.data.path.append(nltk_data_dir)
+# Data NLTK dimuat sekali per proses dari folder nltk_data yang dibundel (tanpa internet)
+@st.cache_resource
+def init_nltk():
+    with startup.timer.stage("data nltk"):
+        setup_nltk()
 
-# Download NLTK data with error handling
 try:
-    nltk.download('punkt_tab', download_dir=nltk_data_dir)
-    nltk.download('stopwords', download_dir=nltk_data_dir)
+    init_nltk()
 except Exception as e:
-    st.error(f"Failed to download NLTK data: {str(e)}. Please ensure you have internet access and write permissions.")
+    st.error(f"Failed to load NLTK data: {str(e)}. Run 'python startup.py --fetch-nltk' to bundle it.")
     st.stop()
 
-# Inisialisasi NLTK
-stop_words = set(stopwords.words('indonesian'))
-
-# Konfigurasi Grok AI
-GROK_API_KEY = "xai-oANOG2INjZRhmPtTbDBwNNQvYWtrfZGr67msIs0jZWG9OOq9b99qeYXH88nEso37hSKiXREdhUnD1mVh"
-GROK_API_URL = "https://api.x.ai/v1/chat/completions"
-
-# Fungsi preprocessing teks
-def clean(text):
-    text = str(text).lower()
-    text = ' '.join(re.sub("(@[A-Za-z0-9]+)|([^0-9A-Za-z \t])|(\w+:\/\/\S+)", " ", text).split())
-    punct = set(string.punctuation)
-    text = "".join([ch for ch in text if ch not in punct])
-    return text
-
-def tokenize(text):
-    return word_tokenize(text)
-
-def remove_stop_words(text):
-    word_tokens_no_stopwords = [w for w in text if w not in stop_words]
-    return word_tokens_no_stopwords
-
-def preprocess(text):
-    text = clean(text)
-    text = tokenize(text)
-    text = remove_stop_words(text)
-    return text
-
-# Cache model dan tokenizer
+# Tampilkan rekomendasi Grok AI secara bertahap (streaming) dan jeda minimum antar render
+GROK_STREAMING = True
+STREAM_RENDER_INTERVAL = 0.05
+
+# Executor latar belakang untuk rekomendasi Grok AI (dipakai bersama semua sesi)
+RECOMMENDATION_WORKERS = 4
+RECOMMENDATION_MAX_PENDING = 32
+
+# Cache rekomendasi Grok AI (isi RECOMMENDATION_CACHE_DB dengan path SQLite agar tersimpan di disk)
+RECOMMENDATION_CACHE_SIZE = 2000
+RECOMMENDATION_CACHE_TTL = 7 * 24 * 3600
+RECOMMENDATION_CACHE_DB = None
+
+# Konfigurasi cache prediksi (isi PREDICTION_CACHE_DB dengan path SQLite agar cache bertahan setelah restart)
+PREDICTION_CACHE_SIZE = 10000
+PREDICTION_CACHE_TTL = 24 * 3600
+PREDICTION_CACHE_DB = None
+
+# Indeks near-duplicate: berita berantai yang sedikit diedit memakai skor dan rekomendasi
+# berita serupa yang pernah diperiksa (kemiripan Jaccard token >= NEAR_DUPLICATE_THRESHOLD).
+# Secara default indeks hanya di memori; isi env VALIDIN_NEAR_DUPLICATE_SNAPSHOT dengan path .npz
+# agar disimpan berkala (snapshot ikut menyimpan teks rekomendasi Grok AI ke disk)
+NEAR_DUPLICATE_CAPACITY = 100000
+NEAR_DUPLICATE_THRESHOLD = 0.8
+NEAR_DUPLICATE_SNAPSHOT = os.environ.get("VALIDIN_NEAR_DUPLICATE_SNAPSHOT")
+NEAR_DUPLICATE_SAVE_INTERVAL = 300
+
+# Teks lebih dari 300 token diskor per jendela yang tumpang tindih lalu digabung
+# ('max', 'mean' atau 'weighted'); None = dipotong ke 300 token terakhir
+LONG_DOCUMENT_COMBINE = 'weighted'
+
+# Model dan kosakata ("numpy" memakai hasil 'python backends.py' tanpa TensorFlow)
+MODEL_PATH = default_model_path(MODEL_BACKEND)
+
+# Registry model (lihat registry.py): jika diisi, model, kosakata dan ambang batas diambil dari
+# versi aktif di direktori ini dan ditukar tanpa restart saat versi baru di-promote.
+# MODEL_SHADOW_RATE > 0 menskor sebagian permintaan dengan versi CANDIDATE di latar belakang
+MODEL_REGISTRY = os.environ.get("VALIDIN_MODEL_REGISTRY")
+MODEL_SHADOW_RATE = float(os.environ.get("VALIDIN_SHADOW_RATE", "0"))
+
+# Tampilkan kata yang paling memengaruhi skor model (atribusi oklusi, satu panggilan model)
+EXPLAIN_TOKENS = True
+
+# Endpoint Prometheus /metrics (latensi per tahap, cache, fallback); 0 untuk menonaktifkan
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9464"))
+
+# Alamat bind endpoint /metrics; default loopback, isi 0.0.0.0 agar Prometheus di host lain dapat scrape
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+
+# Tahap yang ditampilkan di progress bar, dengan teks statusnya
+PROGRESS_STAGES = {
+    "model_load": "⏳ Memuat model...",
+    "preprocess": "🔄 Memproses teks...",
+    "encode": "🔢 Menyiapkan sekuens...",
+    "inference": "🤖 Menganalisis dengan AI...",
+    "long_document": "📄 Menganalisis artikel panjang...",
+    "grok": "🤖 Mendapatkan rekomendasi dari Grok AI...",
+}
+
+def load_near_duplicate_index(version):
+    """
+    Dipanggil bersama pemuatan model (tanpa registry) sehingga model yang hilang dilaporkan
+    lewat pesan error pemuatan model, bukan traceback saat halaman dibuka
+    """
+    index = NearDuplicateIndex.open(
+        NEAR_DUPLICATE_SNAPSHOT,
+        stop_words=stop_words,
+        model_version=version,
+        capacity=NEAR_DUPLICATE_CAPACITY,
+        threshold=NEAR_DUPLICATE_THRESHOLD,
+    )
+    if NEAR_DUPLICATE_SNAPSHOT:
+        index.start_autosave(NEAR_DUPLICATE_SNAPSHOT, NEAR_DUPLICATE_SAVE_INTERVAL)
+    metrics.add_collector(near_duplicate_collector(index))
+    recommendation_service.near_duplicates = index
+    return index
+
+def load_version(manifest, shadow):
+    """
+    Memuat satu versi dari registry; versi aktif mendapat cache prediksi dan indeks
+    near-duplicate sendiri karena skor tersimpan hanya berlaku untuk model itu
+    """
+    if shadow:
+        return startup.load_detector(
+            manifest["model"], manifest["vocab"], backend=manifest["backend"],
+            long_documents=LONG_DOCUMENT_COMBINE, threshold=manifest["threshold"], metrics=SHADOW_METRICS,
+        )
+    version = model_version(manifest["model"], manifest["vocab"])
+    cache = PredictionCache(version, maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL, path=PREDICTION_CACHE_DB)
+    index = NearDuplicateIndex(
+        capacity=NEAR_DUPLICATE_CAPACITY,
+        threshold=NEAR_DUPLICATE_THRESHOLD,
+        stop_words=stop_words,
+        model_version=version,
+    )
+    detector = startup.load_detector(
+        manifest["model"], manifest["vocab"], cache=cache, backend=manifest["backend"],
+        long_documents=LONG_DOCUMENT_COMBINE, near_duplicates=index, threshold=manifest["threshold"],
+    )
+    recommendation_service.near_duplicates = index
+    return detector
+
+def load_detector():
+    if MODEL_REGISTRY:
+        manager = ModelManager(ModelRegistry(MODEL_REGISTRY), load_version, shadow_rate=MODEL_SHADOW_RATE)
+        manager.reload()
+        manager.start_watching()
+        metrics.add_collector(lambda: cache_collector("prediction", manager.cache)())
+        metrics.add_collector(lambda: near_duplicate_collector(manager.near_duplicates)())
+        print(startup.timer.format_report(), flush=True)
+        return manager
+
+    version = model_version(MODEL_PATH, VOCAB_PATH)
+    cache = PredictionCache(
+        version,
+        maxsize=PREDICTION_CACHE_SIZE,
+        ttl=PREDICTION_CACHE_TTL,
+        path=PREDICTION_CACHE_DB,
+    )
+    detector = startup.load_detector(
+        MODEL_PATH, VOCAB_PATH, cache=cache, backend=MODEL_BACKEND,
+        long_documents=LONG_DOCUMENT_COMBINE, near_duplicates=load_near_duplicate_index(version),
+    )
+    metrics.add_collector(cache_collector("prediction", cache))
+    print(startup.timer.format_report(), flush=True)
+    return detector
+
+# TensorFlow dan model dimuat di thread latar belakang agar halaman langsung tampil
 @st.cache_resource
-def load_lstm_model():
-    return load_model('hoax_lstm_model.h5')
+def start_detector_loading():
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-loader")
+    future = executor.submit(load_detector)
+    executor.shutdown(wait=False)
+    return future
 
 @st.cache_resource
-def load_tokenizer():
-    with open('tokenizer.pkl', 'rb') as handle:
-        return pickle.load(handle)
-
-# Fungsi untuk mendapatkan rekomendasi dari Grok AI
-def get_grok_recommendations(news_text, prediction_result, confidence):
-    """
-    Mendapatkan rekomendasi dari Grok AI berdasarkan hasil prediksi
-    """
+def load_recommendation_service():
+    cache = RecommendationCache(
+        PROMPT_VERSION,
+        maxsize=RECOMMENDATION_CACHE_SIZE,
+        ttl=RECOMMENDATION_CACHE_TTL,
+        path=RECOMMENDATION_CACHE_DB,
+    )
+    metrics.add_collector(cache_collector("recommendation", cache))
+    # Indeks near-duplicate dipasang setelah model dimuat (load_near_duplicate_index / load_version)
+    return RecommendationService(
+        max_workers=RECOMMENDATION_WORKERS,
+        max_pending=RECOMMENDATION_MAX_PENDING,
+        streaming=GROK_STREAMING,
+        cache=cache,
+    )
+
+# Satu endpoint /metrics per proses Streamlit
+@st.cache_resource
+def start_metrics():
+    if not METRICS_PORT:
+        return None
     try:
-        headers = {
-            "Authorization": f"Bearer {GROK_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        # Tentukan status berita
-        status = "HOAX" if prediction_result == 1 else "VALID"
-        confidence_level = "tinggi" if confidence > 80 else "sedang" if confidence > 60 else "rendah"
-        
-        # Buat prompt yang lebih detailed untuk Grok AI
-        prompt = f"""
-        Sebagai AI assistant yang ahli dalam analisis berita dan media literacy, berikan rekomendasi dan saran yang berguna untuk pengguna.
-
-        KONTEKS ANALISIS:
-        - Status berita: {status}
-        - Tingkat kepercayaan: {confidence:.2f}% ({confidence_level})
-        - Panjang teks: {len(news_text)} karakter
-        - Teks berita: "{news_text[:500]}..."
-
-        Berikan rekomendasi dalam format yang rapi dan mudah dipahami:
-
-        ## 📊 Analisis Hasil
-        Jelaskan secara singkat mengapa berita ini dikategorikan sebagai {status} berdasarkan karakteristik teks yang dianalisis.
-
-        ## 🔍 Langkah Verifikasi
-        Berikan 4-5 langkah konkret dan praktis untuk memverifikasi kebenaran berita ini, termasuk:
-        - Sumber yang dapat dicek
-        - Metode verifikasi yang efektif
-        - Red flags yang perlu diperhatikan
-
-        ## 💡 Tips Media Literacy
-        Berikan 3-4 tips praktis untuk mengidentifikasi berita hoax di masa depan, fokus pada:
-        - Ciri-ciri berita hoax yang umum
-        - Cara menilai kredibilitas sumber
-        - Pentingnya cross-checking
-
-        ## 🎯 Rekomendasi Tindakan
-        Berikan saran spesifik tentang apa yang sebaiknya dilakukan pengguna selanjutnya berdasarkan hasil analisis ini.
+        return start_metrics_server(host=METRICS_HOST, port=METRICS_PORT)
+    except OSError as e:
+        print(f"Endpoint metrics tidak dapat dijalankan di {METRICS_HOST}:{METRICS_PORT}: {e}", flush=True)
+        return None
 
-        ## ⚠️ Peringatan Penting
-        Tambahkan peringatan tentang risiko menyebarkan berita yang belum terverifikasi.
+recommendation_service = load_recommendation_service()
+start_metrics()
 
-        Gunakan bahasa Indonesia yang mudah dipahami, profesional, dan memberikan nilai tambah yang jelas untuk pengguna.
-        """
-        
-        data = {
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "Anda adalah AI assistant yang ahli dalam analisis berita dan media literacy. Berikan rekomendasi yang praktis, akurat, dan mudah dipahami dalam bahasa Indonesia."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "model": "grok-beta",
-            "stream": False,
-            "temperature": 0.7,
-            "max_tokens": 1500
-        }
-        
-        # Retry mechanism
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(GROK_API_URL, headers=headers, json=data, timeout=45)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result['choices'][0]['message']['content']
-                elif response.status_code == 429:
-                    # Rate limit, wait and retry
-                    time.sleep(2 ** attempt)
-                    continue
-                else:
-                    return f"Error: Grok AI merespons dengan kode {response.status_code}. Pesan: {response.text}"
-                    
-            except requests.exceptions.Timeout:
-                if attempt < max_retries - 1:
-                    time.sleep(1)
-                    continue
-                return "Error: Timeout - Grok AI tidak merespons dalam waktu yang ditentukan. Silakan coba lagi."
-            except requests.exceptions.RequestException as e:
-                if attempt < max_retries - 1:
-                    time.sleep(1)
-                    continue
-                return f"Error: Masalah koneksi ke Grok AI - {str(e)}"
-        
-        return "Error: Tidak dapat terhubung ke Grok AI setelah beberapa percobaan."
-            
-    except Exception as e:
-        return f"Error: Terjadi kesalahan tidak terduga - {str(e)}"
-
-def get_fallback_recommendations(prediction_result, confidence):
-    """
-    Memberikan rekomendasi fallback jika Grok AI tidak tersedia
-    """
-    status = "HOAX" if prediction_result == 1 else "VALID"
-    
-    if prediction_result == 1:  # HOAX
-        return f"""
-## 🚨 Analisis Hasil
-Berita ini dikategorikan sebagai **HOAX** dengan tingkat kepercayaan {confidence:.2f}%. Sistem mendeteksi pola-pola yang umumnya ditemukan pada berita hoax.
-
-## 🔍 Langkah Verifikasi
-1. **Cek Sumber Asli**: Verifikasi apakah berita ini berasal dari media terpercaya
-2. **Fact-Check**: Periksa di situs fact-checking seperti Cek Fakta, Hoax Buster, atau Turnbackhoax
-3. **Cross-Reference**: Bandingkan dengan berita serupa dari sumber lain
-4. **Analisis Konten**: Perhatikan gaya bahasa yang sensasional atau bias
-5. **Verifikasi Foto/Video**: Gunakan reverse image search untuk cek keaslian media
-
-## 💡 Tips Media Literacy
-1. **Waspada Judul Sensasional**: Berita hoax sering menggunakan judul yang provokatif
-2. **Periksa Tanggal dan Konteks**: Pastikan berita masih relevan dan tidak out of context
-3. **Analisis Sumber**: Periksa kredibilitas dan track record penulis/media
-4. **Hindari Bias Konfirmasi**: Jangan langsung percaya berita yang sesuai dengan pandangan Anda
-
-## 🎯 Rekomendasi Tindakan
-- **JANGAN** langsung membagikan berita ini
-- Lakukan verifikasi lebih lanjut sebelum mempercayai
-- Edukasi orang lain tentang pentingnya fact-checking
-- Laporkan jika terbukti hoax ke platform media sosial
-
-## ⚠️ Peringatan Penting
-Menyebarkan berita hoax dapat merugikan banyak pihak dan dapat melanggar hukum. Selalu verifikasi sebelum berbagi!
-        """
-    else:  # VALID
-        return f"""
-## ✅ Analisis Hasil
-Berita ini dikategorikan sebagai **VALID** dengan tingkat kepercayaan {confidence:.2f}%. Sistem mendeteksi pola-pola yang umumnya ditemukan pada berita yang kredibel.
-
-## 🔍 Langkah Verifikasi
-1. **Konfirmasi Sumber**: Pastikan berita berasal dari media yang terpercaya
-2. **Cek Update**: Periksa apakah ada perkembangan terbaru terkait berita ini
-3. **Bandingkan Sumber**: Lihat bagaimana media lain memberitakan topik yang sama
-4. **Verifikasi Detail**: Periksa fakta-fakta spesifik yang disebutkan
-5. **Konteks Lengkap**: Pastikan Anda memahami konteks penuh dari berita
-
-## 💡 Tips Media Literacy
-1. **Tetap Kritis**: Meski dikategorikan valid, tetap bersikap kritis
-2. **Sumber Primer**: Cari sumber primer jika memungkinkan
-3. **Bias Media**: Perhatikan kemungkinan bias dari media yang memberitakan
-4. **Update Berkala**: Pantau perkembangan berita untuk informasi terbaru
-
-## 🎯 Rekomendasi Tindakan
-- Anda dapat mempercayai berita ini dengan tingkat kepercayaan yang tinggi
-- Tetap lakukan cross-check untuk informasi yang sangat penting
-- Bagikan dengan bertanggung jawab dan sertakan sumber
-- Gunakan informasi ini untuk membuat keputusan yang informed
-
-## ⚠️ Catatan Penting
-Meski dikategorikan valid, selalu praktikkan media literacy dan jangan berhenti berpikir kritis terhadap informasi yang Anda terima.
-        """
-
-# Muat model dan tokenizer
-try:
-    model = load_lstm_model()
-    tokenizer = load_tokenizer()
-except Exception as e:
-    st.error(f"Error loading model: {str(e)}")
-    st.stop()
-
-# Parameter tokenisasi
-max_features = 5000
-max_len = 300
+detector_future = start_detector_loading()
 
 # Custom CSS untuk tampilan modern
 st.markdown("""
@@ -394,6 +346,11 @@ st.markdown("""
         color: #991B1B;
         border: 1px solid #EF4444;
     }
+    .status-checking {
+        background-color: #FFFBEB;
+        color: #92400E;
+        border: 1px solid #F59E0B;
+    }
     </style>
 """, unsafe_allow_html=True)
 
@@ -408,12 +365,18 @@ st.markdown('<p class="subtitle">Deteksi berita hoax dengan cepat dan akurat men
 with st.container():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        # Test koneksi Grok AI
-        try:
-            test_response = requests.get("https://api.x.ai", timeout=5)
+        # Status koneksi Grok AI dari pemeriksaan latar belakang (tidak memblokir render)
+        grok_health = get_health_monitor().status()
+        if not grok_available():
+            grok_status = "🔴 Grok AI Offline (Menggunakan mode fallback)"
+            status_class = "status-offline"
+        elif grok_health["online"] is None:
+            grok_status = "🟡 Memeriksa koneksi Grok AI..."
+            status_class = "status-checking"
+        elif grok_health["online"]:
             grok_status = "🟢 Grok AI Online"
             status_class = "status-online"
-        except:
+        else:
             grok_status = "🔴 Grok AI Offline (Menggunakan mode fallback)"
             status_class = "status-offline"
         
@@ -439,38 +402,43 @@ with st.container():
         elif len(news_text.strip()) < 50:
             st.markdown('<div class="result-box error">⚠️ Teks terlalu pendek. Masukkan teks berita yang lebih lengkap (minimal 50 karakter).</div>', unsafe_allow_html=True)
         else:
-            # Progress bar
+            # Progress bar mengikuti tahap yang benar-benar berjalan; posisi tiap tahap
+            # sebanding dengan rata-rata durasinya yang terukur di proses ini
             progress_bar = st.progress(0)
             status_text = st.empty()
+            stages = ["preprocess", "encode", "inference", "grok"]
+            if not detector_future.done():
+                stages.insert(0, "model_load")
+            fractions = metrics.progress_fractions(stages)
+
+            def show_stage(stage):
+                status_text.text(PROGRESS_STAGES[stage])
+                if stage in fractions:
+                    progress_bar.progress(int(fractions[stage] * 100))
             
-            # Tahap 1: Preprocessing
-            status_text.text("🔄 Memproses teks...")
-            progress_bar.progress(25)
-            
-            # Preprocessing teks
-            processed_text = preprocess(news_text)
-            text_seq = tokenizer.texts_to_sequences([" ".join(processed_text)])
+            # Tunggu model selesai dimuat (hanya pada permintaan pertama setelah proses mulai)
+            try:
+                if "model_load" in stages:
+                    with metrics.stage("model_load", show_stage):
+                        detector = detector_future.result()
+                else:
+                    detector = detector_future.result()
+            except Exception as e:
+                st.error(f"Error loading model: {str(e)}")
+                st.stop()
+
+            # Preprocessing teks dan prediksi (hasil dari cache jika teks yang sama pernah diperiksa)
+            verdict = detector.predict_batch([news_text], progress=show_stage)[0]
             
-            if not text_seq[0]:
+            if verdict is None:
                 st.markdown('<div class="result-box error">⚠️ Teks tidak dapat diproses. Pastikan teks relevan dan mengandung kata-kata yang bermakna.</div>', unsafe_allow_html=True)
                 progress_bar.empty()
                 status_text.empty()
                 st.stop()
             
-            # Tahap 2: Prediksi
-            status_text.text("🤖 Menganalisis dengan AI...")
-            progress_bar.progress(50)
-            
-            text_padded = pad_sequences(sequences=text_seq, maxlen=max_len, padding='pre')
-            prediction = model.predict(text_padded)
-            threshold = 0.6
-            hoax_prob = prediction[0][1]
-            pred_class = 1 if hoax_prob > threshold else 0
-            pred_prob = hoax_prob * 100 if pred_class == 1 else (1 - hoax_prob) * 100
-            
-            # Tahap 3: Menampilkan hasil
-            status_text.text("📊 Menyiapkan hasil...")
-            progress_bar.progress(75)
+            pred_class = verdict["pred_class"]
+            pred_prob = verdict["confidence"]
+            match = verdict.get("match")
             
             # Tampilkan hasil prediksi
             if pred_class == 1:
@@ -480,24 +448,54 @@ with st.container():
                 confidence_emoji = "✅" if pred_prob > 80 else "✔️" if pred_prob > 60 else "🔍"
                 st.markdown(f'<div class="result-box success">{confidence_emoji} <b>Hasil</b>: Berita ini kemungkinan <b>VALID</b> (Kepercayaan: {pred_prob:.2f}%)</div>', unsafe_allow_html=True)
 
-            # Tahap 4: Mendapatkan rekomendasi
-            status_text.text("🤖 Mendapatkan rekomendasi dari Grok AI...")
-            progress_bar.progress(100)
+            if EXPLAIN_TOKENS:
+                explanation = detector.explain(news_text)
+                if explanation is not None:
+                    parts = [f"{item['text']} ({item['delta'] * 100:+.1f}%)" for item in explanation["tokens"]]
+                    st.caption("🔎 Kata paling berpengaruh terhadap skor HOAX: " + ", ".join(parts))
+
+            # Tahap terakhir: mendapatkan rekomendasi
+            show_stage("grok")
             
-            # Mendapatkan rekomendasi dari Grok AI
+            if match is not None:
+                st.caption(f"🔁 Mirip dengan berita yang pernah diperiksa (kemiripan {match['similarity'] * 100:.0f}%, ref {match['ref'][:12]})")
+
+            # Rekomendasi cadangan tampil lebih dulu, rekomendasi Grok AI diambil di latar belakang
             st.markdown('<div class="recommendation-box">', unsafe_allow_html=True)
             st.markdown('<div class="recommendation-title">🤖 Rekomendasi & Analisis Lanjutan</div>', unsafe_allow_html=True)
             
-            recommendations = get_grok_recommendations(news_text, pred_class, pred_prob)
-            
-            if recommendations.startswith("Error:"):
-                st.markdown(f'<div class="recommendation-content" style="color: #DC2626;">❌ {recommendations}</div>', unsafe_allow_html=True)
-                st.markdown('<div class="recommendation-content" style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid #E5E7EB;">', unsafe_allow_html=True)
-                st.markdown('<strong>💡 Menggunakan Rekomendasi Cadangan:</strong>', unsafe_allow_html=True)
+            with metrics.stage("fallback"):
                 fallback_recommendations = get_fallback_recommendations(pred_class, pred_prob)
-                st.markdown(f'{fallback_recommendations}</div>', unsafe_allow_html=True)
+            notice_placeholder = st.empty()
+            recommendation_placeholder = st.empty()
+            recommendation_placeholder.markdown(fallback_recommendations)
+            
+            pending = recommendation_service.submit(news_text, pred_class, pred_prob)
+            
+            if pending is not None and pending.cached:
+                # Jawaban dari cache langsung ditampilkan tanpa memanggil Grok AI
+                source = "berita serupa" if pending.match is not None else "cache"
+                notice_placeholder.markdown(f'<div class="status-indicator status-online">⚡ Rekomendasi dari {source}</div>', unsafe_allow_html=True)
+                recommendation_placeholder.markdown(f'<div class="recommendation-content">{pending.text}</div>', unsafe_allow_html=True)
+            elif pending is None:
+                notice_placeholder.markdown('<div class="recommendation-content"><strong>💡 Grok AI sedang offline, menampilkan Rekomendasi Cadangan:</strong></div>', unsafe_allow_html=True)
             else:
-                st.markdown(f'<div class="recommendation-content">{recommendations}</div>', unsafe_allow_html=True)
+                notice_placeholder.markdown('<div class="loading-text">⏳ Menunggu rekomendasi dari Grok AI, sementara itu berikut Rekomendasi Cadangan.</div>', unsafe_allow_html=True)
+                progress_bar.empty()
+                status_text.empty()
+                
+                while not pending.wait(STREAM_RENDER_INTERVAL):
+                    partial = pending.text
+                    if partial:
+                        notice_placeholder.empty()
+                        recommendation_placeholder.markdown(f'<div class="recommendation-content">{partial}▌</div>', unsafe_allow_html=True)
+                
+                if pending.error:
+                    notice_placeholder.markdown(f'<div class="recommendation-content" style="color: #DC2626;">❌ Error: {pending.error}</div><div class="recommendation-content" style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid #E5E7EB;"><strong>💡 Menggunakan Rekomendasi Cadangan:</strong></div>', unsafe_allow_html=True)
+                    recommendation_placeholder.markdown(fallback_recommendations)
+                else:
+                    notice_placeholder.empty()
+                    recommendation_placeholder.markdown(f'<div class="recommendation-content">{pending.text}</div>', unsafe_allow_html=True)
             
             st.markdown('</div>', unsafe_allow_html=True)
             
@@ -0,0 +1,418 @@
+import argparse
+import json
+import os
+from bisect import bisect_left
+
+import numpy as np
+
+from pipeline import MODEL_PATH, load_lstm_model, max_features, max_len
+
+# Backend inferensi yang dipakai secara default dan lokasi model hasil ekspor
+MODEL_BACKEND = os.environ.get("VALIDIN_BACKEND", "keras")
+NUMPY_MODEL_PATH = 'hoax_lstm_model.npz'
+
+# Backend keras dibungkus CompiledModel (tf.function + XLA dengan bentuk input tetap);
+# VALIDIN_KERAS_COMPILED=0 memakai model Keras apa adanya
+KERAS_COMPILED = os.environ.get("VALIDIN_KERAS_COMPILED", "1") != "0"
+
+# Jumlah baris batch yang dikompilasi XLA. Di CPU, XLA jauh lebih cepat untuk batch kecil
+# (1 baris x 300 token: ~1 ms vs ~14 ms) tetapi lebih lambat mulai ~128 baris, sehingga
+# batch yang lebih besar memakai graf tf.function biasa
+COMPILED_ROW_BUCKETS = (1, 8, 32)
+
+# Versi format file .npz; naikkan jika struktur spesifikasi layer berubah
+EXPORT_FORMAT_VERSION = 1
+
+# Baris tabel proyeksi int8 yang dihitung sekaligus saat dimuat; membatasi memori float32 sementara
+PROJECTION_BLOCK_ROWS = 1024
+
+# Layer yang tidak berpengaruh saat inferensi
+_PASSTHROUGH_LAYERS = {"Dropout", "SpatialDropout1D", "GaussianNoise", "GaussianDropout", "ActivityRegularization"}
+
+def _sigmoid(x):
+    # Bentuk tanh stabil untuk nilai besar (tanpa overflow exp)
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+def _hard_sigmoid(x):
+    return np.clip(x + 3.0, 0.0, 6.0) / 6.0
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "hard_sigmoid": _hard_sigmoid,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "softmax": _softmax,
+}
+
+def _activation(name):
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Aktivasi '{name}' belum didukung backend numpy")
+    return _ACTIVATIONS[name]
+
+def _dot(x, weight):
+    """
+    x @ weight; bobot int8 (tuple q, scale) tetap int8 dan skala per kolom dikalikan setelah perkalian
+    """
+    if isinstance(weight, tuple):
+        q, scale = weight
+        return (x @ q) * scale
+    return x @ weight
+
+def _rows(table, ids):
+    """
+    table[ids]; untuk tabel int8 hanya baris yang diambil yang diubah ke float32
+    """
+    if isinstance(table, tuple):
+        q, scale = table
+        return np.multiply(q[ids], scale, dtype=np.float32)
+    return table[ids]
+
+def _run_lstm(xw, mask, recurrent_kernel, activation, recurrent_activation, go_backwards, return_sequences, active=None):
+    """
+    Menjalankan LSTM (urutan gerbang Keras: i, f, c, o) dari proyeksi input xw (B, T, 4u).
+    Jika active diberikan, pada langkah t hanya baris [:active[t]] yang dihitung (baris
+    diurutkan menurut kolom awalnya), sehingga tiap baris seolah dijalankan dengan lebarnya sendiri.
+    """
+    batch, steps = xw.shape[:2]
+    units = xw.shape[2] // 4
+    h = np.zeros((batch, units), dtype=np.float32)
+    c = np.zeros((batch, units), dtype=np.float32)
+    outputs = np.zeros((batch, steps, units), dtype=np.float32) if return_sequences else None
+    order = range(steps - 1, -1, -1) if go_backwards else range(steps)
+    for position, t in enumerate(order):
+        k = batch if active is None else active[t]
+        if not k:
+            continue
+        z = xw[:k, t] + _dot(h[:k], recurrent_kernel)
+        i = recurrent_activation(z[:, :units])
+        f = recurrent_activation(z[:, units:2 * units])
+        g = activation(z[:, 2 * units:3 * units])
+        o = recurrent_activation(z[:, 3 * units:])
+        c_new = f * c[:k] + i * g
+        h_new = o * activation(c_new)
+        if mask is not None:
+            # Langkah yang dimask mempertahankan state sebelumnya, sama seperti Keras
+            keep = mask[:k, t:t + 1]
+            c_new = np.where(keep, c_new, c[:k])
+            h_new = np.where(keep, h_new, h[:k])
+        c[:k], h[:k] = c_new, h_new
+        if return_sequences:
+            outputs[:k, position] = h[:k]
+    if not return_sequences:
+        return h
+    return outputs[:, ::-1] if go_backwards else outputs
+
+def _quantize(weight):
+    """
+    Kuantisasi dynamic-range int8 simetris per kolom keluaran
+    """
+    scale = np.abs(weight).max(axis=0) / 127.0
+    scale[scale == 0] = 1.0
+    return np.round(weight / scale).astype(np.int8), scale.astype(np.float32)
+
+def export_numpy(model_path=MODEL_PATH, out_path=NUMPY_MODEL_PATH, quantize=False, model=None):
+    """
+    Mengekspor bobot model Keras (Embedding / LSTM / Bidirectional / Dense) ke file .npz
+    yang dapat dijalankan NumpyBackend tanpa TensorFlow
+    """
+    model = model or load_lstm_model(model_path)
+    layers = []
+    arrays = {}
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in _PASSTHROUGH_LAYERS or kind == "InputLayer":
+            continue
+        config = layer.get_config()
+        if kind == "Bidirectional":
+            forward, backward = layer.forward_layer, layer.backward_layer
+            if type(forward).__name__ != "LSTM" or layer.merge_mode != "concat":
+                raise ValueError("Hanya Bidirectional(LSTM) dengan merge_mode='concat' yang didukung")
+            spec = {"type": "Bidirectional", "layers": [_lstm_spec(forward), _lstm_spec(backward)]}
+            names = ("kernel", "recurrent_kernel", "bias")
+            weights = dict(zip([f"{d}_{n}" for d in ("forward", "backward") for n in names], layer.get_weights()))
+        elif kind == "LSTM":
+            spec = _lstm_spec(layer)
+            weights = dict(zip(("kernel", "recurrent_kernel", "bias"), layer.get_weights()))
+        elif kind == "Embedding":
+            spec = {"type": kind, "mask_zero": bool(config.get("mask_zero", False))}
+            weights = {"embeddings": layer.get_weights()[0]}
+        elif kind == "Dense":
+            spec = {"type": kind, "activation": config["activation"]}
+            weights = dict(zip(("kernel", "bias"), layer.get_weights()))
+        else:
+            raise ValueError(f"Layer '{kind}' belum didukung backend numpy")
+
+        spec["quantized"] = []
+        for name, weight in weights.items():
+            weight = np.asarray(weight, dtype=np.float32)
+            key = f"layer{len(layers)}_{name}"
+            if quantize and weight.ndim == 2:
+                arrays[key + "__q"], arrays[key + "__scale"] = _quantize(weight)
+                spec["quantized"].append(name)
+            else:
+                arrays[key] = weight
+        layers.append(spec)
+
+    header = {"version": EXPORT_FORMAT_VERSION, "quantized": bool(quantize), "layers": layers}
+    arrays["config"] = np.array(json.dumps(header))
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        np.savez(handle, **arrays)
+    os.replace(tmp_path, out_path)
+    return model
+
+def _lstm_spec(layer):
+    config = layer.get_config()
+    return {
+        "type": "LSTM",
+        "activation": config["activation"],
+        "recurrent_activation": config["recurrent_activation"],
+        "go_backwards": bool(config.get("go_backwards", False)),
+        "return_sequences": bool(config.get("return_sequences", False)),
+    }
+
+class NumpyBackend:
+    """
+    Menjalankan model hasil export_numpy() hanya dengan NumPy: tanpa impor TensorFlow,
+    dengan proyeksi Embedding x kernel LSTM yang dihitung sekali saat dimuat.
+
+    Bobot hasil --quantize tetap int8 di memori: setiap perkalian memakai matriks int8 lalu
+    mengalikan skala per kolom setelahnya. Tabel proyeksi Embedding x kernel juga disimpan
+    int8 (dikuantisasi ulang saat dimuat), jadi tidak ada salinan float32 bobot yang menetap.
+    """
+
+    name = "numpy"
+
+    def __init__(self, path=NUMPY_MODEL_PATH):
+        self.path = path
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data["config"]))
+            if header.get("version") != EXPORT_FORMAT_VERSION:
+                raise ValueError(f"Versi format {path} tidak dikenal: {header.get('version')}")
+            self.quantized = header["quantized"]
+            self._steps = self._build(header["layers"], data)
+
+    @staticmethod
+    def _weight(data, index, name, spec):
+        key = f"layer{index}_{name}"
+        if name in spec["quantized"]:
+            return data[key + "__q"], data[key + "__scale"]
+        return data[key]
+
+    def _build(self, layers, data):
+        steps = []
+        table = None
+        for index, spec in enumerate(layers):
+            kind = spec["type"]
+            if kind == "Embedding":
+                table = self._weight(data, index, "embeddings", spec)
+                mask_zero = spec["mask_zero"]
+                fuse = index + 1 < len(layers) and layers[index + 1]["type"] in ("LSTM", "Bidirectional")
+                if not fuse:
+                    steps.append(lambda x, mask, active, t=table, mz=mask_zero: (_rows(t, x), x != 0 if mz else mask))
+                    table = None
+                continue
+            if kind == "Dense":
+                kernel = self._weight(data, index, "kernel", spec)
+                bias = self._weight(data, index, "bias", spec)
+                activation = _activation(spec["activation"])
+                steps.append(lambda x, mask, active, k=kernel, b=bias, a=activation: (a(_dot(x, k) + b), mask))
+                continue
+
+            directions = spec["layers"] if kind == "Bidirectional" else [spec]
+            prefixes = ("forward_", "backward_") if kind == "Bidirectional" else ("",)
+            runners = []
+            for sub, prefix in zip(directions, prefixes):
+                kernel = self._weight(data, index, prefix + "kernel", spec)
+                bias = self._weight(data, index, prefix + "bias", spec)
+                recurrent = self._weight(data, index, prefix + "recurrent_kernel", spec)
+                projection = self._projection(table, kernel, bias) if table is not None else None
+                runners.append((kernel, bias, recurrent, projection, sub))
+            steps.append(self._lstm_step(runners, mask_zero if table is not None else False))
+            table = None
+        return steps
+
+    @staticmethod
+    def _projection(table, kernel, bias):
+        """
+        Tabel Embedding x kernel + bias untuk setiap id; untuk model int8 hasilnya dikuantisasi
+        lagi (float32 hanya sementara selama dimuat)
+        """
+        if not isinstance(table, tuple) and not isinstance(kernel, tuple):
+            return (table @ kernel + bias).astype(np.float32)
+        rows = len(table[0] if isinstance(table, tuple) else table)
+        starts = range(0, rows, PROJECTION_BLOCK_ROWS)
+
+        def block(start):
+            return _dot(_rows(table, slice(start, start + PROJECTION_BLOCK_ROWS)), kernel) + bias
+
+        # Dua lintasan per blok (maksimum per kolom, lalu kuantisasi) agar tabel float32 utuh tidak pernah ada
+        peak = np.max([np.abs(block(start)).max(axis=0) for start in starts], axis=0)
+        scale = (peak / 127.0).astype(np.float32)
+        scale[scale == 0] = 1.0
+        q = np.empty((rows, len(scale)), dtype=np.int8)
+        for start in starts:
+            q[start:start + PROJECTION_BLOCK_ROWS] = np.round(block(start) / scale)
+        return q, scale
+
+    @staticmethod
+    def _lstm_step(runners, mask_zero):
+        def step(x, mask, active):
+            if mask_zero:
+                mask = x != 0
+            outputs = []
+            for kernel, bias, recurrent, projection, spec in runners:
+                # Embedding yang digabung: proyeksi input cukup berupa lookup tabel
+                xw = _rows(projection, x) if projection is not None else _dot(x, kernel) + bias
+                outputs.append(_run_lstm(
+                    xw, mask, recurrent,
+                    _activation(spec["activation"]),
+                    _activation(spec["recurrent_activation"]),
+                    spec["go_backwards"],
+                    spec["return_sequences"],
+                    active,
+                ))
+            output = outputs[0] if len(outputs) == 1 else np.concatenate(outputs, axis=-1)
+            return output, mask if output.ndim == 3 else None
+        return step
+
+    def predict(self, padded, batch_size=None, verbose=0):
+        """
+        Antarmuka sama dengan keras Model.predict / predict_on_batch sehingga HoaxDetector dapat memakainya langsung
+        """
+        x, mask = np.asarray(padded), None
+        for step in self._steps:
+            x, mask = step(x, mask, None)
+        return x
+
+    def predict_on_batch(self, padded):
+        return self.predict(padded)
+
+    def predict_ragged(self, padded, widths):
+        """
+        Setara dengan menjalankan tiap baris sebagai padded[row, -widths[row]:], tetapi dalam
+        satu lintasan: baris mulai dihitung pada kolom awalnya masing-masing
+        """
+        padded = np.asarray(padded)
+        starts = padded.shape[1] - np.asarray(widths)
+        order = np.argsort(starts, kind="stable")
+        active = np.searchsorted(starts[order], np.arange(padded.shape[1]), side="right")
+        x, mask = padded[order], None
+        for step in self._steps:
+            x, mask = step(x, mask, active)
+        result = np.empty_like(x)
+        result[order] = x
+        return result
+
+class CompiledModel:
+    """
+    Membungkus model Keras untuk inferensi latensi rendah tanpa data adapter, callback dan
+    progress bar model.predict per panggilan. Bentuk (baris, lebar) yang didaftarkan lewat
+    compile_shapes() dijalankan sebagai fungsi XLA berbentuk tetap (baris dibulatkan ke
+    COMPILED_ROW_BUCKETS); bentuk lain memakai satu graf dengan signature dinamis.
+    """
+
+    name = "keras"
+
+    def __init__(self, model, row_buckets=COMPILED_ROW_BUCKETS, jit_compile=True):
+        import tensorflow as tf
+
+        self.model = model
+        self.row_buckets = tuple(sorted(row_buckets))
+        # Lebar sekuens yang sudah dikompilasi untuk semua row_buckets
+        self.widths = frozenset()
+        inputs = getattr(model, "inputs", None)
+        dtype = inputs[0].dtype if inputs else tf.int32
+
+        def call(padded):
+            return model(tf.cast(padded, dtype), training=False)
+
+        self._dynamic = tf.function(call, input_signature=[tf.TensorSpec([None, None], tf.int32)])
+        self._fixed = tf.function(call, jit_compile=jit_compile)
+
+    def compile_shapes(self, widths):
+        """
+        Mengompilasi dan memanaskan fungsi berbentuk tetap untuk setiap lebar x row_buckets
+        (dipanggil sekali saat model dimuat, bukan pada permintaan pertama)
+        """
+        widths = {int(width) for width in widths}
+        for width in sorted(widths - self.widths):
+            for rows in self.row_buckets:
+                self._fixed(np.zeros((rows, width), dtype=np.int32))
+        self.widths = self.widths | widths
+        return self
+
+    def predict(self, padded, batch_size=None, verbose=0):
+        """
+        Antarmuka sama dengan keras Model.predict / predict_on_batch
+        """
+        padded = np.asarray(padded, dtype=np.int32)
+        rows, width = padded.shape
+        if width not in self.widths or rows > self.row_buckets[-1]:
+            return self._dynamic(padded).numpy()
+        size = self.row_buckets[bisect_left(self.row_buckets, rows)]
+        if size > rows:
+            padded = np.concatenate([padded, np.zeros((size - rows, width), dtype=np.int32)])
+        return self._fixed(padded).numpy()[:rows]
+
+    def predict_on_batch(self, padded):
+        return self.predict(padded)
+
+def load_keras(path=MODEL_PATH):
+    model = load_lstm_model(path)
+    return CompiledModel(model) if KERAS_COMPILED else model
+
+# Nama backend -> (fungsi pemuat, path model default)
+BACKENDS = {
+    "keras": (load_keras, MODEL_PATH),
+    "numpy": (NumpyBackend, NUMPY_MODEL_PATH),
+}
+
+def load_backend(name=MODEL_BACKEND, path=None):
+    """
+    Memuat model untuk backend yang dipilih; hasilnya memiliki predict() ala Keras
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend '{name}' tidak dikenal (pilihan: {', '.join(BACKENDS)})")
+    loader, default_path = BACKENDS[name]
+    return loader(path or default_path)
+
+def default_model_path(name=MODEL_BACKEND):
+    return BACKENDS[name][1]
+
+def check_parity(reference, candidate, n_samples=256, seed=0):
+    """
+    Membandingkan prediction[:, 1] dua model pada sekuens acak yang di-pre-padding
+    """
+    rng = np.random.default_rng(seed)
+    padded = np.zeros((n_samples, max_len), dtype=np.int32)
+    for row in range(n_samples):
+        length = int(rng.integers(1, max_len + 1))
+        padded[row, max_len - length:] = rng.integers(1, max_features, size=length)
+    expected = reference.predict(padded, batch_size=n_samples, verbose=0)[:, 1]
+    actual = candidate.predict(padded, batch_size=n_samples, verbose=0)[:, 1]
+    return float(np.abs(expected - actual).max())
+
+def main():
+    parser = argparse.ArgumentParser(description="Ekspor model LSTM ke backend numpy ringan (tanpa TensorFlow)")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--quantize", action="store_true", help="kuantisasi bobot dynamic-range int8")
+    parser.add_argument("--tolerance", type=float, default=None, help="selisih maksimum prediction[:, 1] terhadap Keras")
+    args = parser.parse_args()
+
+    out = args.out or (NUMPY_MODEL_PATH.replace(".npz", "_int8.npz") if args.quantize else NUMPY_MODEL_PATH)
+    tolerance = args.tolerance if args.tolerance is not None else (0.02 if args.quantize else 1e-4)
+    model = export_numpy(args.model, out, quantize=args.quantize)
+    diff = check_parity(model, NumpyBackend(out))
+    print(f"{out} ditulis ({os.path.getsize(out)} byte), selisih maksimum prediction[:, 1]: {diff:.2e}")
+    if diff > tolerance:
+        raise SystemExit(f"GAGAL: selisih melebihi toleransi {tolerance}")
+
+if __name__ == "__main__":
+    main()
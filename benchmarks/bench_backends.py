@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import backends
+import pipeline
+from benchmarks.corpus import generate_corpus
+from encoder import SequenceEncoder
+from vocab import load_vocabulary
+
+def encode_corpus(n_docs, seed):
+    pipeline.setup_nltk()
+    vocabulary = load_vocabulary()
+    encoder = SequenceEncoder(vocabulary, pipeline.stop_words, max_len=pipeline.max_len)
+    matrix, _ = encoder.encode(pipeline.normalize_batch(generate_corpus(n_docs, seed=seed)))
+    return matrix.copy()
+
+def measure_child(backend, path):
+    """
+    Memuat backend di proses baru agar impor dan memori tiap backend terukur terpisah
+    """
+    start = time.perf_counter()
+    model = backends.load_backend(backend, path)
+    load = time.perf_counter() - start
+    model.predict(np.zeros((32, pipeline.max_len), dtype=np.int32), batch_size=32, verbose=0)
+    print(json.dumps({"load_s": load, "max_rss_mb": peak_rss_mb()}))
+
+def peak_rss_mb():
+    # ru_maxrss ikut mewarisi nilai proses induk setelah fork, jadi VmHWM lebih akurat di Linux
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def child_stats(backend, path):
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_backends", "--child", backend, "--path", path],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def latency(model, matrix, batch_size, repeats):
+    timings = []
+    for _ in range(repeats):
+        for i in range(0, len(matrix), batch_size):
+            batch = matrix[i:i + batch_size]
+            start = time.perf_counter()
+            model.predict(batch, batch_size=len(batch), verbose=0)
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity dan latensi/memori tiap backend inferensi")
+    parser.add_argument("--docs", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--batch-sizes", default="1,32")
+    parser.add_argument("--keras-model", default=pipeline.MODEL_PATH)
+    parser.add_argument("--numpy-model", default=backends.NUMPY_MODEL_PATH)
+    parser.add_argument("--int8-model", default=backends.NUMPY_MODEL_PATH.replace(".npz", "_int8.npz"))
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--path", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child(args.child, args.path)
+        return
+
+    candidates = [("keras", "keras", args.keras_model), ("numpy", "numpy", args.numpy_model), ("numpy-int8", "numpy", args.int8_model)]
+    candidates = [item for item in candidates if os.path.exists(item[2])]
+    matrix = encode_corpus(args.docs, args.seed)
+    reference = backends.load_backend("keras", args.keras_model)
+    expected = reference.predict(matrix, batch_size=len(matrix), verbose=0)[:, 1]
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    print(f"{'backend':<12} {'maks selisih':>12} {'beda kelas':>10} " + " ".join(f"{f'p50 b={b}':>11}" for b in batch_sizes) + f" {'muat':>8} {'maks RSS':>10}")
+    for label, backend, path in candidates:
+        model = reference if backend == "keras" else backends.load_backend(backend, path)
+        actual = model.predict(matrix, batch_size=len(matrix), verbose=0)[:, 1]
+        diff = float(np.abs(actual - expected).max())
+        flipped = int(((actual > pipeline.THRESHOLD) != (expected > pipeline.THRESHOLD)).sum())
+        timings = [latency(model, matrix, size, args.repeats) for size in batch_sizes]
+        stats = child_stats(backend, path)
+        print(f"{label:<12} {diff:>12.2e} {flipped:>10d} " + " ".join(f"{t:>8.2f} ms" for t in timings)
+              + f" {stats['load_s']:>7.2f}s {stats['max_rss_mb']:>7.0f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+import backends
+import pipeline
+from benchmarks.corpus import generate_text
+from vocab import load_vocabulary
+
+# Distribusi panjang (jumlah kata) yang mendekati input pengguna: sebagian besar pesan
+# berantai / unggahan media sosial pendek, sisanya artikel berita panjang
+LENGTH_MIX = (
+    (0.55, 10, 60),
+    (0.30, 60, 200),
+    (0.15, 200, 700),
+)
+
+def generate_mixed_corpus(n_docs, seed=0):
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(n_docs):
+        pick, total = rng.random(), 0.0
+        for share, low, high in LENGTH_MIX:
+            total += share
+            if pick <= total:
+                break
+        docs.append(generate_text(rng, rng.randint(low, high)))
+    return docs
+
+def run(detector, batches, bucketed):
+    scores = []
+    start = time.perf_counter()
+    for batch in batches:
+        matrix, lengths = detector.encoder.encode(pipeline.normalize_batch(batch))
+        scores.append(detector.predict_proba(matrix, lengths if bucketed else None))
+    return time.perf_counter() - start, np.concatenate(scores)
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput inferensi per kelompok panjang dibanding padding penuh")
+    parser.add_argument("--backend", default=backends.MODEL_BACKEND, choices=sorted(backends.BACKENDS))
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--docs", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pipeline.setup_nltk()
+    detector = pipeline.HoaxDetector(backends.load_backend(args.backend, args.model), load_vocabulary())
+    detector.warmup()
+    if detector.pad_margin is None:
+        print("Model sensitif terhadap padding: inferensi per kelompok dinonaktifkan")
+        return
+
+    corpus = generate_mixed_corpus(args.docs, args.seed)
+    batches = [corpus[i:i + args.batch_size] for i in range(0, len(corpus), args.batch_size)]
+    _, lengths = detector.encoder.encode(pipeline.normalize_batch(corpus))
+    widths = detector._widths[np.searchsorted(detector.buckets, lengths)]
+    share = ", ".join(f"{w}: {np.mean(widths == w) * 100:.0f}%" for w in detector._widths.tolist())
+
+    # Putaran pertama untuk menyiapkan graf tiap bentuk input
+    run(detector, batches, False)
+    run(detector, batches, True)
+    full_time, full = run(detector, batches, False)
+    bucket_time, bucketed = run(detector, batches, True)
+
+    print(f"backend {args.backend}, margin padding {detector.pad_margin}, lebar kelompok ({share})")
+    print(f"selisih maksimum prediction[:, 1]: {np.abs(full - bucketed).max():.2e}")
+    print(f"padding penuh: {len(corpus) / full_time:8.1f} dok/detik")
+    print(f"per kelompok:  {len(corpus) / bucket_time:8.1f} dok/detik ({full_time / bucket_time:.2f}x)")
+
+if __name__ == "__main__":
+    main()
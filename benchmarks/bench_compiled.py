@@ -0,0 +1,76 @@
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+import pipeline
+from backends import CompiledModel
+from benchmarks.corpus import generate_text
+from benchmarks.standin import build_standin_keras
+from vocab import load_vocabulary
+
+def percentiles(timings):
+    ordered = sorted(timings)
+    return statistics.median(ordered), ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+
+def time_requests(fn, inputs):
+    timings = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def load_keras_model(path, seed):
+    if path:
+        return pipeline.load_lstm_model(path)
+    return build_standin_keras(seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Latensi satu permintaan: model.predict vs CompiledModel (tf.function + XLA)")
+    parser.add_argument("--model", default=None, help="file .h5; default model pengganti berarsitektur sama")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--words", default="10,50,300")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pipeline.setup_nltk()
+    vocabulary = load_vocabulary()
+    rng = random.Random(args.seed)
+
+    # Jalur lama di app: pad ke max_len lalu model.predict() per permintaan
+    raw = load_keras_model(args.model, args.seed)
+    legacy = pipeline.HoaxDetector(raw, vocabulary, buckets=(pipeline.max_len,))
+    start = time.perf_counter()
+    compiled = pipeline.HoaxDetector(CompiledModel(load_keras_model(args.model, args.seed)), vocabulary)
+    compiled.warmup()
+    print(f"Pemanasan CompiledModel (kalibrasi + kompilasi lebar {sorted(compiled.model.widths)}): "
+          f"{time.perf_counter() - start:.2f} s")
+
+    def legacy_predict(text):
+        matrix, _ = legacy.encoder.encode(pipeline.normalize_batch([text]))
+        return raw.predict(matrix, verbose=0)
+
+    paths = [
+        ("model.predict", legacy_predict),
+        ("predict_on_batch", lambda text: legacy.predict_batch([text])),
+        ("CompiledModel", lambda text: compiled.predict_batch([text])),
+    ]
+    print(f"{'jalur':<18} {'kata':>5} {'pertama':>10} {'p50':>9} {'p99':>9}")
+    for words in [int(value) for value in args.words.split(",")]:
+        texts = [generate_text(rng, words) for _ in range(args.requests + 1)]
+        for name, fn in paths:
+            first = time_requests(fn, texts[:1])[0]
+            p50, p99 = percentiles(time_requests(fn, texts[1:]))
+            print(f"{name:<18} {words:>5} {first:>7.2f} ms {p50:>6.2f} ms {p99:>6.2f} ms")
+
+    # Hasil kedua jalur harus sama (toleransi pembulatan float32)
+    matrix = np.random.default_rng(args.seed).integers(1, pipeline.max_features, size=(64, pipeline.max_len), dtype=np.int32)
+    expected = raw.predict(matrix, verbose=0)[:, 1]
+    actual = compiled.predict_proba(matrix)
+    print(f"Selisih maksimum prediction[:, 1]: {np.abs(expected - actual).max():.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+import pipeline
+from benchmarks.corpus import generate_corpus
+from encoder import SequenceEncoder
+from vocab import VOCAB_PATH, load_vocabulary
+
+def legacy_encode(vocabulary, texts):
+    sequences = vocabulary.texts_to_sequences([" ".join(pipeline.preprocess(text)) for text in texts])
+    return pad_sequences(sequences=sequences, maxlen=pipeline.max_len, padding='pre')
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek kesetaraan dan kecepatan SequenceEncoder terhadap texts_to_sequences + pad_sequences")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--max-words", type=int, default=600)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--vocab", default=VOCAB_PATH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pipeline.setup_nltk()
+    vocabulary = load_vocabulary(args.vocab)
+    encoder = SequenceEncoder(vocabulary, pipeline.stop_words, max_len=pipeline.max_len)
+    corpus = generate_corpus(args.docs, max_words=args.max_words, seed=args.seed)
+    batches = [corpus[i:i + args.batch_size] for i in range(0, len(corpus), args.batch_size)]
+
+    for batch in batches:
+        matrix, _ = encoder.encode(pipeline.normalize_batch(batch))
+        expected = legacy_encode(vocabulary, batch)
+        if matrix.dtype != np.int32 or not np.array_equal(matrix, expected):
+            print("GAGAL: matriks SequenceEncoder berbeda dari pipeline lama")
+            sys.exit(1)
+
+    start = time.perf_counter()
+    for batch in batches:
+        legacy_encode(vocabulary, batch)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for batch in batches:
+        encoder.encode(pipeline.normalize_batch(batch))
+    fused = time.perf_counter() - start
+
+    print(f"Parity OK untuk {len(corpus)} dokumen ({len(batches)} batch)")
+    print(f"lama: {legacy * 1000:.1f} ms, baru: {fused * 1000:.1f} ms, percepatan {legacy / fused:.1f}x")
+
+if __name__ == "__main__":
+    main()
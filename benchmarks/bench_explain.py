@@ -0,0 +1,65 @@
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+import backends
+import pipeline
+from benchmarks.corpus import generate_text
+from benchmarks.standin import load_model_or_standin
+from vocab import load_vocabulary
+
+def percentiles(timings):
+    ordered = sorted(timings)
+    return statistics.median(ordered), ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+
+def explain_per_variant(detector, text):
+    """
+    Pembanding: satu panggilan model per token yang dihilangkan
+    """
+    ids = detector.encoder.token_ids(pipeline.normalize(text))[-pipeline.max_len:]
+    base = detector.predict_proba(pipeline_row(ids))[0]
+    return [base - detector.predict_proba(pipeline_row(ids[:i] + ids[i + 1:]))[0] for i in range(len(ids))]
+
+def pipeline_row(ids):
+    row = np.zeros((1, pipeline.max_len), dtype=np.int32)
+    if ids:
+        row[0, pipeline.max_len - len(ids):] = ids
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description="Latensi penjelasan oklusi (explain) per panjang teks")
+    parser.add_argument("--backend", default=backends.MODEL_BACKEND, choices=sorted(backends.BACKENDS))
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--words", default="20,60,300,2000")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=pipeline.EXPLAIN_BUDGET_MS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pipeline.setup_nltk()
+    model, source = load_model_or_standin(args.backend, args.model, args.seed)
+    detector = pipeline.HoaxDetector(model, load_vocabulary())
+    detector.warmup()
+    rng = random.Random(args.seed)
+    print(f"Model: {source} ({args.backend}), anggaran {args.budget_ms:.0f} ms")
+    print(f"{'kata':>5} {'varian':>7} {'rentang':>8} {'p50':>9} {'p99':>9} {'per varian (loop)':>18}")
+    for words in [int(value) for value in args.words.split(",")]:
+        texts = [generate_text(rng, words) for _ in range(args.requests)]
+        timings, last = [], None
+        for text in texts:
+            start = time.perf_counter()
+            last = detector.explain(text, budget_ms=args.budget_ms) or last
+            timings.append((time.perf_counter() - start) * 1000)
+        p50, p99 = percentiles(timings)
+        # Beberapa teks sintetis tergabung tanpa spasi; pembanding memakai teks bertoken median
+        typical = sorted(texts, key=lambda text: len(pipeline.normalize(text)))[len(texts) // 2]
+        start = time.perf_counter()
+        explain_per_variant(detector, typical)
+        loop = (time.perf_counter() - start) * 1000
+        print(f"{words:>5} {last['variants']:>7} {last['span']:>8} {p50:>6.2f} ms {p99:>6.2f} ms {loop:>15.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+import backends
+import grok
+import pipeline
+from benchmarks.bench_stages import git_commit
+from benchmarks.corpus import generate_text
+from benchmarks.standin import load_model_or_standin
+from cache import PredictionCache, RecommendationCache
+from grok_stub import start_stub
+from health import CircuitBreaker
+from metrics import metrics
+from near_duplicates import NearDuplicateIndex
+from rate_limit import RateLimiter
+from recommendations import RecommendationService
+from vocab import load_vocabulary
+
+# Versi skema file hasil; naikkan jika struktur JSON berubah
+RESULT_SCHEMA_VERSION = 1
+
+# Campuran panjang teks (proporsi, kata minimum, kata maksimum): pesan berantai pendek,
+# berita biasa dan artikel panjang
+TEXT_MIX = ((0.70, 10, 80), (0.25, 80, 400), (0.05, 1000, 3000))
+
+# Tahap yang dilaporkan: tahap pipeline dari metrics, ditambah waktu yang dirasakan pengguna
+PIPELINE_STAGES = ("preprocess", "encode", "inference", "long_document", "grok")
+USER_STAGES = ("predict", "recommendation", "total")
+
+class Workload:
+    """
+    Teks berbahasa Indonesia sintetis dengan proporsi duplikat tertentu; sebagian duplikat
+    diedit sedikit seperti pesan berantai yang diteruskan ulang
+    """
+
+    def __init__(self, duplicate_ratio, edited_ratio, seed):
+        self.duplicate_ratio = duplicate_ratio
+        self.edited_ratio = edited_ratio
+        self._rng = random.Random(seed)
+        self._issued = []
+        self._lock = threading.Lock()
+
+    def _fresh(self):
+        roll, total = self._rng.random(), 0.0
+        for share, low, high in TEXT_MIX:
+            total += share
+            if roll < total:
+                break
+        return generate_text(self._rng, self._rng.randint(low, high), noise_rate=0.05)
+
+    def next_text(self):
+        with self._lock:
+            if self._issued and self._rng.random() < self.duplicate_ratio:
+                text = self._rng.choice(self._issued)
+                if self._rng.random() < self.edited_ratio:
+                    text = text + " " + self._rng.choice(("sebarkan!!", "penting", "info grup sebelah", "🙏"))
+                return text
+            text = self._fresh()
+            self._issued.append(text)
+            return text
+
+def percentiles(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return {"count": len(ordered), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+def configure_grok(url, rate_limit, read_timeout, deadline):
+    """
+    Mengarahkan klien Grok ke server tiruan dan mengembalikan breaker / limiter ke keadaan awal
+    """
+    grok.GROK_API_URL = url
+    # Server tiruan tidak memeriksa kunci, tetapi klien menolak berjalan tanpa kunci
+    grok.GROK_API_KEY = grok.GROK_API_KEY or "stub"
+    grok.READ_TIMEOUT = read_timeout
+    grok.REQUEST_DEADLINE = deadline
+    grok.breaker = CircuitBreaker(failure_threshold=grok.FAILURE_THRESHOLD, recovery_timeout=grok.RECOVERY_TIMEOUT)
+    # Rate limiter produksi (per proses) ikut diuji kecuali dimatikan
+    grok.limiter = RateLimiter(grok.REQUESTS_PER_MINUTE, grok.TOKENS_PER_MINUTE) if rate_limit else RateLimiter(10 ** 6, 10 ** 9)
+    grok.client_stats = grok.ClientStats()
+
+def run_level(detector, users, args, stub_config):
+    """
+    Menjalankan users pengguna virtual selama args.duration detik. Setiap pengguna mengikuti
+    alur submit di app: predict_batch satu teks, submit rekomendasi, menunggu hasilnya
+    (atau langsung memakai rekomendasi cadangan), lalu jeda berpikir.
+    """
+    metrics.reset()
+    configure_grok(args.grok_url or args.stub_url, not args.unlimited, args.grok_read_timeout, args.grok_deadline)
+    version = f"loadtest-{users}"
+    detector.cache = PredictionCache(version, maxsize=args.cache_size)
+    index = NearDuplicateIndex(capacity=args.near_duplicates, stop_words=pipeline.stop_words, model_version=version) if args.near_duplicates else None
+    detector.near_duplicates = index
+    service = RecommendationService(
+        max_workers=args.recommendation_workers,
+        max_pending=args.max_pending,
+        streaming=not args.no_streaming,
+        cache=RecommendationCache(grok.PROMPT_VERSION, maxsize=args.cache_size),
+        near_duplicates=index,
+    )
+    workload = Workload(args.duplicate_ratio, args.edited_ratio, args.seed + users)
+    stub_before = (stub_config.requests, stub_config.rate_limited, stub_config.timed_out) if stub_config else None
+    completed = unprocessable = 0
+    # Rekomendasi yang tidak selesai dalam batas tunggu: pengguna mendapat rekomendasi cadangan
+    timed_out = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + args.duration
+
+    def user(index):
+        nonlocal completed, unprocessable
+        rng = random.Random(args.seed * 1000 + index)
+        while time.monotonic() < stop_at:
+            text = workload.next_text()
+            start = time.perf_counter()
+            verdict = detector.predict_batch([text])[0]
+            predicted = time.perf_counter()
+            metrics.observe("predict", predicted - start)
+            if verdict is None:
+                with lock:
+                    unprocessable += 1
+                continue
+            pending = service.submit(text, verdict["pred_class"], verdict["confidence"])
+            waited_out = pending is not None and not pending.wait(args.grok_deadline + args.grok_read_timeout)
+            finished = time.perf_counter()
+            metrics.observe("recommendation", finished - predicted)
+            metrics.observe("total", finished - start)
+            with lock:
+                completed += 1
+                if waited_out:
+                    timed_out.append(pending)
+            if args.think_time:
+                time.sleep(rng.uniform(0, 2 * args.think_time))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=user, args=(i,), name=f"user-{i}", daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    # Permintaan yang masih berjalan diselesaikan (yang masih antre dibatalkan) agar tidak
+    # mencatat metrics setelah hasil tingkat ini dibaca
+    service.close()
+
+    recommendation_sources = {
+        source: metrics.counter("validin_recommendations_total", source=source)
+        for source in ("grok", "cache", "near_duplicate", "fallback")
+    }
+    fallback_reasons = {
+        reason: metrics.counter("validin_fallback_total", reason=reason)
+        for reason in ("unavailable", "queue_full", "error")
+    }
+    # Pengguna yang berhenti menunggu dihitung sebagai fallback wait_timeout; jika permintaannya
+    # selesai belakangan, hitungan grok / error yang dicatat service untuknya dikeluarkan
+    for pending in timed_out:
+        if not pending.done.is_set():
+            continue
+        if pending.error is None:
+            recommendation_sources["grok"] -= 1
+        else:
+            recommendation_sources["fallback"] -= 1
+            fallback_reasons["error"] -= 1
+    recommendation_sources["fallback"] += len(timed_out)
+    fallback_reasons["wait_timeout"] = len(timed_out)
+    fallback_reasons = {reason: count for reason, count in fallback_reasons.items() if count}
+    recommendations = sum(recommendation_sources.values())
+    result = {
+        "users": users,
+        "elapsed_s": elapsed,
+        "completed": completed,
+        "unprocessable": unprocessable,
+        "throughput_rps": completed / elapsed,
+        "stages": {stage: percentiles(metrics.samples(stage)) for stage in USER_STAGES + PIPELINE_STAGES},
+        "fallback_rate": recommendation_sources["fallback"] / recommendations if recommendations else 0.0,
+        "fallback_reasons": fallback_reasons,
+        "recommendation_sources": recommendation_sources,
+        "prediction_sources": {
+            source: metrics.counter("validin_predictions_total", source=source)
+            for source in ("model", "cache", "near_duplicate", "unprocessable")
+        },
+        "grok_client": grok.client_stats.summary(),
+        "service": {key: value for key, value in service.stats().items() if not isinstance(value, dict)},
+    }
+    if stub_config is not None:
+        result["stub"] = {
+            "requests": stub_config.requests - stub_before[0],
+            "rate_limited": stub_config.rate_limited - stub_before[1],
+            "timed_out": stub_config.timed_out - stub_before[2],
+        }
+    return result
+
+def print_level(result, log):
+    log(f"\n{result['users']} pengguna: {result['completed']} permintaan dalam {result['elapsed_s']:.1f} s "
+        f"= {result['throughput_rps']:.1f} req/detik, fallback {result['fallback_rate'] * 100:.1f}% "
+        f"{result['fallback_reasons'] or ''}")
+    log(f"  {'tahap':<16} {'jumlah':>7} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for stage, summary in result["stages"].items():
+        if summary is None:
+            continue
+        log(f"  {stage:<16} {summary['count']:>7} {summary['p50_ms']:>7.1f} ms {summary['p95_ms']:>7.1f} ms {summary['p99_ms']:>7.1f} ms")
+    log(f"  rekomendasi: {result['recommendation_sources']}, prediksi: {result['prediction_sources']}")
+    if "stub" in result:
+        log(f"  server tiruan: {result['stub']}, klien: {result['grok_client']}")
+
+def check_slo(results, slo_stage, slo_p99_ms, max_fallback_rate):
+    violations = []
+    for result in results:
+        summary = result["stages"].get(slo_stage)
+        if slo_p99_ms is not None and summary is not None and summary["p99_ms"] > slo_p99_ms:
+            violations.append(f"{result['users']} pengguna: p99 {slo_stage} {summary['p99_ms']:.1f} ms > {slo_p99_ms:.1f} ms")
+        if max_fallback_rate is not None and result["fallback_rate"] > max_fallback_rate:
+            violations.append(f"{result['users']} pengguna: fallback {result['fallback_rate'] * 100:.1f}% > {max_fallback_rate * 100:.1f}%")
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban end-to-end alur submit (prediksi + rekomendasi Grok) dengan server Grok tiruan")
+    parser.add_argument("--users", default="50,200,500", help="jumlah pengguna bersamaan per tingkat, dipisah koma")
+    parser.add_argument("--duration", type=float, default=30.0, help="lama tiap tingkat (detik)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="rata-rata jeda antar permintaan per pengguna (detik)")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3, help="proporsi teks yang pernah dikirim sebelumnya")
+    parser.add_argument("--edited-ratio", type=float, default=0.5, help="proporsi duplikat yang sedikit diedit")
+    parser.add_argument("--backend", default=backends.MODEL_BACKEND, choices=sorted(backends.BACKENDS))
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--long-documents", default=None, choices=pipeline.WINDOW_COMBINE_RULES)
+    parser.add_argument("--cache-size", type=int, default=10000)
+    parser.add_argument("--near-duplicates", type=int, default=100000, help="kapasitas indeks near-duplicate (0 = mati)")
+    parser.add_argument("--recommendation-workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=32)
+    parser.add_argument("--no-streaming", action="store_true")
+    parser.add_argument("--unlimited", action="store_true", help="matikan rate limiter klien Grok (produksi: 60 permintaan/menit)")
+    parser.add_argument("--grok-url", default=None, help="endpoint chat-completions lain; default server tiruan lokal")
+    parser.add_argument("--grok-read-timeout", type=float, default=5.0)
+    parser.add_argument("--grok-deadline", type=float, default=15.0)
+    parser.add_argument("--stub-latency", type=float, default=1.0, help="jeda respons server tiruan (detik)")
+    parser.add_argument("--stub-jitter", type=float, default=1.0, help="tambahan jeda acak maksimum (detik)")
+    parser.add_argument("--stub-chunk-delay", type=float, default=0.01)
+    parser.add_argument("--stub-429-ratio", type=float, default=0.05)
+    parser.add_argument("--stub-timeout-ratio", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="simpan hasil JSON ke file")
+    parser.add_argument("--slo-stage", default="predict", choices=USER_STAGES + PIPELINE_STAGES)
+    parser.add_argument("--slo-p99-ms", type=float, default=None, help="gagal (exit 1) jika p99 tahap SLO melebihi nilai ini")
+    parser.add_argument("--max-fallback-rate", type=float, default=None, help="gagal (exit 1) jika proporsi fallback melebihi nilai ini")
+    args = parser.parse_args()
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    pipeline.setup_nltk()
+    model, source = load_model_or_standin(args.backend, args.model, args.seed)
+    detector = pipeline.HoaxDetector(model, load_vocabulary(), long_documents=args.long_documents)
+    detector.warmup()
+    metrics.record_samples()
+
+    stub_server = stub_config = None
+    if args.grok_url is None:
+        stub_server, args.stub_url = start_stub(
+            latency=args.stub_latency,
+            latency_jitter=args.stub_jitter,
+            chunk_delay=args.stub_chunk_delay,
+            rate_limit_ratio=args.stub_429_ratio,
+            timeout_ratio=args.stub_timeout_ratio,
+            # Permintaan yang "menggantung" ditahan lebih lama dari batas baca klien
+            hang=args.grok_read_timeout + 1.0,
+            seed=args.seed,
+        )
+        stub_config = stub_server.RequestHandlerClass.config
+        log(f"Server Grok tiruan: {args.stub_url}")
+
+    results = []
+    try:
+        for users in [int(value) for value in args.users.split(",")]:
+            results.append(run_level(detector, users, args, stub_config))
+            print_level(results[-1], log)
+    finally:
+        if stub_server is not None:
+            stub_server.shutdown()
+
+    report = {
+        "schema": RESULT_SCHEMA_VERSION,
+        "meta": {
+            "commit": git_commit(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "backend": args.backend,
+            "model": source,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "stub_url")},
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        log(f"Hasil disimpan di {args.output}")
+
+    violations = check_slo(results, args.slo_stage, args.slo_p99_ms, args.max_fallback_rate)
+    for violation in violations:
+        log(f"SLO dilanggar: {violation}")
+    if violations:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from near_duplicates import NearDuplicateIndex, reference
+
+def random_document(rng, vocabulary_size, min_tokens=30, max_tokens=120):
+    return [f"w{rng.randrange(vocabulary_size)}" for _ in range(rng.randint(min_tokens, max_tokens))]
+
+def edit(rng, tokens, rate, vocabulary_size):
+    """
+    Salinan berita berantai yang sedikit diedit: sebagian token diganti dan sebagian disisipkan
+    """
+    edited = list(tokens)
+    for _ in range(max(1, int(len(tokens) * rate))):
+        position = rng.randrange(len(edited))
+        if rng.random() < 0.5:
+            edited[position] = f"w{rng.randrange(vocabulary_size)}"
+        else:
+            edited.insert(position, f"w{rng.randrange(vocabulary_size)}")
+    return edited
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def time_lookups(index, queries):
+    timings, matches = [], []
+    for tokens in queries:
+        start = time.perf_counter()
+        matches.append(index.lookup(tokens))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings, matches
+
+def main():
+    parser = argparse.ArgumentParser(description="Latensi, recall dan memori indeks near-duplicate")
+    parser.add_argument("--entries", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--edit-rate", type=float, default=0.03, help="proporsi token yang diedit pada salinan")
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = NearDuplicateIndex(capacity=args.entries)
+    # Dokumen yang akan dicari kembali disimpan; sisanya hanya mengisi indeks
+    kept = {}
+    keep_every = max(1, args.entries // args.queries)
+    start = time.perf_counter()
+    for i in range(args.entries):
+        tokens = random_document(rng, args.vocabulary)
+        index.add(tokens, rng.random())
+        if i % keep_every == 0 and len(kept) < args.queries:
+            kept[i] = tokens
+    elapsed = time.perf_counter() - start
+    print(f"Indeks {args.entries} entri: {elapsed:.1f} s ({elapsed / args.entries * 1e6:.1f} µs/entri), "
+          f"memori array {index.memory_bytes() / 1e6:.1f} MB ({index.memory_bytes() / args.entries:.0f} byte/entri)")
+
+    edited = [edit(rng, tokens, args.edit_rate, args.vocabulary) for tokens in kept.values()]
+    hit_timings, matches = time_lookups(index, edited)
+    found = [match for match in matches if match is not None]
+    correct = sum(1 for match, tokens in zip(matches, kept.values()) if match is not None and match.ref == reference(tokens))
+    fresh = [random_document(rng, args.vocabulary) for _ in range(args.queries)]
+    miss_timings, false_matches = time_lookups(index, fresh)
+    false_positives = sum(1 for match in false_matches if match is not None)
+
+    print(f"{'kueri':<22} {'p50':>9} {'p99':>9} {'hasil':>28}")
+    print(f"{'salinan diedit':<22} {statistics.median(hit_timings):>6.3f} ms {percentile(hit_timings, 0.99):>6.3f} ms "
+          f"{f'recall {len(found) / len(edited):.3f}, ref benar {correct}/{len(edited)}':>28}")
+    print(f"{'teks baru':<22} {statistics.median(miss_timings):>6.3f} ms {percentile(miss_timings, 0.99):>6.3f} ms "
+          f"{f'false positive {false_positives}/{len(fresh)}':>28}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "near_duplicates.npz")
+        start = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        restored = NearDuplicateIndex.load(path)
+        loaded = time.perf_counter() - start
+        same = sum(1 for tokens in edited[:100] if (restored.lookup(tokens) is not None) == (index.lookup(tokens) is not None))
+        print(f"Snapshot {os.path.getsize(path) / 1e6:.1f} MB: simpan {saved:.2f} s, muat {loaded:.2f} s, "
+              f"hasil sama {same}/{min(100, len(edited))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import sys
+import time
+
+import pipeline
+from benchmarks.corpus import generate_corpus
+
+def legacy_preprocess(text):
+    return pipeline.remove_stop_words(pipeline.tokenize(pipeline.clean(text)))
+
+def check_parity(corpus):
+    """
+    Mengembalikan daftar indeks dokumen yang hasil tokennya berbeda dari pipeline lama
+    """
+    return [i for i, text in enumerate(corpus) if pipeline.preprocess(text) != legacy_preprocess(text)]
+
+def time_it(fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(corpus)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek kesetaraan dan kecepatan preprocess() terhadap pipeline lama")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--max-words", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pipeline.setup_nltk()
+    corpus = generate_corpus(args.docs, max_words=args.max_words, seed=args.seed)
+
+    mismatches = check_parity(corpus)
+    if mismatches:
+        i = mismatches[0]
+        print(f"GAGAL: {len(mismatches)} dokumen berbeda, contoh #{i}: {corpus[i][:200]!r}")
+        print(f"  lama: {legacy_preprocess(corpus[i])[:30]}")
+        print(f"  baru: {pipeline.preprocess(corpus[i])[:30]}")
+        sys.exit(1)
+
+    legacy = time_it(lambda docs: [legacy_preprocess(t) for t in docs], corpus, args.repeat)
+    fast = time_it(pipeline.preprocess_batch, corpus, args.repeat)
+    print(f"Parity OK untuk {len(corpus)} dokumen")
+    print(f"lama: {legacy * 1000:.1f} ms, baru: {fast * 1000:.1f} ms, percepatan {legacy / fast:.1f}x")
+
+if __name__ == "__main__":
+    main()
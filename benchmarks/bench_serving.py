@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.corpus import generate_corpus
+
+API_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api.py")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_ready(url, timeout=120.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        try:
+            with urllib.request.urlopen(url + "/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server {url} tidak siap dalam {timeout:.0f} detik")
+
+def post(url, text):
+    request = urllib.request.Request(url + "/predict", data=json.dumps({"text": text}).encode("utf-8"))
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        # 422 (teks tidak dapat diproses) tetap merupakan respons yang lengkap
+        if e.code != 422:
+            raise
+    return time.perf_counter() - start
+
+def load(url, texts, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        latencies = sorted(executor.map(lambda text: post(url, text), texts))
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": len(texts) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput api.py untuk beberapa jumlah worker prefork")
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--backend", default="numpy")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Teks unik dan cache dimatikan agar setiap permintaan benar-benar menjalankan model
+    texts = generate_corpus(args.requests, max_words=200, seed=args.seed)
+    baseline = None
+    print(f"{'worker':>6} {'req/detik':>10} {'skala':>7} {'p50':>9} {'p99':>9}")
+    for workers in [int(value) for value in args.workers.split(",")]:
+        port = free_port()
+        command = [sys.executable, API_PATH, "--port", str(port), "--backend", args.backend,
+                   "--workers", str(workers), "--cache-size", "0"]
+        if args.model:
+            command += ["--model", args.model]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        url = f"http://127.0.0.1:{port}"
+        try:
+            wait_ready(url)
+            load(url, texts[:args.concurrency * 4], args.concurrency)
+            result = load(url, texts, args.concurrency)
+        finally:
+            server.terminate()
+            server.wait()
+        baseline = baseline or result["rps"]
+        print(f"{workers:>6} {result['rps']:>10.1f} {result['rps'] / baseline:>6.2f}x "
+              f"{result['p50_ms']:>6.1f} ms {result['p99_ms']:>6.1f} ms")
+
+if __name__ == "__main__":
+    main()
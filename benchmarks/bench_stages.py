@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import backends
+import grok
+import pipeline
+from benchmarks.corpus import generate_text
+from benchmarks.standin import load_model_or_standin
+from grok_stub import start_stub
+from rate_limit import RateLimiter
+from vocab import load_vocabulary
+
+# Versi skema file hasil; naikkan jika struktur JSON berubah
+RESULT_SCHEMA_VERSION = 1
+
+# Panjang teks (jumlah kata) dari pesan berantai pendek sampai artikel 5 ribu kata
+DEFAULT_WORDS = "10,50,300,1000,5000"
+DEFAULT_BATCH_SIZES = "1,32,256"
+
+def _legacy_pad_sequences():
+    """
+    pad_sequences Keras seperti di pipeline lama; None jika TensorFlow tidak terpasang
+    """
+    try:
+        from tensorflow.keras.preprocessing.sequence import pad_sequences
+    except ImportError:
+        return None
+    return lambda sequences: pad_sequences(sequences=sequences, maxlen=pipeline.max_len, padding='pre')
+
+def build_stages(detector, pad_sequences):
+    """
+    Setiap tahap menerima keluaran tahap sebelumnya untuk satu batch. Tahap lama (clean ->
+    tokenize -> remove_stop_words -> texts_to_sequences -> pad_sequences) diukur bersama
+    jalur yang dipakai sekarang (normalize -> encode -> predict)
+    """
+    vocabulary = detector.vocabulary
+    stages = [
+        ("clean", "texts", lambda texts: [pipeline.clean(text) for text in texts]),
+        ("tokenize", "clean", lambda cleaned: [pipeline.tokenize(text) for text in cleaned]),
+        ("remove_stop_words", "tokenize", lambda tokens: [pipeline.remove_stop_words(t) for t in tokens]),
+        ("texts_to_sequences", "remove_stop_words", lambda tokens: vocabulary.texts_to_sequences([" ".join(t) for t in tokens])),
+    ]
+    if pad_sequences is not None:
+        stages.append(("pad_sequences", "texts_to_sequences", pad_sequences))
+    stages += [
+        ("normalize", "texts", pipeline.normalize_batch),
+        ("encode", "normalize", lambda token_lists: detector.encoder.encode(token_lists, out=np.zeros((len(token_lists), pipeline.max_len), dtype=np.int32))),
+        ("predict", "encode", lambda encoded: detector.predict_proba(*encoded)),
+        ("predict_batch", "texts", detector.predict_batch),
+    ]
+    return stages
+
+def time_call(fn, argument, repeats):
+    timings = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(argument)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, result
+
+def summarize(stage, words, batch_size, timings):
+    ordered = sorted(timings)
+    median = statistics.median(ordered)
+    return {
+        "stage": stage,
+        "words": words,
+        "batch_size": batch_size,
+        "repeats": len(ordered),
+        "median_ms": median,
+        "p95_ms": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "min_ms": ordered[0],
+        "per_doc_ms": median / batch_size,
+    }
+
+def bench_pipeline(detector, pad_sequences, words_list, batch_sizes, repeats, seed, log):
+    results = []
+    stages = build_stages(detector, pad_sequences)
+    for words in words_list:
+        rng = random.Random(seed + words)
+        for batch_size in batch_sizes:
+            outputs = {"texts": [generate_text(rng, words) for _ in range(batch_size)]}
+            for name, source, fn in stages:
+                fn(outputs[source])  # putaran pemanasan (graf model, cache regex)
+                timings, outputs[name] = time_call(fn, outputs[source], repeats)
+                results.append(summarize(name, words, batch_size, timings))
+                log(f"{name:<20} {words:>6} kata  batch {batch_size:>4}: {results[-1]['median_ms']:10.2f} ms")
+    return results
+
+def bench_grok(words_list, calls, seed, latency, log):
+    """
+    Mengukur get_grok_recommendations() terhadap server tiruan lokal (tanpa jaringan keluar)
+    """
+    server, url = start_stub(latency=latency)
+    grok.GROK_API_URL = url
+    grok.GROK_API_KEY = grok.GROK_API_KEY or "stub"
+    # Rate limiter produksi (60 permintaan/menit) akan mendominasi hasil; di sini dinonaktifkan
+    grok.limiter = RateLimiter(10 ** 6, 10 ** 9)
+    results = []
+    try:
+        for words in words_list:
+            rng = random.Random(seed + words)
+            texts = [generate_text(rng, words) for _ in range(calls)]
+            timings = []
+            for text in texts:
+                start = time.perf_counter()
+                reply = grok.get_grok_recommendations(text, "HOAX", 87.5)
+                timings.append((time.perf_counter() - start) * 1000)
+                if reply.startswith("Error:"):
+                    raise RuntimeError(f"Server tiruan Grok gagal: {reply}")
+            results.append(summarize("get_grok_recommendations", words, 1, timings))
+            log(f"{'get_grok_recommendations':<20} {words:>6} kata  batch    1: {results[-1]['median_ms']:10.2f} ms")
+    finally:
+        server.shutdown()
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current, baseline, max_ratio):
+    """
+    Membandingkan median tiap (tahap, kata, batch) dengan hasil sebelumnya; mengembalikan
+    daftar entri yang melambat lebih dari max_ratio
+    """
+    previous = {(r["stage"], r["words"], r["batch_size"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'tahap':<25} {'kata':>6} {'batch':>6} {'sebelum':>11} {'sesudah':>11} {'rasio':>7}")
+    for result in current["results"]:
+        old = previous.get((result["stage"], result["words"], result["batch_size"]))
+        if old is None:
+            continue
+        ratio = result["median_ms"] / max(old["median_ms"], 1e-9)
+        flag = " <-- lebih lambat" if ratio > max_ratio else ""
+        print(f"{result['stage']:<25} {result['words']:>6} {result['batch_size']:>6} "
+              f"{old['median_ms']:>8.2f} ms {result['median_ms']:>8.2f} ms {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Waktu tiap tahap pipeline deteksi (hasil JSON untuk dibandingkan antar commit)")
+    parser.add_argument("--backend", default=backends.MODEL_BACKEND, choices=sorted(backends.BACKENDS))
+    parser.add_argument("--model", default=None, help="default: model backend; model pengganti jika file tidak ada")
+    parser.add_argument("--words", default=DEFAULT_WORDS, help="daftar panjang teks (kata), dipisah koma")
+    parser.add_argument("--batch-sizes", default=DEFAULT_BATCH_SIZES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--grok-calls", type=int, default=5, help="panggilan Grok per panjang teks (0 = lewati)")
+    parser.add_argument("--grok-latency", type=float, default=0.0, help="jeda respons server tiruan (detik)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="simpan hasil JSON ke file (default: stdout)")
+    parser.add_argument("--compare", default=None, help="file JSON hasil commit sebelumnya")
+    parser.add_argument("--max-ratio", type=float, default=1.25, help="batas perlambatan sebelum dianggap regresi")
+    args = parser.parse_args()
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    words_list = [int(value) for value in args.words.split(",")]
+    batch_sizes = [int(value) for value in args.batch_sizes.split(",")]
+
+    pipeline.setup_nltk()
+    model, source = load_model_or_standin(args.backend, args.model, args.seed)
+    detector = pipeline.HoaxDetector(model, load_vocabulary())
+    detector.warmup()
+    pad_sequences = _legacy_pad_sequences() if args.backend == "keras" else None
+    if pad_sequences is None:
+        log("pad_sequences Keras dilewati (backend tanpa TensorFlow)")
+
+    results = bench_pipeline(detector, pad_sequences, words_list, batch_sizes, args.repeats, args.seed, log)
+    if args.grok_calls:
+        results += bench_grok(words_list, args.grok_calls, args.seed, args.grok_latency, log)
+
+    report = {
+        "schema": RESULT_SCHEMA_VERSION,
+        "meta": {
+            "commit": git_commit(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "backend": args.backend,
+            "model": source,
+            "pad_margin": detector.pad_margin,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "repeats": args.repeats,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        log(f"Hasil disimpan di {args.output}")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(report, baseline, args.max_ratio)
+        if regressions:
+            log(f"{len(regressions)} tahap melambat lebih dari {args.max_ratio:.2f}x")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+import backends
+import pipeline
+from benchmarks.corpus import generate_text
+from vocab import load_vocabulary
+
+def article_chunks(n_paragraphs, words_per_paragraph, seed):
+    """
+    Artikel sintetis yang dibangkitkan per paragraf, tanpa pernah disimpan utuh di memori
+    """
+    rng = random.Random(seed)
+    for _ in range(n_paragraphs):
+        yield generate_text(rng, words_per_paragraph) + "\n"
+
+def main():
+    parser = argparse.ArgumentParser(description="Waktu dan memori puncak mode dokumen panjang (jendela geser)")
+    parser.add_argument("--backend", default=backends.MODEL_BACKEND, choices=sorted(backends.BACKENDS))
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--paragraphs", default="10,100,1000")
+    parser.add_argument("--words", type=int, default=200, help="jumlah kata per paragraf")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pipeline.setup_nltk()
+    detector = pipeline.HoaxDetector(backends.load_backend(args.backend, args.model), load_vocabulary())
+    detector.warmup()
+
+    print(f"{'paragraf':>9} {'aturan':>9} {'hoax_prob':>10} {'waktu':>8} {'memori puncak':>14}")
+    for n in [int(value) for value in args.paragraphs.split(",")]:
+        for combine in pipeline.WINDOW_COMBINE_RULES:
+            tracemalloc.start()
+            start = time.perf_counter()
+            verdict = detector.predict_long(article_chunks(n, args.words, args.seed), combine)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{n:>9} {combine:>9} {verdict['hoax_prob']:>10.4f} {elapsed:>7.2f}s {peak / 1e6:>11.2f} MB")
+
+if __name__ == "__main__":
+    main()
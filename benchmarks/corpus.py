@@ -0,0 +1,46 @@
+import random
+
+# Kosakata dasar untuk membangkitkan teks berita sintetis berbahasa Indonesia
+WORDS = (
+    "presiden indonesia pemerintah jakarta warga masyarakat berita viral hoax "
+    "vaksin covid kesehatan rumah sakit dokter polisi menteri dpr pemilu "
+    "partai calon gubernur bupati desa kota banjir gempa bencana bantuan sosial "
+    "uang rupiah harga beras minyak listrik pajak gratis hadiah undian pesan "
+    "whatsapp facebook media sosial foto video sebarkan segera penting waspada "
+    "resmi klarifikasi kominfo fakta kabar beredar mengatakan menurut sumber "
+    "laporan tahun bulan hari minggu ikan lele pokemon sekolah siswa guru "
+    "yang dan di ke dari untuk dengan ini itu tidak akan sudah juga ada pada "
+    "adalah karena oleh dalam bisa saat telah lebih kami mereka kita anda"
+).split()
+
+# Potongan "kotor" yang sering muncul di teks tempelan pengguna
+NOISE = [
+    "!!!", "??", "...", ",", ".", "(", ")", "\"", "'", "-", "--", "#hoax",
+    "@kominfo", "@user_01", "https://t.co/abc123", "http://bit.ly/x?y=1",
+    "www.contoh.com", "😱", "🙏", "\t", "\n", "2024", "Rp10.000", "50%",
+    "gonna", "Cannot", "WANNA", "gimme", "lemme", "gotta", "café://x",
+    "İstanbul", "\u212a", "naïve", "snake_case", "a_b://c", "e-mail",
+]
+
+def generate_text(rng, n_words, noise_rate=0.15):
+    """
+    Membangkitkan satu teks sintetis dengan jumlah kata tertentu
+    """
+    parts = []
+    for _ in range(n_words):
+        if rng.random() < noise_rate:
+            parts.append(rng.choice(NOISE))
+        word = rng.choice(WORDS)
+        if rng.random() < 0.1:
+            word = word.upper()
+        elif rng.random() < 0.2:
+            word = word.capitalize()
+        parts.append(word)
+    return rng.choice([" ", "  ", ""]).join(parts) if rng.random() < 0.05 else " ".join(parts)
+
+def generate_corpus(n_docs, min_words=5, max_words=400, seed=0, noise_rate=0.15):
+    """
+    Membangkitkan korpus sintetis dengan panjang dokumen acak
+    """
+    rng = random.Random(seed)
+    return [generate_text(rng, rng.randint(min_words, max_words), noise_rate) for _ in range(n_docs)]
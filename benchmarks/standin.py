@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+import backends
+import pipeline
+
+# Arsitektur model asli: Embedding(5000, 32) -> LSTM(32) -> Dense(2, softmax)
+EMBEDDING_DIM = 32
+LSTM_UNITS = 32
+
+def _standin_weights(seed):
+    """
+    Bobot acak dengan skala inisialisasi Keras (glorot uniform, bias forget gate = 1)
+    """
+    rng = np.random.default_rng(seed)
+
+    def glorot(fan_in, fan_out):
+        limit = np.sqrt(6.0 / (fan_in + fan_out))
+        return rng.uniform(-limit, limit, size=(fan_in, fan_out)).astype(np.float32)
+
+    bias = np.zeros(4 * LSTM_UNITS, dtype=np.float32)
+    bias[LSTM_UNITS:2 * LSTM_UNITS] = 1.0
+    return {
+        "embeddings": rng.uniform(-0.05, 0.05, size=(pipeline.max_features, EMBEDDING_DIM)).astype(np.float32),
+        "kernel": glorot(EMBEDDING_DIM, 4 * LSTM_UNITS),
+        "recurrent_kernel": glorot(LSTM_UNITS, 4 * LSTM_UNITS),
+        "bias": bias,
+        "dense_kernel": glorot(LSTM_UNITS, 2),
+        "dense_bias": np.zeros(2, dtype=np.float32),
+    }
+
+def write_standin_numpy(path, seed=0):
+    """
+    Menulis model pengganti berformat .npz backend numpy tanpa membutuhkan TensorFlow
+    """
+    weights = _standin_weights(seed)
+    layers = [
+        {"type": "Embedding", "mask_zero": False, "quantized": []},
+        {"type": "LSTM", "activation": "tanh", "recurrent_activation": "sigmoid",
+         "go_backwards": False, "return_sequences": False, "quantized": []},
+        {"type": "Dense", "activation": "softmax", "quantized": []},
+    ]
+    arrays = {
+        "layer0_embeddings": weights["embeddings"],
+        "layer1_kernel": weights["kernel"],
+        "layer1_recurrent_kernel": weights["recurrent_kernel"],
+        "layer1_bias": weights["bias"],
+        "layer2_kernel": weights["dense_kernel"],
+        "layer2_bias": weights["dense_bias"],
+    }
+    header = {"version": backends.EXPORT_FORMAT_VERSION, "quantized": False, "layers": layers}
+    arrays["config"] = np.array(json.dumps(header))
+    with open(path, "wb") as handle:
+        np.savez(handle, **arrays)
+    return path
+
+def build_standin_keras(seed=0):
+    from tensorflow import keras
+
+    weights = _standin_weights(seed)
+    model = keras.Sequential([
+        keras.Input(shape=(None,), dtype="int32"),
+        keras.layers.Embedding(pipeline.max_features, EMBEDDING_DIM),
+        keras.layers.LSTM(LSTM_UNITS),
+        keras.layers.Dense(2, activation="softmax"),
+    ])
+    model.layers[0].set_weights([weights["embeddings"]])
+    model.layers[1].set_weights([weights["kernel"], weights["recurrent_kernel"], weights["bias"]])
+    model.layers[2].set_weights([weights["dense_kernel"], weights["dense_bias"]])
+    return model
+
+def load_model_or_standin(backend, path=None, seed=0):
+    """
+    Memuat model asli jika filenya ada; jika tidak, model pengganti berarsitektur sama
+    (bobot acak) sehingga benchmark tetap dapat dijalankan. Mengembalikan (model, sumber)
+    """
+    path = path or backends.default_model_path(backend)
+    if os.path.exists(path):
+        return backends.load_backend(backend, path), path
+    if backend == "keras":
+        model = build_standin_keras(seed)
+        return (backends.CompiledModel(model) if backends.KERAS_COMPILED else model), "stand-in"
+    standin = os.path.join(tempfile.gettempdir(), f"validin_standin_{seed}.npz")
+    return backends.load_backend(backend, write_standin_numpy(standin, seed)), "stand-in"
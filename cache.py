@@ -0,0 +1,186 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    Cache LRU di memori dengan batas ukuran dan masa berlaku (TTL) per entri
+    """
+
+    def __init__(self, maxsize=10000, ttl=3600.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self.clock():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = self.clock() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class SqliteStore:
+    """
+    Penyimpanan key-value JSON di SQLite lokal agar cache bertahan setelah restart
+    """
+
+    def __init__(self, path, table="cache", ttl=None, max_rows=None):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return default
+            if row[1] is not None and row[1] <= now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return default
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+            if self.max_rows:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+
+    def purge_expired(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class TieredCache:
+    """
+    Cache dua tingkat: LRU di memori lalu (opsional) SQLite di disk, dengan penghitung hit/miss
+    """
+
+    def __init__(self, maxsize=10000, ttl=3600.0, path=None, table="cache", max_rows=None):
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.disk = SqliteStore(path, table=table, ttl=ttl, max_rows=max_rows) if path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key, default=None):
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self._count("disk_hits")
+                self.memory.set(key, value)
+                return value
+        self._count("misses")
+        return default
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "size": len(self.memory),
+            "evictions": self.memory.evictions,
+        }
+
+def token_hash(tokens, *parts):
+    """
+    Hash SHA-256 dari urutan token yang sudah dinormalisasi, ditambah komponen kunci lain
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(" ".join(tokens).encode("utf-8"))
+    return digest.hexdigest()
+
+class PredictionCache(TieredCache):
+    """
+    Cache hoax_prob yang dikunci dengan hash token ternormalisasi dan versi model
+    """
+
+    def __init__(self, model_version, maxsize=10000, ttl=24 * 3600.0, path=None, max_rows=None):
+        super().__init__(maxsize=maxsize, ttl=ttl, path=path, table="predictions", max_rows=max_rows)
+        self.model_version = model_version
+
+    def key(self, tokens, *parts):
+        return token_hash(tokens, "prediction", self.model_version, *parts)
+
+class RecommendationCache(TieredCache):
+    """
+    Cache teks rekomendasi Grok AI yang dikunci dengan hash token ternormalisasi,
+    kelas prediksi, kelompok kepercayaan dan versi template prompt
+    """
+
+    def __init__(self, prompt_version, maxsize=2000, ttl=7 * 24 * 3600.0, path=None, max_rows=50000):
+        super().__init__(maxsize=maxsize, ttl=ttl, path=path, table="recommendations", max_rows=max_rows)
+        self.prompt_version = prompt_version
+
+    def key(self, tokens, prediction_result, confidence_bucket):
+        return token_hash(tokens, "recommendation", self.prompt_version, int(prediction_result), int(confidence_bucket))
@@ -0,0 +1,109 @@
+import threading
+
+import numpy as np
+
+# Batas jumlah token yang hasil lookup-nya diingat per encoder; memo dikosongkan jika penuh
+# sehingga token OOV yang terus bertambah tidak membuat memori tumbuh tanpa batas
+MEMO_SIZE = 50000
+
+class SequenceEncoder:
+    """
+    Mengubah daftar token langsung menjadi matriks id (batch, max_len) dengan
+    padding dan pemotongan di depan, setara dengan
+    texts_to_sequences(" ".join(remove_stop_words(tokens))) + pad_sequences(padding='pre')
+
+    Stopword dan kata di luar kosakata dibuang dalam lintasan yang sama. Buffer
+    hasil dipakai ulang per thread, jadi matriks yang dikembalikan hanya valid
+    sampai pemanggilan encode() berikutnya dari thread yang sama.
+
+    Kata dicari di tabel kosakata (bisect di mmap) sekali per token unik; hasilnya
+    diingat di memo berukuran terbatas, bukan dict seluruh kosakata.
+    """
+
+    def __init__(self, vocabulary, stop_words=(), max_len=300, capacity=32, memo_size=MEMO_SIZE):
+        self.max_len = max_len
+        self.capacity = capacity
+        self.memo_size = memo_size
+        self.vocabulary = vocabulary
+        self.oov_id = vocabulary.oov_id
+        self.stop_words = frozenset(stop_words)
+        # token -> id; 0 berarti token dibuang (stopword, atau di luar kosakata tanpa OOV)
+        self._memo = {}
+        self._local = threading.local()
+
+    def _resolve(self, token):
+        # Stopword tidak pernah sampai ke tokenizer, jadi tidak dicari di kosakata
+        i = 0 if token in self.stop_words else self.vocabulary.get(token, self.oov_id or 0)
+        memo = self._memo
+        if len(memo) >= self.memo_size:
+            memo.clear()
+        memo[token] = i
+        return i
+
+    def _lookup(self, tokens):
+        """
+        Id (atau 0 untuk token yang dibuang) setiap token, dengan urutan yang sama
+        """
+        ids = list(map(self._memo.get, tokens))
+        if None in ids:
+            for k, i in enumerate(ids):
+                if i is None:
+                    ids[k] = self._resolve(tokens[k])
+        return ids
+
+    def _buffers(self, n):
+        matrix = getattr(self._local, "matrix", None)
+        if matrix is None or len(matrix) < n:
+            size = max(n, self.capacity)
+            matrix = self._local.matrix = np.zeros((size, self.max_len), dtype=np.int32)
+            self._local.lengths = np.zeros(size, dtype=np.int32)
+        return matrix, self._local.lengths
+
+    def token_ids(self, tokens):
+        """
+        Mengubah satu daftar token menjadi daftar id tanpa stopword dan OOV
+        """
+        return [i for i in self._lookup(tokens) if i]
+
+    def token_pairs(self, tokens):
+        """
+        Seperti token_ids() tetapi mempertahankan tokennya: daftar (token, id)
+        """
+        return [(t, i) for t, i in zip(tokens, self._lookup(tokens)) if i]
+
+    def iter_ids(self, tokens):
+        """
+        Versi generator dari token_ids() untuk aliran token yang panjangnya tidak dibatasi
+        """
+        get = self._memo.get
+        for token in tokens:
+            i = get(token)
+            if i is None:
+                i = self._resolve(token)
+            if i:
+                yield i
+
+    def encode(self, token_lists, out=None):
+        """
+        Mengisi buffer int32 (batch, max_len) dan mengembalikan (matriks, panjang sekuens)
+        """
+        n = len(token_lists)
+        if out is None:
+            matrix, lengths = self._buffers(n)
+            matrix, lengths = matrix[:n], lengths[:n]
+        else:
+            matrix, lengths = out, np.zeros(n, dtype=np.int32)
+
+        max_len = self.max_len
+        for row, tokens in enumerate(token_lists):
+            ids = self.token_ids(tokens)
+            size = len(ids)
+            if size > max_len:
+                ids = ids[-max_len:]
+                size = max_len
+            target = matrix[row]
+            target[:max_len - size] = 0
+            if size:
+                target[max_len - size:] = ids
+            lengths[row] = size
+        return matrix, lengths
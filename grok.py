@@ -0,0 +1,453 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from health import CircuitBreaker, HealthMonitor
+from rate_limit import RateLimiter, RetryPolicy, parse_retry_after
+
+# Konfigurasi Grok AI
+# Tanpa GROK_API_KEY, Grok AI dianggap tidak tersedia dan rekomendasi cadangan yang dipakai
+GROK_API_KEY = os.environ.get("GROK_API_KEY") or None
+GROK_API_URL = os.environ.get("GROK_API_URL", "https://api.x.ai/v1/chat/completions")
+
+# Naikkan setiap kali isi prompt di build_request_data() berubah agar cache rekomendasi lama tidak dipakai
+PROMPT_VERSION = 1
+
+# Batas waktu koneksi dan baca (detik); pada mode streaming batas baca berlaku per potongan
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 45
+MAX_RETRIES = 3
+
+# Batas waktu keseluruhan satu permintaan rekomendasi, termasuk antre dan retry (detik)
+REQUEST_DEADLINE = 60.0
+
+# Anggaran bersama untuk seluruh proses: jumlah permintaan dan token LLM per menit
+REQUESTS_PER_MINUTE = 60
+TOKENS_PER_MINUTE = 120000
+
+# Circuit breaker dan pemeriksaan kesehatan latar belakang
+FAILURE_THRESHOLD = 3
+RECOVERY_TIMEOUT = 30.0
+HEALTH_CHECK_INTERVAL = 30.0
+HEALTH_CHECK_TIMEOUT = 5.0
+
+class GrokError(Exception):
+    """
+    Kesalahan saat menghubungi Grok AI
+    """
+
+class CircuitOpenError(GrokError):
+    """
+    Panggilan ditolak karena circuit breaker sedang terbuka
+    """
+
+CIRCUIT_OPEN_MESSAGE = "Grok AI sedang tidak tersedia, menggunakan rekomendasi cadangan."
+MISSING_KEY_MESSAGE = "GROK_API_KEY belum diatur, menggunakan rekomendasi cadangan."
+
+# Satu circuit breaker, rate limiter dan kebijakan retry per proses untuk semua panggilan Grok AI
+breaker = CircuitBreaker(failure_threshold=FAILURE_THRESHOLD, recovery_timeout=RECOVERY_TIMEOUT)
+limiter = RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+retry_policy = RetryPolicy(max_retries=MAX_RETRIES)
+
+class ClientStats:
+    """
+    Latensi dan penghitung hasil panggilan klien Grok AI
+    """
+
+    def __init__(self, maxlen=1000):
+        self.latencies = deque(maxlen=maxlen)
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, latency, outcome):
+        with self._lock:
+            self.latencies.append(latency)
+            self.counters[outcome] = self.counters.get(outcome, 0) + 1
+
+    def summary(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+            counters = dict(self.counters)
+        percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else None
+        return {"latency_p50": percentile(0.5), "latency_p95": percentile(0.95), **counters}
+
+client_stats = ClientStats()
+
+def get_client_stats():
+    """
+    Ringkasan latensi, antrean rate limiter dan status circuit breaker untuk dipantau
+    """
+    return {"client": client_stats.summary(), "rate_limiter": limiter.stats(), "breaker": breaker.stats()}
+
+def estimate_tokens(data):
+    """
+    Perkiraan kasar jumlah token: sekitar 4 karakter per token ditambah max_tokens jawaban
+    """
+    chars = sum(len(message["content"]) for message in data["messages"])
+    return chars // 4 + data.get("max_tokens", 0)
+
+# Satu session keep-alive per proses, dipakai bersama oleh semua sesi Streamlit
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Content-Type": "application/json"})
+                _session = session
+    return _session
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+def get_health_monitor():
+    """
+    Mengembalikan HealthMonitor milik proses ini dan menjalankannya pada pemanggilan pertama
+    """
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                parts = urlsplit(GROK_API_URL)
+                _monitor = HealthMonitor(
+                    f"{parts.scheme}://{parts.netloc}",
+                    interval=HEALTH_CHECK_INTERVAL,
+                    timeout=HEALTH_CHECK_TIMEOUT,
+                    session=get_session(),
+                ).start()
+    return _monitor
+
+def grok_available():
+    """
+    False jika GROK_API_KEY kosong atau circuit breaker terbuka sehingga rekomendasi cadangan langsung dipakai
+    """
+    return GROK_API_KEY is not None and breaker.state != CircuitBreaker.OPEN
+
+def build_request_data(news_text, prediction_result, confidence, stream=False):
+    """
+    Menyusun payload chat-completions untuk Grok AI berdasarkan hasil prediksi
+    """
+    # Tentukan status berita
+    status = "HOAX" if prediction_result == 1 else "VALID"
+    confidence_level = "tinggi" if confidence > 80 else "sedang" if confidence > 60 else "rendah"
+
+    # Buat prompt yang lebih detailed untuk Grok AI
+    prompt = f"""
+    Sebagai AI assistant yang ahli dalam analisis berita dan media literacy, berikan rekomendasi dan saran yang berguna untuk pengguna.
+
+    KONTEKS ANALISIS:
+    - Status berita: {status}
+    - Tingkat kepercayaan: {confidence:.2f}% ({confidence_level})
+    - Panjang teks: {len(news_text)} karakter
+    - Teks berita: "{news_text[:500]}..."
+
+    Berikan rekomendasi dalam format yang rapi dan mudah dipahami:
+
+    ## 📊 Analisis Hasil
+    Jelaskan secara singkat mengapa berita ini dikategorikan sebagai {status} berdasarkan karakteristik teks yang dianalisis.
+
+    ## 🔍 Langkah Verifikasi
+    Berikan 4-5 langkah konkret dan praktis untuk memverifikasi kebenaran berita ini, termasuk:
+    - Sumber yang dapat dicek
+    - Metode verifikasi yang efektif
+    - Red flags yang perlu diperhatikan
+
+    ## 💡 Tips Media Literacy
+    Berikan 3-4 tips praktis untuk mengidentifikasi berita hoax di masa depan, fokus pada:
+    - Ciri-ciri berita hoax yang umum
+    - Cara menilai kredibilitas sumber
+    - Pentingnya cross-checking
+
+    ## 🎯 Rekomendasi Tindakan
+    Berikan saran spesifik tentang apa yang sebaiknya dilakukan pengguna selanjutnya berdasarkan hasil analisis ini.
+
+    ## ⚠️ Peringatan Penting
+    Tambahkan peringatan tentang risiko menyebarkan berita yang belum terverifikasi.
+
+    Gunakan bahasa Indonesia yang mudah dipahami, profesional, dan memberikan nilai tambah yang jelas untuk pengguna.
+    """
+
+    data = {
+        "messages": [
+            {
+                "role": "system",
+                "content": "Anda adalah AI assistant yang ahli dalam analisis berita dan media literacy. Berikan rekomendasi yang praktis, akurat, dan mudah dipahami dalam bahasa Indonesia."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "model": "grok-beta",
+        "stream": stream,
+        "temperature": 0.7,
+        "max_tokens": 1500
+    }
+    return data
+
+class StreamStats:
+    """
+    Mencatat waktu hingga token pertama (TTFT) dan durasi total respons streaming
+    """
+
+    def __init__(self, maxlen=1000):
+        self.maxlen = maxlen
+        self.ttft = []
+        self.total = []
+        self._lock = threading.Lock()
+
+    def record(self, ttft, total):
+        with self._lock:
+            if ttft is not None:
+                self.ttft.append(ttft)
+                del self.ttft[:-self.maxlen]
+            self.total.append(total)
+            del self.total[:-self.maxlen]
+
+    def summary(self):
+        with self._lock:
+            ttft = sorted(self.ttft)
+            total = sorted(self.total)
+        return {
+            "count": len(total),
+            "ttft_p50": ttft[len(ttft) // 2] if ttft else None,
+            "ttft_max": ttft[-1] if ttft else None,
+            "total_p50": total[len(total) // 2] if total else None,
+        }
+
+stream_stats = StreamStats()
+
+def iter_sse_content(lines):
+    """
+    Mengurai baris server-sent events chat-completions dan menghasilkan potongan teks
+    """
+    for line in lines:
+        if not line or not line.startswith("data:"):
+            continue
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            return
+        try:
+            chunk = json.loads(payload)
+        except ValueError:
+            continue
+        for choice in chunk.get("choices", []):
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+# Fungsi untuk mendapatkan rekomendasi dari Grok AI
+def get_grok_recommendations(news_text, prediction_result, confidence):
+    """
+    Mendapatkan rekomendasi dari Grok AI berdasarkan hasil prediksi
+    """
+    if GROK_API_KEY is None:
+        return f"Error: {MISSING_KEY_MESSAGE}"
+    if not breaker.allow_request():
+        return f"Error: {CIRCUIT_OPEN_MESSAGE}"
+    try:
+        response = _post_with_retry(build_request_data(news_text, prediction_result, confidence))
+        try:
+            result = response.json()
+            return result['choices'][0]['message']['content']
+        finally:
+            response.close()
+    except GrokError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        return f"Error: Terjadi kesalahan tidak terduga - {str(e)}"
+
+def _post_with_retry(data, stream=False, deadline=None):
+    """
+    Mengirim permintaan dengan retry dan mencatat hasilnya ke circuit breaker;
+    retry hanya dilakukan sebelum ada data yang diterima
+    """
+    session = get_session()
+    start = time.monotonic()
+    end = start + (deadline or REQUEST_DEADLINE)
+    cost = estimate_tokens(data)
+    outcome = "failure"
+    try:
+        for attempt in range(MAX_RETRIES):
+            if attempt:
+                client_stats.incr("retries")
+                if breaker.state == CircuitBreaker.OPEN:
+                    # Permintaan lain sudah membuka sirkuit selama retry ditunggu
+                    outcome = "circuit_open"
+                    raise CircuitOpenError(CIRCUIT_OPEN_MESSAGE)
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            if not limiter.acquire(cost, timeout=remaining):
+                breaker.release()
+                outcome = "throttled"
+                raise GrokError("Batas laju permintaan ke Grok AI tercapai. Silakan coba lagi nanti.")
+
+            remaining = end - time.monotonic()
+            try:
+                response = session.post(
+                    GROK_API_URL, json=data, stream=stream,
+                    headers={"Authorization": f"Bearer {GROK_API_KEY}"},
+                    timeout=(min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining)),
+                )
+            except requests.exceptions.Timeout:
+                error = GrokError("Timeout - Grok AI tidak merespons dalam waktu yang ditentukan. Silakan coba lagi.")
+                delay = retry_policy.delay(attempt)
+            except requests.exceptions.RequestException as e:
+                error = GrokError(f"Masalah koneksi ke Grok AI - {str(e)}")
+                delay = retry_policy.delay(attempt)
+            else:
+                if response.status_code == 200:
+                    breaker.record_success()
+                    outcome = "success"
+                    return response
+                # Dengan stream=True body hilang setelah close(), jadi pesan error dibaca lebih dulu
+                message = response.text if response.status_code != 429 else None
+                response.close()
+                if response.status_code != 429:
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    outcome = f"http_{response.status_code}"
+                    raise GrokError(f"Grok AI merespons dengan kode {response.status_code}. Pesan: {message}")
+                # Rate limit dari server: jeda dihitung sekali dan dipakai untuk menahan semua
+                # permintaan di proses ini sekaligus untuk retry permintaan ini
+                client_stats.incr("rate_limited")
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                error = GrokError("Grok AI membatasi jumlah permintaan (429). Silakan coba lagi nanti.")
+                delay = max(retry_after or 0.0, retry_policy.delay(attempt))
+                limiter.pause(delay)
+
+            if attempt == MAX_RETRIES - 1:
+                breaker.record_failure()
+                raise error
+            if time.monotonic() + delay >= end:
+                breaker.record_failure()
+                outcome = "deadline"
+                raise error
+            time.sleep(delay)
+
+        breaker.record_failure()
+        outcome = "deadline"
+        raise GrokError("Tidak dapat terhubung ke Grok AI setelah beberapa percobaan.")
+    finally:
+        client_stats.record(time.monotonic() - start, outcome)
+
+def _until_deadline(lines, end):
+    """
+    Meneruskan baris stream selama batas waktu permintaan belum lewat; READ_TIMEOUT hanya
+    membatasi jeda antar potongan sehingga potongan yang datang pelan dapat melewati REQUEST_DEADLINE
+    """
+    for line in lines:
+        if time.monotonic() > end:
+            breaker.record_failure()
+            client_stats.incr("stream_deadline")
+            raise GrokError("Timeout - Grok AI tidak menyelesaikan rekomendasi dalam waktu yang ditentukan. Silakan coba lagi.")
+        yield line
+
+def stream_grok_recommendations(news_text, prediction_result, confidence, stats=stream_stats):
+    """
+    Menghasilkan potongan rekomendasi Grok AI segera setelah diterima (mode streaming);
+    stream dihentikan dengan GrokError jika melewati REQUEST_DEADLINE
+    """
+    if GROK_API_KEY is None:
+        raise GrokError(MISSING_KEY_MESSAGE)
+    if not breaker.allow_request():
+        raise CircuitOpenError(CIRCUIT_OPEN_MESSAGE)
+    data = build_request_data(news_text, prediction_result, confidence, stream=True)
+    start = time.perf_counter()
+    end = time.monotonic() + REQUEST_DEADLINE
+    ttft = None
+    response = _post_with_retry(data, stream=True)
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    try:
+        for content in iter_sse_content(_until_deadline(response.iter_lines(decode_unicode=True), end)):
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            yield content
+    except requests.exceptions.RequestException as e:
+        breaker.record_failure()
+        raise GrokError(f"Koneksi ke Grok AI terputus - {str(e)}")
+    finally:
+        response.close()
+        if stats is not None:
+            stats.record(ttft, time.perf_counter() - start)
+
+def get_fallback_recommendations(prediction_result, confidence):
+    """
+    Memberikan rekomendasi fallback jika Grok AI tidak tersedia
+    """
+    status = "HOAX" if prediction_result == 1 else "VALID"
+    
+    if prediction_result == 1:  # HOAX
+        return f"""
+## 🚨 Analisis Hasil
+Berita ini dikategorikan sebagai **HOAX** dengan tingkat kepercayaan {confidence:.2f}%. Sistem mendeteksi pola-pola yang umumnya ditemukan pada berita hoax.
+
+## 🔍 Langkah Verifikasi
+1. **Cek Sumber Asli**: Verifikasi apakah berita ini berasal dari media terpercaya
+2. **Fact-Check**: Periksa di situs fact-checking seperti Cek Fakta, Hoax Buster, atau Turnbackhoax
+3. **Cross-Reference**: Bandingkan dengan berita serupa dari sumber lain
+4. **Analisis Konten**: Perhatikan gaya bahasa yang sensasional atau bias
+5. **Verifikasi Foto/Video**: Gunakan reverse image search untuk cek keaslian media
+
+## 💡 Tips Media Literacy
+1. **Waspada Judul Sensasional**: Berita hoax sering menggunakan judul yang provokatif
+2. **Periksa Tanggal dan Konteks**: Pastikan berita masih relevan dan tidak out of context
+3. **Analisis Sumber**: Periksa kredibilitas dan track record penulis/media
+4. **Hindari Bias Konfirmasi**: Jangan langsung percaya berita yang sesuai dengan pandangan Anda
+
+## 🎯 Rekomendasi Tindakan
+- **JANGAN** langsung membagikan berita ini
+- Lakukan verifikasi lebih lanjut sebelum mempercayai
+- Edukasi orang lain tentang pentingnya fact-checking
+- Laporkan jika terbukti hoax ke platform media sosial
+
+## ⚠️ Peringatan Penting
+Menyebarkan berita hoax dapat merugikan banyak pihak dan dapat melanggar hukum. Selalu verifikasi sebelum berbagi!
+        """
+    else:  # VALID
+        return f"""
+## ✅ Analisis Hasil
+Berita ini dikategorikan sebagai **VALID** dengan tingkat kepercayaan {confidence:.2f}%. Sistem mendeteksi pola-pola yang umumnya ditemukan pada berita yang kredibel.
+
+## 🔍 Langkah Verifikasi
+1. **Konfirmasi Sumber**: Pastikan berita berasal dari media yang terpercaya
+2. **Cek Update**: Periksa apakah ada perkembangan terbaru terkait berita ini
+3. **Bandingkan Sumber**: Lihat bagaimana media lain memberitakan topik yang sama
+4. **Verifikasi Detail**: Periksa fakta-fakta spesifik yang disebutkan
+5. **Konteks Lengkap**: Pastikan Anda memahami konteks penuh dari berita
+
+## 💡 Tips Media Literacy
+1. **Tetap Kritis**: Meski dikategorikan valid, tetap bersikap kritis
+2. **Sumber Primer**: Cari sumber primer jika memungkinkan
+3. **Bias Media**: Perhatikan kemungkinan bias dari media yang memberitakan
+4. **Update Berkala**: Pantau perkembangan berita untuk informasi terbaru
+
+## 🎯 Rekomendasi Tindakan
+- Anda dapat mempercayai berita ini dengan tingkat kepercayaan yang tinggi
+- Tetap lakukan cross-check untuk informasi yang sangat penting
+- Bagikan dengan bertanggung jawab dan sertakan sumber
+- Gunakan informasi ini untuk membuat keputusan yang informed
+
+## ⚠️ Catatan Penting
+Meski dikategorikan valid, selalu praktikkan media literacy dan jangan berhenti berpikir kritis terhadap informasi yang Anda terima.
+        """
@@ -0,0 +1,203 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = """## 📊 Analisis Hasil
+Ini adalah jawaban dari server tiruan Grok AI untuk keperluan pengujian lokal.
+
+## 🔍 Langkah Verifikasi
+1. Cek sumber asli berita.
+2. Bandingkan dengan media terpercaya.
+
+## ⚠️ Peringatan Penting
+Jangan menyebarkan berita yang belum terverifikasi."""
+
+class StubConfig:
+    """
+    Perilaku server tiruan; atributnya boleh diubah saat server berjalan
+    """
+
+    def __init__(self, reply=DEFAULT_REPLY, latency=0.0, chunk_delay=0.0, chunk_size=16,
+                 rate_limit_ratio=0.0, retry_after=1, seed=0, latency_jitter=0.0,
+                 timeout_ratio=0.0, hang=60.0):
+        self.reply = reply
+        self.latency = latency
+        # Tambahan jeda acak 0..latency_jitter detik per permintaan
+        self.latency_jitter = latency_jitter
+        # Proporsi permintaan yang tidak dijawab selama hang detik (memicu timeout klien)
+        self.timeout_ratio = timeout_ratio
+        self.hang = hang
+        self.chunk_delay = chunk_delay
+        self.chunk_size = chunk_size
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self.timed_out = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+            return self.requests
+
+    def should_rate_limit(self):
+        with self._lock:
+            if self._rng.random() < self.rate_limit_ratio:
+                self.rate_limited += 1
+                return True
+            return False
+
+    def should_time_out(self):
+        with self._lock:
+            if self._rng.random() < self.timeout_ratio:
+                self.timed_out += 1
+                return True
+            return False
+
+    def delay(self):
+        with self._lock:
+            return self.latency + self._rng.random() * self.latency_jitter
+
+class GrokStubHandler(BaseHTTPRequestHandler):
+    """
+    Meniru endpoint /v1/chat/completions milik Grok AI (mode biasa dan streaming SSE)
+    """
+
+    protocol_version = "HTTP/1.1"
+    config = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send_json(200, {"status": "ok"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "invalid json"})
+            return
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        self.config.count()
+        if self.config.should_rate_limit():
+            body = json.dumps({"error": "rate limit exceeded"}).encode("utf-8")
+            self.send_response(429)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if self.config.retry_after is not None:
+                self.send_header("Retry-After", str(self.config.retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.config.should_time_out():
+            # Koneksi dibiarkan menggantung lalu ditutup tanpa respons
+            time.sleep(self.config.hang)
+            self.close_connection = True
+            return
+        delay = self.config.delay()
+        if delay:
+            time.sleep(delay)
+
+        reply = self.config.reply
+        if not payload.get("stream"):
+            self._send_json(200, {
+                "id": "stub",
+                "object": "chat.completion",
+                "model": payload.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        size = self.config.chunk_size
+        for i in range(0, len(reply), size):
+            chunk = {
+                "id": "stub",
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": reply[i:i + size]}, "finish_reason": None}],
+            }
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+            if self.config.chunk_delay:
+                time.sleep(self.config.chunk_delay)
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Klien yang menutup koneksi keep-alive bukan kesalahan
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+def start_stub(host="127.0.0.1", port=0, **config):
+    """
+    Menjalankan server tiruan di thread latar belakang; mengembalikan (server, url chat-completions)
+    """
+    handler = type("BoundGrokStubHandler", (GrokStubHandler,), {"config": StubConfig(**config)})
+    server = StubServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="grok-stub", daemon=True).start()
+    url = f"http://{server.server_address[0]}:{server.server_address[1]}/v1/chat/completions"
+    return server, url
+
+def main():
+    parser = argparse.ArgumentParser(description="Server tiruan Grok AI chat-completions untuk pengujian lokal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="jeda sebelum respons (detik)")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="jeda antar potongan SSE (detik)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="proporsi permintaan yang dijawab 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="nilai header Retry-After pada respons 429")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="tambahan jeda acak maksimum (detik)")
+    parser.add_argument("--timeout-ratio", type=float, default=0.0, help="proporsi permintaan yang tidak dijawab")
+    parser.add_argument("--hang", type=float, default=60.0, help="lama permintaan yang tidak dijawab ditahan (detik)")
+    args = parser.parse_args()
+
+    server, url = start_stub(
+        args.host, args.port,
+        latency=args.latency,
+        chunk_delay=args.chunk_delay,
+        rate_limit_ratio=args.rate_limit_ratio,
+        retry_after=args.retry_after,
+        latency_jitter=args.latency_jitter,
+        timeout_ratio=args.timeout_ratio,
+        hang=args.hang,
+    )
+    print(f"Grok stub berjalan di {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
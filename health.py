@@ -0,0 +1,132 @@
+import threading
+import time
+
+import requests
+
+class CircuitBreaker:
+    """
+    Circuit breaker sederhana: setelah beberapa kegagalan berturut-turut sirkuit
+    terbuka dan panggilan langsung ditolak sampai recovery_timeout lewat, lalu
+    satu panggilan percobaan (half-open) menentukan apakah sirkuit ditutup lagi
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, recovery_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.clock() - self.opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self):
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._trial_running = False
+
+    def release(self):
+        """
+        Melepas slot percobaan half-open tanpa mencatat hasil (misalnya ditolak rate limiter lokal)
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def stats(self):
+        with self._lock:
+            return {"state": self._state(), "failures": self.failures, "rejected": self.rejected}
+
+class HealthMonitor:
+    """
+    Memeriksa ketersediaan layanan secara berkala di thread latar belakang dan
+    menyimpan status terakhir agar UI cukup membaca nilai yang sudah ada
+    """
+
+    def __init__(self, url, interval=30.0, timeout=5.0, session=None):
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.session = session
+        self.online = None
+        self.latency = None
+        self.error = None
+        self.last_checked = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def check(self):
+        """
+        Menjalankan satu pemeriksaan; respons HTTP apa pun berarti layanan dapat dijangkau
+        """
+        start = time.perf_counter()
+        try:
+            (self.session or requests).get(self.url, timeout=self.timeout)
+            online, error = True, None
+        except requests.exceptions.RequestException as e:
+            online, error = False, str(e)
+        with self._lock:
+            self.online = online
+            self.error = error
+            self.latency = time.perf_counter() - start
+            self.last_checked = time.time()
+        return online
+
+    def status(self):
+        with self._lock:
+            return {
+                "online": self.online,
+                "latency": self.latency,
+                "error": self.error,
+                "last_checked": self.last_checked,
+            }
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
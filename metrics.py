@@ -0,0 +1,294 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Instrumentasi dapat dimatikan lewat env VALIDIN_METRICS=0 (timer menjadi no-op)
+METRICS_ENABLED = os.environ.get("VALIDIN_METRICS", "1") != "0"
+
+# Batas atas bucket histogram latensi (detik), dari operasi teks kecil sampai panggilan Grok AI
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Keterangan metrik untuk baris # HELP
+METRIC_HELP = {
+    "validin_stage_duration_seconds": "Durasi tiap tahap deteksi",
+    "validin_stage_errors_total": "Jumlah tahap yang berakhir dengan exception",
+    "validin_predictions_total": "Jumlah teks yang diprediksi menurut sumber hasil",
+    "validin_recommendations_total": "Jumlah rekomendasi yang ditampilkan menurut sumber",
+    "validin_fallback_total": "Jumlah rekomendasi cadangan menurut alasan",
+    "validin_fallback_ratio": "Proporsi rekomendasi yang memakai rekomendasi cadangan",
+    "validin_cache_hits_total": "Jumlah hit cache menurut tingkat (memori atau disk)",
+    "validin_cache_misses_total": "Jumlah miss cache",
+    "validin_cache_evictions_total": "Jumlah entri yang dikeluarkan dari cache memori",
+    "validin_cache_entries": "Jumlah entri di cache memori",
+    "validin_model_swaps_total": "Jumlah penukaran versi model dari registry",
+    "validin_shadow_total": "Jumlah teks yang diskor model kandidat shadow menurut kesesuaian kelas",
+    "validin_shadow_dropped_total": "Jumlah batch shadow yang dilewati karena antrean penuh",
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class Histogram:
+    """
+    Histogram kumulatif ala Prometheus dengan bucket tetap
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total, result = 0, []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Registry:
+    """
+    Menyimpan histogram latensi per tahap dan penghitung, lalu menuliskannya dalam format
+    teks Prometheus. Biaya per tahap hanya dua pembacaan jam dan satu lock.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED, buckets=LATENCY_BUCKETS, clock=time.perf_counter):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.clock = clock
+        self._histograms = {}
+        self._counters = {}
+        self._collectors = []
+        # Sampel durasi mentah per tahap (hanya saat record_samples() aktif, untuk uji beban)
+        self._samples = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, on_start=None):
+        """
+        Mengukur satu tahap; on_start(name) dipanggil sebelum tahap berjalan (mis. progress bar).
+        Exception dihitung di validin_stage_errors_total lalu diteruskan.
+        """
+        if on_start is not None:
+            on_start(name)
+        if not self.enabled:
+            yield
+            return
+        start = self.clock()
+        try:
+            yield
+        except BaseException:
+            self.incr("validin_stage_errors_total", stage=name)
+            raise
+        finally:
+            self.observe(name, self.clock() - start)
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if self._samples is not None:
+                self._samples.setdefault(stage, deque(maxlen=self._samples_maxlen)).append(seconds)
+
+    def record_samples(self, maxlen=100000):
+        """
+        Menyimpan durasi mentah tiap tahap agar persentil dapat dihitung tepat (bukan dari bucket)
+        """
+        with self._lock:
+            self._samples = {}
+            self._samples_maxlen = maxlen
+
+    def samples(self, stage):
+        with self._lock:
+            if self._samples is None:
+                return []
+            return list(self._samples.get(stage, ()))
+
+    def reset(self):
+        """
+        Mengosongkan histogram, penghitung dan sampel (collector tetap terdaftar)
+        """
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            if self._samples is not None:
+                self._samples.clear()
+
+    def incr(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def counter(self, name, **labels):
+        with self._lock:
+            if labels:
+                return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+            return sum(value for (metric, _), value in self._counters.items() if metric == name)
+
+    def add_collector(self, collector):
+        """
+        collector() dipanggil saat render dan menghasilkan (nama, jenis, label dict, nilai);
+        dipakai untuk statistik yang sudah dihitung di tempat lain (cache, circuit breaker)
+        """
+        self._collectors.append(collector)
+
+    def fallback_ratio(self):
+        fallback = self.counter("validin_recommendations_total", source="fallback")
+        total = self.counter("validin_recommendations_total")
+        return fallback / total if total else 0.0
+
+    def mean(self, stage):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            return histogram.sum / histogram.count if histogram is not None and histogram.count else None
+
+    def progress_fractions(self, stages):
+        """
+        Posisi awal tiap tahap pada progress bar (0..1) sebanding dengan rata-rata durasinya
+        yang sudah terukur; tahap tanpa data dianggap sama panjang dengan rata-rata lainnya
+        """
+        means = [self.mean(stage) for stage in stages]
+        known = [value for value in means if value]
+        default = sum(known) / len(known) if known else 1.0
+        weights = [value or default for value in means]
+        total = sum(weights)
+        fractions, elapsed = {}, 0.0
+        for stage, weight in zip(stages, weights):
+            fractions[stage] = elapsed / total
+            elapsed += weight
+        return fractions
+
+    def snapshot(self):
+        with self._lock:
+            histograms = {stage: (h.cumulative(), h.sum, h.count) for stage, h in self._histograms.items()}
+            counters = dict(self._counters)
+        return histograms, counters
+
+    def render(self):
+        histograms, counters = self.snapshot()
+        lines = []
+
+        def header(name, kind):
+            if name in METRIC_HELP:
+                lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        name = "validin_stage_duration_seconds"
+        if histograms:
+            header(name, "histogram")
+        for stage in sorted(histograms):
+            buckets, total, count = histograms[stage]
+            for bound, cumulative in buckets:
+                lines.append(f"{name}_bucket{_format_labels((('stage', stage), ('le', _format_value(bound))))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels((('stage', stage),))} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels((('stage', stage),))} {count}")
+
+        by_name = {}
+        for (metric, labels), value in counters.items():
+            by_name.setdefault(metric, []).append((labels, value))
+        for metric in sorted(by_name):
+            header(metric, "counter")
+            for labels, value in sorted(by_name[metric]):
+                lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+
+        header("validin_fallback_ratio", "gauge")
+        lines.append(f"validin_fallback_ratio {_format_value(self.fallback_ratio())}")
+
+        # Sampel dengan nama metrik yang sama harus berurutan dalam satu kelompok
+        collected = {}
+        for collector in list(self._collectors):
+            for metric, kind, labels, value in collector():
+                collected.setdefault((metric, kind), []).append(f"{metric}{_format_labels(sorted(labels.items()))} {_format_value(value)}")
+        for (metric, kind), samples in collected.items():
+            header(metric, kind)
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+def cache_collector(name, cache):
+    """
+    Collector untuk statistik TieredCache (prediksi atau rekomendasi)
+    """
+    def collect():
+        if cache is None:
+            return
+        stats = cache.stats()
+        yield "validin_cache_hits_total", "counter", {"cache": name, "tier": "memory"}, stats["hits"]
+        yield "validin_cache_hits_total", "counter", {"cache": name, "tier": "disk"}, stats["disk_hits"]
+        yield "validin_cache_misses_total", "counter", {"cache": name}, stats["misses"]
+        yield "validin_cache_evictions_total", "counter", {"cache": name}, stats["evictions"]
+        yield "validin_cache_entries", "gauge", {"cache": name}, stats["size"]
+    return collect
+
+def near_duplicate_collector(index):
+    """
+    Collector untuk statistik NearDuplicateIndex
+    """
+    def collect():
+        if index is None:
+            return
+        stats = index.stats()
+        yield "validin_cache_hits_total", "counter", {"cache": "near_duplicate", "tier": "memory"}, stats["hits"]
+        yield "validin_cache_misses_total", "counter", {"cache": "near_duplicate"}, stats["misses"]
+        yield "validin_cache_entries", "gauge", {"cache": "near_duplicate"}, stats["entries"]
+    return collect
+
+# Registry bersama untuk seluruh proses
+metrics = Registry()
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = metrics
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(host="127.0.0.1", port=9464, registry=metrics):
+    """
+    Menjalankan endpoint /metrics di thread latar belakang (untuk app Streamlit yang tidak
+    dapat menambah route sendiri); mengembalikan server-nya. Default hanya loopback,
+    set host="0.0.0.0" agar dapat di-scrape dari mesin lain
+    """
+    handler = type("BoundMetricsHandler", (MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+# Parameter MinHash/LSH: 128 permutasi dibagi 16 band x 8 baris. Pasangan dengan kemiripan
+# Jaccard 0.8 hampir selalu (> 99.9%) bertemu di salah satu band; di bawah ~0.5 jarang
+NUM_PERM = 128
+BANDS = 16
+
+# Kemiripan Jaccard himpunan token minimum agar dianggap berita yang sama
+SIMILARITY_THRESHOLD = 0.8
+
+# Teks dengan token unik lebih sedikit dari ini tidak diindeks (kemiripan tidak bermakna)
+MIN_TOKENS = 8
+
+# Jumlah entri maksimum (FIFO); memori tetap sekitar 290 byte per entri
+DEFAULT_CAPACITY = 100000
+
+# Teks rekomendasi hanya disimpan untuk entri terbaru sebanyak ini
+MAX_RECOMMENDATIONS = 20000
+
+# Versi format snapshot; naikkan jika struktur array berubah
+SNAPSHOT_VERSION = 1
+
+# Opsi yang menentukan ukuran array dan fungsi hash; snapshot dengan nilai lain tidak dapat dipakai
+SNAPSHOT_STRUCTURE = ("capacity", "num_perm", "bands", "seed")
+
+# Bit minhash yang disimpan per permutasi (b-bit minwise hashing) untuk verifikasi kandidat
+_SIGNATURE_BITS = 8
+
+def reference(tokens):
+    """
+    Referensi entri: 128 bit pertama SHA-256 dari token ternormalisasi
+    """
+    return hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()[:32]
+
+class NearDuplicateMatch:
+    """
+    Hasil pencarian: referensi entri yang cocok, kemiripan dan data yang tersimpan.
+    recommendation hanya terisi jika masih disimpan dan dibuat untuk kelas prediksi yang sama.
+    """
+
+    __slots__ = ("ref", "similarity", "hoax_prob", "recommendation", "recommendation_class", "seq")
+
+    def __init__(self, ref, similarity, hoax_prob, recommendation, recommendation_class, seq):
+        self.ref = ref
+        self.similarity = similarity
+        self.hoax_prob = hoax_prob
+        self.recommendation = recommendation
+        self.recommendation_class = recommendation_class
+        self.seq = seq
+
+    def as_dict(self):
+        return {"ref": self.ref, "similarity": round(self.similarity, 4)}
+
+class NearDuplicateIndex:
+    """
+    Indeks MinHash/LSH atas himpunan token teks yang sudah diskor. Semua data disimpan di
+    array berukuran tetap (ring buffer FIFO) sehingga memori dibatasi oleh capacity; rantai
+    bucket tiap band juga berupa array sehingga entri lama tidak perlu dihapus secara eksplisit.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, threshold=SIMILARITY_THRESHOLD, num_perm=NUM_PERM,
+                 bands=BANDS, stop_words=(), max_recommendations=MAX_RECOMMENDATIONS, model_version=None, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm harus habis dibagi bands")
+        # Skor yang tersimpan hanya berlaku untuk versi model (dan kosakata) yang sama
+        self.model_version = model_version
+        self.capacity = capacity
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.stop_words = stop_words
+        self.max_recommendations = max_recommendations
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # Hash multiply-add-shift: h(x) = ((a * x + b) mod 2^64) >> 32, a ganjil
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 2 ** 63, size=num_perm // bands, dtype=np.uint64) | np.uint64(1)
+        self._table_bits = max(4, (capacity - 1).bit_length())
+        self._table_size = 1 << self._table_bits
+        self._band_rows = np.arange(bands)
+
+        self.signatures = np.zeros((capacity, num_perm), dtype=np.uint8)
+        self.seqs = np.full(capacity, -1, dtype=np.int64)
+        self.hoax_probs = np.zeros(capacity, dtype=np.float32)
+        self.refs = np.zeros((capacity, 16), dtype=np.uint8)
+        self.heads = np.full((bands, self._table_size), -1, dtype=np.int32)
+        self.chains = np.full((bands, capacity), -1, dtype=np.int32)
+        self.count = 0
+        self.recommendations = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def signature(self, tokens):
+        """
+        MinHash 32-bit dari himpunan token (tanpa stopword); None jika token terlalu sedikit
+        """
+        unique = {token for token in tokens if token not in self.stop_words}
+        if len(unique) < MIN_TOKENS:
+            return None
+        hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in unique), dtype=np.uint64, count=len(unique))
+        return ((hashes[:, None] * self._a + self._b) >> np.uint64(32)).min(axis=0).astype(np.uint32)
+
+    def _buckets(self, signature):
+        rows = signature.astype(np.uint64).reshape(self.bands, -1)
+        mixed = (rows * self._band_mix).sum(axis=1)
+        return (mixed >> np.uint64(64 - self._table_bits)).astype(np.int64)
+
+    @staticmethod
+    def _short(signature):
+        return (signature & ((1 << _SIGNATURE_BITS) - 1)).astype(np.uint8)
+
+    def _similarity(self, short, slots):
+        # Estimasi Jaccard dari b-bit minhash: peluang cocok = J + (1 - J) / 2^b
+        matches = (self.signatures[slots] == short).mean(axis=1)
+        chance = 1.0 / (1 << _SIGNATURE_BITS)
+        return np.clip((matches - chance) / (1.0 - chance), 0.0, 1.0)
+
+    def _candidates(self, buckets):
+        oldest = self.count - self.capacity
+        candidates = set()
+        for band, slot in enumerate(self.heads[self._band_rows, buckets].tolist()):
+            previous = self.count
+            # Rantai berjalan dari entri terbaru ke terlama; berhenti jika urutan naik lagi
+            # (slot sudah dipakai ulang) atau entri sudah keluar dari ring buffer
+            while slot >= 0:
+                seq = int(self.seqs[slot])
+                if seq >= previous or seq < oldest:
+                    break
+                candidates.add(slot)
+                previous = seq
+                slot = int(self.chains[band, slot])
+        return candidates
+
+    def _match(self, signature):
+        candidates = self._candidates(self._buckets(signature))
+        if not candidates:
+            return None
+        slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = self._similarity(self._short(signature), slots)
+        best = int(np.argmax(similarity))
+        if similarity[best] < self.threshold:
+            return None
+        return int(slots[best]), float(similarity[best])
+
+    def lookup(self, tokens):
+        """
+        Mencari entri paling mirip dengan kemiripan >= threshold; None jika tidak ada
+        """
+        signature = self.signature(tokens)
+        if signature is None:
+            return None
+        with self._lock:
+            found = self._match(signature)
+            if found is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            slot, similarity = found
+            recommendation_class, recommendation = self.recommendations.get(slot, (None, None))
+            return NearDuplicateMatch(
+                self.refs[slot].tobytes().hex(), similarity, float(self.hoax_probs[slot]),
+                recommendation, recommendation_class, int(self.seqs[slot]),
+            )
+
+    def add(self, tokens, hoax_prob):
+        """
+        Menambahkan teks yang sudah diskor; mengembalikan False jika teks terlalu pendek untuk diindeks
+        """
+        signature = self.signature(tokens)
+        if signature is None:
+            return False
+        buckets = self._buckets(signature)
+        with self._lock:
+            slot = self.count % self.capacity
+            self.recommendations.pop(slot, None)
+            self.signatures[slot] = self._short(signature)
+            self.seqs[slot] = self.count
+            self.hoax_probs[slot] = hoax_prob
+            self.refs[slot] = np.frombuffer(bytes.fromhex(reference(tokens)), dtype=np.uint8)
+            for band, bucket in enumerate(buckets.tolist()):
+                self.chains[band, slot] = self.heads[band, bucket]
+                self.heads[band, bucket] = slot
+            self.count += 1
+            self._dirty = True
+        return True
+
+    def _set_recommendation(self, slot, prediction_result, text):
+        self.recommendations[slot] = (int(prediction_result), text)
+        self.recommendations.move_to_end(slot)
+        self._trim_recommendations()
+
+    def _trim_recommendations(self):
+        while len(self.recommendations) > self.max_recommendations:
+            self.recommendations.popitem(last=False)
+
+    def attach_recommendation(self, tokens, prediction_result, text):
+        """
+        Menyimpan teks rekomendasi (untuk kelas prediksi tersebut) pada entri yang paling mirip
+        dengan tokens, biasanya teks itu sendiri yang baru saja diskor
+        """
+        signature = self.signature(tokens)
+        if signature is None:
+            return False
+        with self._lock:
+            found = self._match(signature)
+            if found is None:
+                return False
+            self._set_recommendation(found[0], prediction_result, text)
+            self._dirty = True
+            return True
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self),
+                "capacity": self.capacity,
+                "recommendations": len(self.recommendations),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "memory_bytes": self.memory_bytes(),
+            }
+
+    def memory_bytes(self):
+        arrays = (self.signatures, self.seqs, self.hoax_probs, self.refs, self.heads, self.chains)
+        return sum(array.nbytes for array in arrays)
+
+    def save(self, path):
+        """
+        Menulis snapshot .npz tanpa pickle (ditulis ke file sementara lalu diganti secara atomik);
+        array disalin di bawah lock lalu ditulis tanpa menahan pencarian
+        """
+        with self._lock:
+            slots = np.fromiter(self.recommendations.keys(), dtype=np.int64, count=len(self.recommendations))
+            classes = np.fromiter((value[0] for value in self.recommendations.values()), dtype=np.int8, count=len(slots))
+            texts = [value[1].encode("utf-8") for value in self.recommendations.values()]
+            offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+            np.cumsum([len(text) for text in texts], out=offsets[1:])
+            header = {
+                "version": SNAPSHOT_VERSION,
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "max_recommendations": self.max_recommendations,
+                "seed": self.seed,
+                "model_version": self.model_version,
+                "count": self.count,
+            }
+            arrays = {
+                "config": np.array(json.dumps(header)),
+                "signatures": self.signatures.copy(),
+                "seqs": self.seqs.copy(),
+                "hoax_probs": self.hoax_probs.copy(),
+                "refs": self.refs.copy(),
+                "heads": self.heads.copy(),
+                "chains": self.chains.copy(),
+                "recommendation_slots": slots,
+                "recommendation_classes": classes,
+                "recommendation_offsets": offsets,
+                "recommendation_blob": np.frombuffer(b"".join(texts), dtype=np.uint8),
+            }
+            self._dirty = False
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as handle:
+            np.savez(handle, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, stop_words=(), threshold=None):
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data["config"]))
+            if header.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"Versi snapshot {path} tidak dikenal: {header.get('version')}")
+            index = cls(
+                capacity=header["capacity"],
+                threshold=header["threshold"] if threshold is None else threshold,
+                num_perm=header["num_perm"],
+                bands=header["bands"],
+                stop_words=stop_words,
+                max_recommendations=header["max_recommendations"],
+                model_version=header["model_version"],
+                seed=header["seed"],
+            )
+            for name in ("signatures", "seqs", "hoax_probs", "refs", "heads", "chains"):
+                getattr(index, name)[...] = data[name]
+            index.count = header["count"]
+            blob = data["recommendation_blob"].tobytes()
+            offsets = data["recommendation_offsets"].tolist()
+            classes = data["recommendation_classes"].tolist()
+            for i, slot in enumerate(data["recommendation_slots"].tolist()):
+                index.recommendations[slot] = (classes[i], blob[offsets[i]:offsets[i + 1]].decode("utf-8"))
+        return index
+
+    @classmethod
+    def open(cls, path=None, stop_words=(), model_version=None, **options):
+        """
+        Memuat snapshot jika ada, dibuat dengan model yang sama dan opsi SNAPSHOT_STRUCTURE-nya
+        sama dengan options; jika tidak, membuat indeks kosong. threshold dan max_recommendations
+        dari options diterapkan juga pada snapshot yang dimuat.
+        """
+        if path and os.path.exists(path):
+            index = cls.load(path, stop_words=stop_words, threshold=options.get("threshold"))
+            if index.model_version == model_version:
+                changed = [name for name in SNAPSHOT_STRUCTURE if name in options and options[name] != getattr(index, name)]
+                if not changed:
+                    if "max_recommendations" in options:
+                        index.max_recommendations = options["max_recommendations"]
+                        index._trim_recommendations()
+                    return index
+                # Hash bucket tidak disimpan sehingga indeks tidak dapat diubah ukurannya; mulai dari kosong
+                print(f"Snapshot {path} diabaikan karena {', '.join(f'{name}={getattr(index, name)}' for name in changed)} "
+                      f"berbeda dengan konfigurasi sekarang", file=sys.stderr, flush=True)
+        return cls(stop_words=stop_words, model_version=model_version, **options)
+
+    def start_autosave(self, path, interval=300.0):
+        """
+        Menyimpan snapshot secara berkala di thread latar belakang jika ada perubahan
+        """
+        def run():
+            while True:
+                time.sleep(interval)
+                if self._dirty:
+                    self.save(path)
+
+        thread = threading.Thread(target=run, name="near-duplicate-autosave", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,559 @@
+import hashlib
+import os
+import re
+import string
+import threading
+import time
+import zipfile
+from collections import deque
+import numpy as np
+from encoder import SequenceEncoder
+from metrics import metrics
+
+# Lokasi file model
+MODEL_PATH = 'hoax_lstm_model.h5'
+
+# Parameter tokenisasi
+max_features = 5000
+max_len = 300
+
+# Ambang batas probabilitas untuk kelas HOAX
+THRESHOLD = 0.6
+
+# Kelompok panjang token untuk inferensi batch; tiap kelompok dijalankan dengan lebar
+# sekuensnya sendiri (ditambah margin padding hasil kalibrasi, lihat calibrate_buckets)
+BUCKETS = (32, 64, 128, max_len)
+
+# Selisih maksimum prediction[:, 1] terhadap padding penuh yang masih dianggap setara
+BUCKET_TOLERANCE = 1e-6
+
+# Di bawah jumlah baris ini batch tidak dipecah per kelompok: cukup satu panggilan dengan
+# lebar kelompok terbesar di batch (biaya LSTM kecil lebih ditentukan jumlah langkah waktu)
+BUCKET_SPLIT_MIN_ROWS = 128
+
+# Mode dokumen panjang: teks dipecah menjadi jendela max_len token yang saling tumpang tindih
+WINDOW_OVERLAP = 50
+WINDOW_COMBINE_RULES = ('max', 'mean', 'weighted')
+
+# Jumlah jendela maksimum per panggilan model; membatasi memori untuk artikel sepanjang apa pun
+MAX_WINDOWS_PER_BATCH = 32
+
+# Penjelasan oklusi: jumlah varian (token/rentang yang dihilangkan) maksimum per teks,
+# anggaran waktu inferensinya, dan jumlah token berpengaruh yang dikembalikan. 63 varian
+# ditambah teks utuh = 64 baris, sehingga tidak dibulatkan ke pangkat dua berikutnya
+EXPLAIN_MAX_VARIANTS = 63
+EXPLAIN_BUDGET_MS = 50.0
+EXPLAIN_TOP_K = 5
+
+# Kandidat jumlah padding minimum di depan sekuens yang diuji saat kalibrasi
+PAD_MARGINS = (0, 8, 16, 32, 48, 64, 96, 128, 192)
+
+# Data NLTK yang dibundel bersama aplikasi (dapat diganti lewat env NLTK_DATA_DIR);
+# direktori nltk_data di folder kerja tetap diperiksa untuk instalasi lama
+nltk_data_dir = os.environ.get("NLTK_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data"))
+nltk_search_dirs = [nltk_data_dir, os.path.join(os.getcwd(), "nltk_data")]
+
+# Resource NLTK yang dipakai aplikasi; punkt_tab hanya untuk tokenize() lama
+NLTK_RESOURCES = ('stopwords', 'punkt_tab')
+
+# Izinkan unduhan saat runtime jika data belum ada (env NLTK_ALLOW_DOWNLOAD=1); secara default
+# proses langsung gagal agar node tanpa internet tidak tertahan menunggu unduhan
+NLTK_ALLOW_DOWNLOAD = os.environ.get("NLTK_ALLOW_DOWNLOAD", "0") == "1"
+
+# Diisi oleh setup_nltk()
+stop_words = set()
+
+_nltk_lock = threading.Lock()
+_nltk_ready = False
+
+def _read_stopwords(language='indonesian'):
+    """
+    Membaca daftar stopword langsung dari data NLTK lokal (folder atau zip) tanpa mengimpor nltk
+    """
+    for data_dir in nltk_search_dirs:
+        path = os.path.join(data_dir, 'corpora', 'stopwords', language)
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as handle:
+                raw = handle.read()
+        else:
+            archive = os.path.join(data_dir, 'corpora', 'stopwords.zip')
+            if not os.path.isfile(archive):
+                continue
+            with zipfile.ZipFile(archive) as handle:
+                try:
+                    raw = handle.read(f'stopwords/{language}').decode('utf-8')
+                except KeyError:
+                    continue
+        # Sama dengan WordListCorpusReader.words(): satu kata per baris, baris kosong dibuang
+        return [line for line in raw.splitlines() if line.strip()]
+    return None
+
+def download_nltk_data(resources=NLTK_RESOURCES, download_dir=None):
+    """
+    Mengunduh resource NLTK ke direktori bundel (dijalankan sekali saat build, bukan saat runtime)
+    """
+    import nltk
+
+    download_dir = download_dir or nltk_data_dir
+    os.makedirs(download_dir, exist_ok=True)
+    for resource in resources:
+        if not nltk.download(resource, download_dir=download_dir, quiet=True, raise_on_error=True):
+            raise LookupError(f"Gagal mengunduh resource NLTK '{resource}'")
+
+def setup_nltk(allow_download=None):
+    """
+    Memuat daftar stopword bahasa Indonesia sekali per proses dari data NLTK lokal;
+    unduhan hanya dicoba jika data belum ada dan allow_download (atau NLTK_ALLOW_DOWNLOAD) aktif
+    """
+    global _nltk_ready
+    allow_download = NLTK_ALLOW_DOWNLOAD if allow_download is None else allow_download
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        words = _read_stopwords()
+        if words is None:
+            if not allow_download:
+                raise LookupError(
+                    f"Stopword NLTK tidak ditemukan di {nltk_data_dir}. "
+                    "Jalankan 'python startup.py --fetch-nltk' di mesin yang terhubung internet "
+                    "(atau set NLTK_ALLOW_DOWNLOAD=1 agar diunduh saat runtime)."
+                )
+            download_nltk_data(('stopwords',))
+            words = _read_stopwords()
+        stop_words.clear()
+        stop_words.update(words)
+        _nltk_ready = True
+
+# Fungsi preprocessing teks
+def clean(text):
+    text = str(text).lower()
+    text = ' '.join(re.sub("(@[A-Za-z0-9]+)|([^0-9A-Za-z \t])|(\w+:\/\/\S+)", " ", text).split())
+    punct = set(string.punctuation)
+    text = "".join([ch for ch in text if ch not in punct])
+    return text
+
+def tokenize(text):
+    # nltk diimpor saat pertama kali dipakai karena impornya lambat (~1 detik)
+    import nltk
+    from nltk.tokenize import word_tokenize
+
+    for data_dir in nltk_search_dirs:
+        if data_dir not in nltk.data.path:
+            nltk.data.path.append(data_dir)
+    return word_tokenize(text)
+
+def remove_stop_words(text):
+    word_tokens_no_stopwords = [w for w in text if w not in stop_words]
+    return word_tokens_no_stopwords
+
+# Normalizer satu langkah yang setara dengan clean() -> tokenize() -> remove_stop_words().
+# Pola ini memakai alternatif yang sama dengan regex clean(); hanya token alfanumerik
+# (grup 1) yang diambil, sehingga mention, URL dan karakter lain otomatis terbuang.
+_TOKEN_PATTERN = re.compile(r"@[A-Za-z0-9]+|[^0-9A-Za-z \t]|\w+://\S+|([0-9A-Za-z]+)")
+
+# Kontraksi yang tetap dipecah oleh word_tokenize NLTK walaupun teks sudah bersih
+_CONTRACTIONS = {
+    "cannot": ("can", "not"),
+    "gimme": ("gim", "me"),
+    "gonna": ("gon", "na"),
+    "gotta": ("got", "ta"),
+    "lemme": ("lem", "me"),
+    "wanna": ("wan", "na"),
+}
+
+def normalize(text):
+    """
+    Membersihkan dan memecah teks menjadi token dalam satu lintasan (tanpa menghapus stopword)
+    """
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(str(text).lower()):
+        if token:
+            if token in _CONTRACTIONS:
+                tokens.extend(_CONTRACTIONS[token])
+            else:
+                tokens.append(token)
+    return tokens
+
+# Spasi terakhir dalam potongan teks; tidak ada pola token yang melewati karakter spasi,
+# jadi teks aman dipotong tepat setelahnya
+_LAST_SPACE = re.compile(r"\s\S*\Z")
+
+def _chunk_tokens(chunk):
+    for token in _TOKEN_PATTERN.findall(chunk.lower()):
+        if token:
+            yield from _CONTRACTIONS.get(token, (token,))
+
+def iter_tokens(text, chunk_size=1 << 16):
+    """
+    Versi streaming dari normalize(): teks (str atau iterable potongan str, misalnya file)
+    diproses per potongan sehingga tidak pernah disalin utuh
+    """
+    if isinstance(text, str):
+        chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    else:
+        chunks = text
+    carry = ''
+    for chunk in chunks:
+        chunk = carry + str(chunk)
+        match = _LAST_SPACE.search(chunk)
+        if match is None:
+            carry = chunk
+            continue
+        carry = chunk[match.start() + 1:]
+        yield from _chunk_tokens(chunk[:match.start() + 1])
+    if carry:
+        yield from _chunk_tokens(carry)
+
+def iter_windows(ids, window=max_len, overlap=WINDOW_OVERLAP):
+    """
+    Memecah aliran id menjadi jendela berukuran window yang bertumpang tindih sebanyak overlap.
+    Menghasilkan (daftar id, jumlah id baru yang belum tercakup jendela sebelumnya). Jendela
+    terakhir selalu berisi window id terakhir, sama dengan pemotongan pad_sequences lama.
+    """
+    stride = window - overlap
+    if stride <= 0:
+        raise ValueError("overlap harus lebih kecil dari ukuran jendela")
+    buffer = deque(maxlen=window)
+    fresh = 0
+    emitted = False
+    for i in ids:
+        buffer.append(i)
+        fresh += 1
+        if len(buffer) == window and (not emitted or fresh == stride):
+            yield list(buffer), fresh
+            fresh = 0
+            emitted = True
+    if fresh:
+        yield list(buffer), fresh
+
+def preprocess(text):
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(str(text).lower()):
+        if token:
+            for word in _CONTRACTIONS.get(token, (token,)):
+                if word not in stop_words:
+                    tokens.append(word)
+    return tokens
+
+def preprocess_batch(texts):
+    return [preprocess(text) for text in texts]
+
+def normalize_batch(texts):
+    return [normalize(text) for text in texts]
+
+# Fungsi memuat model (TensorFlow baru diimpor di sini agar startup tidak menunggu impornya)
+def load_lstm_model(path=MODEL_PATH):
+    from tensorflow.keras.models import load_model
+
+    return load_model(path)
+
+def model_version(*paths):
+    """
+    Sidik jari isi file model (dan kosakata) untuk dipakai di kunci cache
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+def make_verdict(hoax_prob, threshold=THRESHOLD):
+    """
+    Mengubah probabilitas hoax menjadi kelas prediksi dan tingkat kepercayaan
+    """
+    hoax_prob = float(hoax_prob)
+    pred_class = 1 if hoax_prob > threshold else 0
+    pred_prob = hoax_prob * 100 if pred_class == 1 else (1 - hoax_prob) * 100
+    return {
+        "hoax_prob": hoax_prob,
+        "pred_class": pred_class,
+        "label": "HOAX" if pred_class == 1 else "VALID",
+        "confidence": pred_prob,
+    }
+
+class HoaxDetector:
+    """
+    Menggabungkan preprocessing, kosakata dan model LSTM untuk prediksi batch
+    """
+
+    def __init__(self, model, vocabulary, threshold=THRESHOLD, cache=None, buckets=BUCKETS,
+                 long_documents=None, window_overlap=WINDOW_OVERLAP, near_duplicates=None, metrics=metrics):
+        if long_documents is not None and long_documents not in WINDOW_COMBINE_RULES:
+            raise ValueError(f"Aturan gabungan jendela '{long_documents}' tidak dikenal (pilihan: {', '.join(WINDOW_COMBINE_RULES)})")
+        self.model = model
+        self.vocabulary = vocabulary
+        self.threshold = threshold
+        self.cache = cache
+        # Aturan penggabungan skor jendela untuk teks > max_len token (None = dipotong seperti dulu)
+        self.long_documents = long_documents
+        self.window_overlap = window_overlap
+        # NearDuplicateIndex opsional: teks yang sangat mirip dengan teks yang pernah diskor
+        # memakai skor tersimpan tanpa menjalankan model
+        self.near_duplicates = near_duplicates
+        # Registry metrik tempat tahap dan penghitung dicatat; model kandidat shadow memakai
+        # registry terpisah agar tidak bercampur dengan metrik produksi
+        self.metrics = metrics
+        # Encoder menyalin stopword saat dibuat, jadi data NLTK harus sudah dimuat (tanpa efek
+        # jika setup_nltk() sudah dipanggil; LookupError jika data tidak ada)
+        setup_nltk()
+        self.encoder = SequenceEncoder(vocabulary, stop_words, max_len=max_len)
+        self.buckets = np.array(sorted(set(buckets) | {max_len}), dtype=np.int32)
+        # None = belum dikalibrasi atau model sensitif terhadap padding: selalu pakai lebar max_len
+        self.pad_margin = None
+        self._widths = None
+        # Rata-rata waktu inferensi per baris varian penjelasan (ms), untuk anggaran explain()
+        self._explain_row_ms = None
+
+    def warmup(self):
+        """
+        Menjalankan satu prediksi kosong agar graf model sudah siap sebelum permintaan pertama,
+        lalu mengkalibrasi inferensi per kelompok panjang dan mengompilasi lebar hasilnya
+        """
+        self.predict_proba(np.zeros((1, max_len), dtype=np.int32))
+        if len(self.buckets) > 1:
+            self.calibrate_buckets()
+        if hasattr(self.model, "compile_shapes"):
+            # Lebar yang dipakai predict_proba sudah pasti setelah kalibrasi; bentuk tetapnya
+            # dikompilasi sekarang agar permintaan pertama tidak membayar biaya kompilasi
+            self.model.compile_shapes(self._widths.tolist() if self._widths is not None else [max_len])
+
+    def calibrate_buckets(self, n_probes=8, seed=0):
+        """
+        Mencari padding minimum di depan sekuens yang membuat hasil setara dengan padding
+        penuh sampai max_len. Tanpa mask_zero, token padding tetap mengubah state LSTM;
+        state itu konvergen setelah beberapa langkah sehingga cukup disisakan margin tersebut.
+        Mengembalikan margin, atau None jika tidak ada kandidat yang lolos BUCKET_TOLERANCE.
+        """
+        rng = np.random.default_rng(seed)
+        probes = []
+        for length in (1, 4, 16, 64):
+            padded = np.zeros((n_probes, max_len), dtype=np.int32)
+            padded[:, max_len - length:] = rng.integers(1, max_features, size=(n_probes, length))
+            probes.append((length, padded, self._predict(padded)))
+
+        self.pad_margin, self._widths = None, None
+        for margin in PAD_MARGINS:
+            if all(
+                np.abs(self._predict(padded[:, max_len - min(length + margin, max_len):]) - expected).max() <= BUCKET_TOLERANCE
+                for length, padded, expected in probes
+            ):
+                self.pad_margin = margin
+                self._widths = np.minimum(self.buckets + margin, max_len)
+                break
+        return self.pad_margin
+
+    def _predict(self, padded):
+        # predict_on_batch memakai graf yang sama dengan predict() tanpa overhead data adapter per panggilan
+        prediction = self.model.predict_on_batch(padded)
+        return np.asarray(prediction)[:, 1]
+
+    def predict_proba(self, padded, lengths=None):
+        """
+        Mengembalikan probabilitas hoax per baris. Jika panjang sekuens diberikan dan kalibrasi
+        berhasil, baris dikelompokkan per panjang dan tiap kelompok dijalankan dengan lebarnya
+        sendiri; hasil dikembalikan dalam urutan semula.
+        """
+        if lengths is None or self._widths is None:
+            return self._predict(padded)
+        widths = self._widths[np.searchsorted(self.buckets, lengths)]
+        if hasattr(self.model, "predict_ragged"):
+            # Backend yang mendukung lebar per baris menjalankan semua kelompok dalam satu lintasan
+            return self.model.predict_ragged(padded, widths)[:, 1]
+
+        # Padding di depan membuat kolom terakhir selalu berisi sekuens yang utuh
+        if len(padded) < BUCKET_SPLIT_MIN_ROWS:
+            return self._predict_rounded(padded[:, max_len - int(widths.max()):])
+        result = np.empty(len(padded), dtype=np.float32)
+        for width in np.unique(widths).tolist():
+            rows = np.flatnonzero(widths == width)
+            result[rows] = self._predict_rounded(padded[rows, max_len - width:])
+        return result
+
+    def _predict_rounded(self, batch):
+        # Jumlah baris dibulatkan ke pangkat dua agar bentuk input terbatas dan graf model tidak dibuat ulang
+        rows, width = batch.shape
+        size = 1 << (rows - 1).bit_length()
+        if size > rows:
+            batch = np.concatenate([batch, np.zeros((size - rows, width), dtype=batch.dtype)])
+        return self._predict(np.ascontiguousarray(batch))[:rows]
+
+    def predict_long(self, text, combine=None):
+        """
+        Memprediksi satu dokumen (str atau iterable potongan str) dengan jendela geser;
+        mengembalikan None jika tidak ada token yang dikenal
+        """
+        hoax_prob = self.score_windows(self.encoder.iter_ids(iter_tokens(text)), combine or self.long_documents or 'max')
+        return None if hoax_prob is None else make_verdict(hoax_prob, self.threshold)
+
+    def score_windows(self, ids, combine):
+        """
+        Menskor semua jendela dalam batch berukuran MAX_WINDOWS_PER_BATCH lalu menggabungkannya
+        dengan aturan max, mean, atau weighted (bobot = jumlah token baru di tiap jendela)
+        """
+        matrix = np.zeros((MAX_WINDOWS_PER_BATCH, max_len), dtype=np.int32)
+        lengths = np.zeros(MAX_WINDOWS_PER_BATCH, dtype=np.int32)
+        weights = np.zeros(MAX_WINDOWS_PER_BATCH, dtype=np.float64)
+        best, total, weight_sum, count = -1.0, 0.0, 0.0, 0
+
+        def flush(rows):
+            nonlocal best, total, weight_sum, count
+            scores = self.predict_proba(matrix[:rows], lengths[:rows]).astype(np.float64)
+            best = max(best, float(scores.max()))
+            if combine == 'weighted':
+                total += float(scores @ weights[:rows])
+                weight_sum += float(weights[:rows].sum())
+            else:
+                total += float(scores.sum())
+                weight_sum += rows
+            count += rows
+
+        rows = 0
+        for window, fresh in iter_windows(ids, max_len, self.window_overlap):
+            matrix[rows, :max_len - len(window)] = 0
+            matrix[rows, max_len - len(window):] = window
+            lengths[rows] = len(window)
+            weights[rows] = fresh
+            rows += 1
+            if rows == MAX_WINDOWS_PER_BATCH:
+                flush(rows)
+                rows = 0
+        if rows:
+            flush(rows)
+        if not count:
+            return None
+        return best if combine == 'max' else total / weight_sum
+
+    def predict_batch(self, texts, progress=None):
+        """
+        Memprediksi sekumpulan teks; teks yang tidak dapat diproses menghasilkan None.
+        progress(stage) dipanggil saat tiap tahap (preprocess, encode, inference) dimulai.
+        """
+        results = [None] * len(texts)
+        with self.metrics.stage("preprocess", progress):
+            token_lists = normalize_batch(texts)
+
+        # Teks dengan token identik dalam satu batch cukup diprediksi sekali
+        groups = {}
+        long_keys = set()
+        for i, tokens in enumerate(token_lists):
+            parts = ()
+            if self.long_documents is not None and len(tokens) > max_len:
+                parts = ('window', self.long_documents, self.window_overlap)
+            key = self.cache.key(tokens, *parts) if self.cache is not None else (tuple(tokens),) + parts
+            if parts:
+                long_keys.add(key)
+            groups.setdefault(key, []).append(i)
+
+        pending = []
+        for key, indices in groups.items():
+            hoax_prob = self.cache.get(key) if self.cache is not None else None
+            match = None
+            if hoax_prob is None and self.near_duplicates is not None:
+                match = self.near_duplicates.lookup(token_lists[indices[0]])
+                if match is not None:
+                    hoax_prob = match.hoax_prob
+            if match is not None:
+                self.metrics.incr("validin_predictions_total", len(indices), source="near_duplicate")
+            elif hoax_prob is not None:
+                self.metrics.incr("validin_predictions_total", len(indices), source="cache")
+            elif key in long_keys:
+                # Dokumen panjang diskor per jendela; hasil gabungannya disimpan seperti prediksi biasa
+                with self.metrics.stage("long_document", progress):
+                    hoax_prob = self.score_windows(self.encoder.iter_ids(token_lists[indices[0]]), self.long_documents)
+                if hoax_prob is None:
+                    self.metrics.incr("validin_predictions_total", len(indices), source="unprocessable")
+                    continue
+                self.metrics.incr("validin_predictions_total", len(indices), source="model")
+                self._remember(key, token_lists[indices[0]], hoax_prob)
+            if hoax_prob is None:
+                pending.append(key)
+            else:
+                for i in indices:
+                    results[i] = self._verdict(hoax_prob, match)
+        if not pending:
+            return results
+
+        with self.metrics.stage("encode", progress):
+            matrix, lengths = self.encoder.encode([token_lists[groups[key][0]] for key in pending])
+            valid = np.flatnonzero(lengths)
+        if len(valid) < len(pending):
+            self.metrics.incr("validin_predictions_total", sum(len(groups[pending[row]]) for row in np.flatnonzero(lengths == 0).tolist()), source="unprocessable")
+        if not len(valid):
+            return results
+        if len(valid) < len(pending):
+            matrix, lengths = matrix[valid], lengths[valid]
+
+        with self.metrics.stage("inference", progress):
+            probs = self.predict_proba(matrix, lengths)
+        self.metrics.incr("validin_predictions_total", sum(len(groups[pending[row]]) for row in valid.tolist()), source="model")
+        for row, hoax_prob in zip(valid.tolist(), probs):
+            key = pending[row]
+            for i in groups[key]:
+                results[i] = make_verdict(hoax_prob, self.threshold)
+            self._remember(key, token_lists[groups[key][0]], hoax_prob)
+        return results
+
+    def explain(self, text, max_variants=EXPLAIN_MAX_VARIANTS, budget_ms=EXPLAIN_BUDGET_MS, top_k=EXPLAIN_TOP_K):
+        """
+        Atribusi oklusi: setiap token (atau rentang token untuk teks panjang) dihilangkan dari
+        sekuens, semua varian diskor dalam satu panggilan model, dan selisih probabilitas hoax
+        terhadap teks utuh menjadi kontribusinya (positif = mendorong ke HOAX). Jumlah varian
+        dibatasi max_variants dan perkiraan waktu inferensi budget_ms; jika lebih sedikit dari
+        jumlah token, token yang berdekatan dihilangkan bersama. Hanya max_len token terakhir
+        (yang dilihat model) yang dijelaskan. Mengembalikan None jika tidak ada token yang dikenal.
+        """
+        with self.metrics.stage("explain"):
+            pairs = self.encoder.token_pairs(normalize(text))[-max_len:]
+            if not pairs:
+                return None
+            n = len(pairs)
+            limit = max_variants
+            if budget_ms is not None and self._explain_row_ms:
+                # Satu baris untuk teks utuh, sisanya varian
+                limit = min(limit, int(budget_ms / self._explain_row_ms) - 1)
+            limit = max(1, min(limit, n))
+            span = -(-n // limit)
+            starts = list(range(0, n, span))
+
+            ids = np.array([i for _, i in pairs], dtype=np.int32)
+            matrix = np.zeros((len(starts) + 1, max_len), dtype=np.int32)
+            lengths = np.zeros(len(starts) + 1, dtype=np.int32)
+            matrix[0, max_len - n:] = ids
+            lengths[0] = n
+            for row, start in enumerate(starts, 1):
+                variant = np.concatenate([ids[:start], ids[start + span:]])
+                if len(variant):
+                    matrix[row, max_len - len(variant):] = variant
+                lengths[row] = len(variant)
+
+            began = time.perf_counter()
+            scores = self.predict_proba(matrix, lengths).astype(np.float64)
+            row_ms = (time.perf_counter() - began) * 1000 / len(matrix)
+            self._explain_row_ms = row_ms if self._explain_row_ms is None else 0.8 * self._explain_row_ms + 0.2 * row_ms
+
+        hoax_prob = float(scores[0])
+        deltas = hoax_prob - scores[1:]
+        order = np.argsort(-np.abs(deltas), kind="stable")[:top_k]
+        return {
+            "hoax_prob": hoax_prob,
+            "span": span,
+            "variants": len(starts),
+            "tokens": [
+                {"text": " ".join(token for token, _ in pairs[starts[j]:starts[j] + span]), "delta": float(deltas[j])}
+                for j in order.tolist()
+            ],
+        }
+
+    def _remember(self, key, tokens, hoax_prob):
+        if self.cache is not None:
+            self.cache.set(key, float(hoax_prob))
+        if self.near_duplicates is not None:
+            self.near_duplicates.add(tokens, float(hoax_prob))
+
+    def _verdict(self, hoax_prob, match=None):
+        verdict = make_verdict(hoax_prob, self.threshold)
+        if match is not None:
+            # Referensi berita serupa yang skornya dipakai ulang
+            verdict["match"] = match.as_dict()
+        return verdict
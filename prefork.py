@@ -0,0 +1,118 @@
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+# Variabel lingkungan yang dibaca runtime BLAS/OpenMP saat pertama kali dimuat
+BLAS_THREAD_ENV = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+# Jeda sebelum worker yang mati dijalankan ulang (mencegah restart beruntun saat crash)
+RESTART_DELAY = 1.0
+
+def default_threads(workers):
+    """
+    Jumlah thread intra-op per worker agar total thread tidak melebihi jumlah core
+    """
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    return max(1, cores // max(1, workers))
+
+def configure_threads(intra_op=None, inter_op=None, tensorflow=False):
+    """
+    Membatasi thread pool BLAS (numpy) dan TensorFlow di proses ini. Untuk TensorFlow harus
+    dipanggil sebelum model dimuat; runtime TensorFlow tidak aman di-fork, jadi setiap worker
+    mengimpornya sendiri setelah fork
+    """
+    if intra_op:
+        for name in BLAS_THREAD_ENV:
+            os.environ[name] = str(intra_op)
+        os.environ["TF_NUM_INTRAOP_THREADS"] = str(intra_op)
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            pass
+        else:
+            # numpy sudah dimuat, jadi batas thread BLAS diterapkan langsung ke library-nya
+            threadpool_limits(intra_op)
+    if inter_op:
+        os.environ["TF_NUM_INTEROP_THREADS"] = str(inter_op)
+    if tensorflow:
+        import tensorflow as tf
+
+        if intra_op:
+            tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+        if inter_op:
+            tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+
+def listen(host, port, backlog=128):
+    """
+    Socket yang dibuka sekali di proses induk lalu diwarisi semua worker. Non-blocking agar
+    worker yang kalah berebut accept() tidak tertahan menunggu koneksi berikutnya
+    """
+    sock = socket.create_server((host, port), backlog=backlog)
+    sock.setblocking(False)
+    return sock
+
+def run_workers(workers, serve_worker):
+    """
+    Mem-fork sejumlah worker yang masing-masing menjalankan serve_worker(index) sampai
+    dihentikan. Semua yang dimuat proses induk sebelum fungsi ini (bobot model numpy,
+    kosakata, hasil kalibrasi) dipakai bersama secara copy-on-write. Worker yang mati
+    dijalankan ulang; SIGINT/SIGTERM ke induk menghentikan semua worker.
+    """
+    children = {}
+    stopping = False
+
+    # Objek yang sudah ada dikeluarkan dari pengawasan GC agar siklus GC di worker tidak
+    # menulis ke header objek dan membuat salinan halaman memori milik induk
+    gc.collect()
+    gc.freeze()
+
+    def spawn(index):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                serve_worker(index)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        children[pid] = index
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    previous = {sig: signal.signal(sig, stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        for index in range(workers):
+            spawn(index)
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = children.pop(pid, None)
+            if index is None or stopping:
+                continue
+            print(f"Worker {index} (pid {pid}) berhenti dengan status {status}; dijalankan ulang", file=sys.stderr, flush=True)
+            time.sleep(RESTART_DELAY)
+            if not stopping:
+                spawn(index)
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        gc.unfreeze()
@@ -0,0 +1,141 @@
+import email.utils
+import random
+import threading
+import time
+
+class TokenBucket:
+    """
+    Token bucket yang dapat ditunggu (blocking) dan dibagi oleh semua thread dalam proses
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.clock = clock
+        self.waiting = 0
+        self.max_waiting = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1, timeout=None):
+        """
+        Mengambil token; menunggu sampai tersedia atau timeout habis (mengembalikan False)
+        """
+        amount = min(float(amount), self.capacity)
+        start = self.clock()
+        deadline = None if timeout is None else start + timeout
+        with self._cond:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                while True:
+                    now = self.clock()
+                    self._refill(now)
+                    if now >= self._paused_until and self._tokens >= amount:
+                        self._tokens -= amount
+                        self.acquired += 1
+                        self.total_wait += now - start
+                        return True
+                    wait = max(self._paused_until - now, (amount - self._tokens) / self.rate)
+                    if deadline is not None:
+                        if now >= deadline:
+                            self.rejected += 1
+                            return False
+                        wait = min(wait, deadline - now)
+                    self._cond.wait(wait)
+            finally:
+                self.waiting -= 1
+
+    def refund(self, amount=1):
+        with self._cond:
+            self._tokens = min(self.capacity, self._tokens + amount)
+            self._cond.notify_all()
+
+    def pause(self, seconds):
+        """
+        Menahan semua pengambilan token selama beberapa detik (misalnya dari header Retry-After)
+        """
+        with self._cond:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "acquired": self.acquired,
+                "rejected": self.rejected,
+                "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            }
+
+class RateLimiter:
+    """
+    Menggabungkan anggaran jumlah permintaan dan jumlah token LLM per menit
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute=None, clock=time.monotonic):
+        self.requests = TokenBucket(requests_per_minute / 60.0, max(1, requests_per_minute / 6.0), clock)
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute, clock) if tokens_per_minute else None
+        self.clock = clock
+
+    def acquire(self, tokens=0, timeout=None):
+        start = self.clock()
+        if not self.requests.acquire(1, timeout):
+            return False
+        if self.tokens is not None and tokens:
+            remaining = None if timeout is None else max(0.0, timeout - (self.clock() - start))
+            if not self.tokens.acquire(tokens, remaining):
+                self.requests.refund(1)
+                return False
+        return True
+
+    def pause(self, seconds):
+        self.requests.pause(seconds)
+
+    def stats(self):
+        stats = {"requests": self.requests.stats()}
+        if self.tokens is not None:
+            stats["tokens"] = self.tokens.stats()
+        return stats
+
+class RetryPolicy:
+    """
+    Menghitung jeda retry: backoff eksponensial dengan full jitter, atau nilai
+    Retry-After dari server ditambah sedikit jitter agar klien tidak serempak
+    """
+
+    def __init__(self, max_retries=3, base_delay=1.0, max_delay=20.0, rng=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return retry_after + self.rng.uniform(0, self.base_delay)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+def parse_retry_after(value):
+    """
+    Mengubah header Retry-After (detik atau HTTP-date) menjadi jumlah detik
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - time.time())
@@ -0,0 +1,177 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import token_hash
+from grok import GrokError, get_grok_recommendations, grok_available, stream_grok_recommendations
+from metrics import metrics
+from pipeline import normalize
+
+# Lebar kelompok tingkat kepercayaan (persen) untuk menggabungkan permintaan serupa
+CONFIDENCE_BUCKET = 10
+
+def confidence_bucket(confidence):
+    return int(confidence // CONFIDENCE_BUCKET)
+
+def recommendation_key(tokens, prediction_result, confidence):
+    """
+    Kunci (hash teks ternormalisasi, kelas prediksi, kelompok kepercayaan) untuk penggabungan
+    """
+    return (token_hash(tokens, "recommendation"), int(prediction_result), confidence_bucket(confidence))
+
+class PendingRecommendation:
+    """
+    Hasil rekomendasi yang sedang diambil; teks bertambah selama streaming dan
+    dapat dibaca oleh semua sesi yang menunggu permintaan yang sama
+    """
+
+    def __init__(self, key, cache_key=None):
+        self.key = key
+        self.cache_key = cache_key
+        self.cached = False
+        # Referensi berita serupa jika rekomendasi diambil dari indeks near-duplicate
+        self.match = None
+        self.error = None
+        self.waiters = 1
+        self.done = threading.Event()
+        self._chunks = []
+        self._lock = threading.Lock()
+
+    def append(self, chunk):
+        with self._lock:
+            self._chunks.append(chunk)
+
+    @classmethod
+    def from_cache(cls, key, text, match=None):
+        pending = cls(key)
+        pending.cached = True
+        pending.match = match
+        pending.append(text)
+        pending.done.set()
+        return pending
+
+    @property
+    def text(self):
+        with self._lock:
+            return "".join(self._chunks)
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+class RecommendationService:
+    """
+    Mengambil rekomendasi Grok AI di executor latar belakang yang dibatasi dan
+    menggabungkan permintaan identik yang sedang berjalan menjadi satu panggilan;
+    jawaban yang berhasil disimpan di cache (opsional) dan dipakai ulang langsung,
+    juga untuk teks yang hampir sama jika indeks near-duplicate diberikan
+    """
+
+    def __init__(self, max_workers=4, max_pending=32, streaming=True, cache=None, near_duplicates=None):
+        self.max_pending = max_pending
+        self.streaming = streaming
+        self.cache = cache
+        self.near_duplicates = near_duplicates
+        self.submitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="grok")
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, news_text, prediction_result, confidence):
+        """
+        Mengembalikan PendingRecommendation, atau None jika Grok AI tidak tersedia / antrean penuh
+        """
+        tokens = normalize(news_text)
+        key = recommendation_key(tokens, prediction_result, confidence)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(tokens, prediction_result, confidence_bucket(confidence))
+            text = self.cache.get(cache_key)
+            if text is not None:
+                metrics.incr("validin_recommendations_total", source="cache")
+                return PendingRecommendation.from_cache(key, text)
+        if self.near_duplicates is not None:
+            match = self.near_duplicates.lookup(tokens)
+            if match is not None and match.recommendation is not None and match.recommendation_class == int(prediction_result):
+                metrics.incr("validin_recommendations_total", source="near_duplicate")
+                return PendingRecommendation.from_cache(key, match.recommendation, match.as_dict())
+
+        if not grok_available():
+            self._fallback("unavailable")
+            return None
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is not None:
+                pending.waiters += 1
+                self.coalesced += 1
+                return pending
+            if len(self._inflight) >= self.max_pending:
+                self.rejected += 1
+                self._fallback("queue_full")
+                return None
+            pending = self._inflight[key] = PendingRecommendation(key, cache_key)
+            self.submitted += 1
+        self._executor.submit(self._fetch, pending, news_text, prediction_result, confidence, tokens)
+        return pending
+
+    @staticmethod
+    def _fallback(reason, count=1):
+        metrics.incr("validin_recommendations_total", count, source="fallback")
+        metrics.incr("validin_fallback_total", count, reason=reason)
+
+    def _fetch(self, pending, news_text, prediction_result, confidence, tokens):
+        start = metrics.clock()
+        try:
+            if self.streaming:
+                for chunk in stream_grok_recommendations(news_text, prediction_result, confidence):
+                    pending.append(chunk)
+                if not pending.text:
+                    pending.error = "Grok AI tidak mengirimkan rekomendasi."
+            else:
+                result = get_grok_recommendations(news_text, prediction_result, confidence)
+                if result.startswith("Error:"):
+                    pending.error = result[len("Error:"):].strip()
+                else:
+                    pending.append(result)
+        except GrokError as e:
+            pending.error = str(e)
+        except Exception as e:
+            pending.error = f"Terjadi kesalahan tidak terduga - {str(e)}"
+        else:
+            if pending.error is None:
+                if self.cache is not None:
+                    self.cache.set(pending.cache_key, pending.text)
+                if self.near_duplicates is not None:
+                    self.near_duplicates.attach_recommendation(tokens, prediction_result, pending.text)
+        finally:
+            with self._lock:
+                self._inflight.pop(pending.key, None)
+            metrics.observe("grok", metrics.clock() - start)
+            # Setiap sesi yang menunggu permintaan ini ikut dihitung
+            if pending.error is None:
+                metrics.incr("validin_recommendations_total", pending.waiters, source="grok")
+            else:
+                metrics.incr("validin_stage_errors_total", stage="grok")
+                self._fallback("error", pending.waiters)
+            pending.done.set()
+
+    def close(self, wait=True):
+        """
+        Menghentikan executor: permintaan yang belum mulai dibatalkan (tidak pernah selesai dan
+        tidak dicatat di metrics), yang sedang berjalan ditunggu sampai selesai jika wait
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "inflight": len(self._inflight),
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+            }
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        if self.near_duplicates is not None:
+            stats["near_duplicates"] = self.near_duplicates.stats()
+        return stats
@@ -0,0 +1,337 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import Registry, metrics
+
+# Direktori registry default. Struktur:
+#   models/<versi>/manifest.json  {"backend", "model", "vocab", "threshold", "created"}
+#   models/<versi>/<file model dan kosakata>
+#   models/CURRENT                nama versi aktif
+#   models/CANDIDATE              nama versi yang diskor dalam mode shadow (opsional)
+REGISTRY_DIR = 'models'
+
+# Selang pemeriksaan perubahan CURRENT / CANDIDATE (detik)
+RELOAD_INTERVAL = 5.0
+
+# Batch shadow yang boleh mengantre; batch berikutnya dilewati agar jalur permintaan tidak tertahan
+SHADOW_MAX_PENDING = 4
+
+# Jumlah latensi terakhir yang disimpan untuk p50/p95 statistik shadow
+SHADOW_LATENCY_WINDOW = 1000
+
+# Registry metrik (nonaktif) untuk detector kandidat: tahap dan penghitung prediksinya tidak
+# boleh tercampur dengan metrik versi aktif; yang dicatat hanya shadow_inference dan validin_shadow_total
+SHADOW_METRICS = Registry(enabled=False)
+
+def _write_atomic(path, text):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(tmp_path, path)
+
+class ModelRegistry:
+    """
+    Direktori berisi versi model yang masing-masing membawa model, kosakata dan ambang
+    batasnya sendiri. Versi dipublikasikan lewat rename direktori dan diaktifkan lewat
+    penggantian file CURRENT, keduanya atomik.
+    """
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+
+    def _pointer(self, name):
+        try:
+            with open(os.path.join(self.root, name), encoding="utf-8") as handle:
+                return handle.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def current(self):
+        return self._pointer("CURRENT")
+
+    def candidate(self):
+        return self._pointer("CANDIDATE")
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, name, "manifest.json"))
+        )
+
+    def manifest(self, version):
+        """
+        Manifest versi dengan path model dan kosakata yang sudah absolut
+        """
+        directory = os.path.join(self.root, version)
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        manifest["version"] = version
+        manifest["model"] = os.path.join(directory, manifest["model"])
+        manifest["vocab"] = os.path.join(directory, manifest["vocab"])
+        return manifest
+
+    def publish(self, version, model_path, vocab_path, backend, threshold):
+        """
+        Menyalin model dan kosakata ke direktori sementara lalu me-rename-nya menjadi versi baru
+        """
+        import pipeline
+
+        target = os.path.join(self.root, version)
+        if os.path.exists(target):
+            raise FileExistsError(f"Versi '{version}' sudah ada di {self.root}")
+        staging = os.path.join(self.root, f".{version}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        shutil.copy2(model_path, os.path.join(staging, os.path.basename(model_path)))
+        shutil.copy2(vocab_path, os.path.join(staging, os.path.basename(vocab_path)))
+        manifest = {
+            "backend": backend,
+            "model": os.path.basename(model_path),
+            "vocab": os.path.basename(vocab_path),
+            "threshold": pipeline.THRESHOLD if threshold is None else threshold,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
+        _write_atomic(os.path.join(staging, "manifest.json"), json.dumps(manifest, indent=2))
+        os.rename(staging, target)
+        return target
+
+    def promote(self, version):
+        self.manifest(version)
+        _write_atomic(os.path.join(self.root, "CURRENT"), version + "\n")
+
+    def set_candidate(self, version):
+        path = os.path.join(self.root, "CANDIDATE")
+        if version is None:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        self.manifest(version)
+        _write_atomic(path, version + "\n")
+
+class ShadowScorer:
+    """
+    Menskor ulang sebagian batch produksi dengan model kandidat di thread terpisah (di luar
+    jalur permintaan) dan mencatat kesesuaian kelas, selisih probabilitas dan latensinya
+    """
+
+    def __init__(self, detector, version, sample_rate, max_pending=SHADOW_MAX_PENDING):
+        self.detector = detector
+        self.version = version
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.sampled = 0
+        self.dropped = 0
+        self.compared = 0
+        self.agreed = 0
+        self.abs_delta_sum = 0.0
+        self._pending = 0
+        self._active_ms = deque(maxlen=SHADOW_LATENCY_WINDOW)
+        self._shadow_ms = deque(maxlen=SHADOW_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="shadow")
+
+    def offer(self, texts, results, active_seconds):
+        if random.random() >= self.sample_rate:
+            return
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                metrics.incr("validin_shadow_dropped_total")
+                return
+            self._pending += 1
+            self.sampled += 1
+        self._executor.submit(self._score, list(texts), results, active_seconds)
+
+    def _score(self, texts, results, active_seconds):
+        try:
+            start = time.perf_counter()
+            with metrics.stage("shadow_inference"):
+                shadow = self.detector.predict_batch(texts)
+            elapsed = time.perf_counter() - start
+            agreed = compared = 0
+            abs_delta = 0.0
+            for active, candidate in zip(results, shadow):
+                if active is None or candidate is None:
+                    continue
+                compared += 1
+                agreed += active["pred_class"] == candidate["pred_class"]
+                abs_delta += abs(active["hoax_prob"] - candidate["hoax_prob"])
+            metrics.incr("validin_shadow_total", agreed, result="agree")
+            metrics.incr("validin_shadow_total", compared - agreed, result="disagree")
+            with self._lock:
+                self.compared += compared
+                self.agreed += agreed
+                self.abs_delta_sum += abs_delta
+                self._active_ms.append(active_seconds * 1000)
+                self._shadow_ms.append(elapsed * 1000)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self):
+        def summary(values):
+            if not values:
+                return None
+            ordered = sorted(values)
+            return {"p50_ms": ordered[len(ordered) // 2], "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]}
+
+        with self._lock:
+            return {
+                "version": self.version,
+                "sample_rate": self.sample_rate,
+                "batches": self.sampled,
+                "dropped": self.dropped,
+                "compared": self.compared,
+                "agreement": self.agreed / self.compared if self.compared else None,
+                "mean_abs_delta": self.abs_delta_sum / self.compared if self.compared else None,
+                # Latensi aktif termasuk hit cache; kandidat selalu menjalankan model
+                "active_latency": summary(self._active_ms),
+                "shadow_latency": summary(self._shadow_ms),
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+class ModelManager:
+    """
+    Pengganti HoaxDetector yang selalu meneruskan panggilan ke versi aktif di registry.
+    Versi baru dimuat dan dipanaskan di latar belakang sementara versi lama tetap melayani,
+    lalu ditukar dengan satu penugasan referensi; permintaan yang sedang berjalan selesai
+    dengan (model, kosakata, ambang batas) lama secara utuh.
+
+    load(manifest, shadow) membuat HoaxDetector untuk satu versi; shadow=True untuk kandidat
+    (sebaiknya tanpa cache agar model benar-benar dijalankan, dan dengan metrics=SHADOW_METRICS).
+    """
+
+    def __init__(self, registry, load, shadow_rate=0.0):
+        self.registry = registry
+        self._load = load
+        self.shadow_rate = shadow_rate
+        self.version = None
+        self.detector = None
+        self.shadow = None
+        self.swaps = 0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Atribut lain (cache, near_duplicates, threshold, encoder, ...) milik versi aktif
+        detector = self.__dict__.get("detector")
+        if detector is None:
+            raise AttributeError(name)
+        return getattr(detector, name)
+
+    def predict_batch(self, texts, progress=None):
+        detector, shadow = self.detector, self.shadow
+        start = time.perf_counter()
+        results = detector.predict_batch(texts, progress)
+        if shadow is not None:
+            shadow.offer(texts, results, time.perf_counter() - start)
+        return results
+
+    def explain(self, text, **options):
+        return self.detector.explain(text, **options)
+
+    def reload(self):
+        """
+        Memuat versi CURRENT (dan CANDIDATE untuk shadow) jika berubah; mengembalikan versi aktif
+        """
+        with self._lock:
+            current = self.registry.current()
+            if current is None:
+                raise LookupError(f"Registry {self.registry.root} belum memiliki versi aktif (file CURRENT)")
+            if current != self.version:
+                detector = self._load(self.registry.manifest(current), False)
+                previous = self.version
+                self.detector, self.version = detector, current
+                self.swaps += 1
+                metrics.incr("validin_model_swaps_total")
+                print(f"Model aktif: {current}" + (f" (sebelumnya {previous})" if previous else ""), file=sys.stderr, flush=True)
+
+            candidate = self.registry.candidate() if self.shadow_rate > 0 else None
+            if candidate == current:
+                candidate = None
+            shadow = self.shadow
+            if candidate != (shadow.version if shadow is not None else None):
+                self.shadow = None
+                if shadow is not None:
+                    shadow.close()
+                if candidate is not None:
+                    self.shadow = ShadowScorer(self._load(self.registry.manifest(candidate), True), candidate, self.shadow_rate)
+            return self.version
+
+    def start_watching(self, interval=RELOAD_INTERVAL):
+        """
+        Memeriksa registry secara berkala; versi yang gagal dimuat dilaporkan dan versi lama tetap dipakai
+        """
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload()
+                except Exception:
+                    traceback.print_exc()
+
+        thread = threading.Thread(target=run, name="model-registry", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "swaps": self.swaps,
+            "shadow": self.shadow.stats() if self.shadow is not None else None,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Registry versi model (publikasi, aktivasi, kandidat shadow)")
+    parser.add_argument("--root", default=REGISTRY_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    publish = commands.add_parser("publish", help="salin model dan kosakata sebagai versi baru")
+    publish.add_argument("version")
+    publish.add_argument("--model", required=True)
+    publish.add_argument("--vocab", default=None)
+    publish.add_argument("--backend", default=None)
+    publish.add_argument("--threshold", type=float, default=None)
+    publish.add_argument("--promote", action="store_true", help="langsung jadikan versi aktif")
+    promote = commands.add_parser("promote", help="jadikan versi aktif (server memuatnya tanpa restart)")
+    promote.add_argument("version")
+    candidate = commands.add_parser("candidate", help="skor versi ini dalam mode shadow")
+    candidate.add_argument("version", nargs="?", default=None, help="kosongkan untuk menghentikan shadow")
+    commands.add_parser("list", help="daftar versi")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == "publish":
+        import backends
+        import vocab
+
+        backend = args.backend or ("numpy" if args.model.endswith(".npz") else backends.MODEL_BACKEND)
+        print(registry.publish(args.version, args.model, args.vocab or vocab.VOCAB_PATH, backend, args.threshold))
+        if args.promote:
+            registry.promote(args.version)
+    elif args.command == "promote":
+        registry.promote(args.version)
+    elif args.command == "candidate":
+        registry.set_candidate(args.version)
+    else:
+        current, candidate = registry.current(), registry.candidate()
+        for version in registry.versions():
+            manifest = registry.manifest(version)
+            flag = " (aktif)" if version == current else " (kandidat)" if version == candidate else ""
+            print(f"{version:<20} {manifest['backend']:<6} ambang {manifest['threshold']:.2f}  {manifest['created']}{flag}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import startup
+from backends import BACKENDS, MODEL_BACKEND, default_model_path
+from encoder import SequenceEncoder
+from pipeline import WINDOW_COMBINE_RULES, make_verdict, max_len, normalize_batch, setup_nltk, stop_words
+from vocab import VOCAB_PATH, load_vocabulary
+
+# Kolom hasil yang ditulis untuk setiap dokumen
+OUTPUT_FIELDS = ("row", "id", "hoax_prob", "label", "confidence")
+
+# State per proses worker, diisi oleh _init_worker()
+_worker = {}
+
+def _init_worker(vocab_path, long_documents):
+    # Ctrl-C ditangani proses utama; worker dihentikan olehnya agar tidak ada yang menggantung
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_nltk()
+    _worker["encoder"] = SequenceEncoder(load_vocabulary(vocab_path), stop_words, max_len=max_len)
+    _worker["long_documents"] = long_documents is not None
+
+def _encode(texts):
+    """
+    Dijalankan di worker: preprocessing dan encoding satu potongan teks. Id lengkap hanya
+    dikembalikan untuk dokumen yang lebih panjang dari max_len (mode dokumen panjang)
+    """
+    encoder = _worker["encoder"]
+    token_lists = normalize_batch(texts)
+    matrix, lengths = encoder.encode(token_lists, out=np.zeros((len(texts), max_len), dtype=np.int32))
+    long_ids = {}
+    if _worker["long_documents"]:
+        for row, tokens in enumerate(token_lists):
+            if len(tokens) > max_len:
+                ids = encoder.token_ids(tokens)
+                if len(ids) > max_len:
+                    long_ids[row] = np.asarray(ids, dtype=np.int32)
+    return matrix, lengths, long_ids
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    raise ValueError(f"Format file '{path}' tidak dikenal (gunakan .csv atau .jsonl)")
+
+def read_chunks(path, text_column, id_column=None, chunk_size=5000, skip=0):
+    """
+    Membaca input per potongan dengan pandas; menghasilkan (nomor record awal, id, teks).
+    Saat melanjutkan, `skip` record pertama dibaca lalu dibuang: pada CSV satu record dapat
+    memuat baris baru di dalam kolom berkutip sehingga skiprows (baris fisik) tidak bisa dipakai
+    """
+    columns = [text_column] + ([id_column] if id_column else [])
+    if detect_format(path) == "csv":
+        reader = pd.read_csv(path, chunksize=chunk_size, usecols=columns, dtype=str, keep_default_na=False)
+    else:
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+    offset = 0
+
+    for chunk in reader:
+        if offset + len(chunk) <= skip:
+            offset += len(chunk)
+            continue
+        if offset < skip:
+            chunk = chunk.iloc[skip - offset:]
+            offset = skip
+        missing = [column for column in columns if column not in chunk.columns]
+        if missing:
+            raise KeyError(f"Kolom {', '.join(missing)} tidak ada di {path}")
+        texts = chunk[text_column].fillna("").astype(str).tolist()
+        ids = chunk[id_column].tolist() if id_column else [None] * len(texts)
+        yield offset, ids, texts
+        offset += len(chunk)
+
+class ResultWriter:
+    """
+    Menulis hasil secara bertahap (JSONL atau CSV) dan menyimpan ke disk setiap batch,
+    sehingga proses yang terhenti dapat dilanjutkan dari baris terakhir yang lengkap
+    """
+
+    def __init__(self, path, resume=True):
+        self.path = path
+        self.format = detect_format(path)
+        self.done = self._recover() if resume and os.path.exists(path) else 0
+        new_file = self.done == 0
+        self._handle = open(path, "a" if not new_file else "w", encoding="utf-8", newline="")
+        self._csv = csv.writer(self._handle) if self.format == "csv" else None
+        if new_file and self._csv is not None:
+            self._csv.writerow(OUTPUT_FIELDS)
+
+    def _recover(self):
+        """
+        Membuang baris terakhir yang terpotong lalu menghitung record hasil yang lengkap
+        (untuk CSV dihitung dengan csv.reader, bukan per baris fisik)
+        """
+        with open(self.path, "rb+") as handle:
+            data = handle.read()
+            complete = data.rfind(b"\n") + 1
+            if complete < len(data):
+                handle.truncate(complete)
+        if self.format == "csv":
+            records = sum(1 for _ in csv.reader(io.StringIO(data[:complete].decode("utf-8"), newline="")))
+            return max(0, records - 1)
+        return data[:complete].count(b"\n")
+
+    def write(self, rows):
+        for row in rows:
+            if self._csv is not None:
+                self._csv.writerow(["" if row[field] is None else row[field] for field in OUTPUT_FIELDS])
+            else:
+                self._handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.done += len(rows)
+
+    def close(self):
+        self._handle.close()
+
+def score_batch(detector, first_row, ids, encoded):
+    """
+    Menjalankan model untuk satu potongan yang sudah di-encode di worker
+    """
+    matrix, lengths, long_ids = encoded
+    probs = [None] * len(lengths)
+    valid = np.flatnonzero(lengths)
+    short = [row for row in valid.tolist() if row not in long_ids]
+    if short:
+        for row, hoax_prob in zip(short, detector.predict_proba(matrix[short], lengths[short]).tolist()):
+            probs[row] = hoax_prob
+    for row, window_ids in long_ids.items():
+        probs[row] = detector.score_windows(iter(window_ids.tolist()), detector.long_documents)
+
+    results = []
+    for row, (doc_id, hoax_prob) in enumerate(zip(ids, probs)):
+        verdict = make_verdict(hoax_prob, detector.threshold) if hoax_prob is not None else {}
+        results.append({
+            "row": first_row + row,
+            "id": doc_id,
+            "hoax_prob": verdict.get("hoax_prob"),
+            "label": verdict.get("label"),
+            "confidence": verdict.get("confidence"),
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Menskor korpus CSV/JSONL secara offline dalam batch besar")
+    parser.add_argument("input", help="file .csv atau .jsonl")
+    parser.add_argument("--output", default=None, help="file hasil .jsonl atau .csv (default: <input>.scored.jsonl)")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--id-column", default=None)
+    parser.add_argument("--chunk-size", type=int, default=5000, help="baris yang dibaca pandas per potongan")
+    parser.add_argument("--batch-size", type=int, default=512, help="dokumen per tugas worker dan per panggilan model")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--backend", default=MODEL_BACKEND, choices=sorted(BACKENDS))
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--vocab", default=VOCAB_PATH)
+    parser.add_argument("--long-documents", default=None, choices=WINDOW_COMBINE_RULES)
+    parser.add_argument("--restart", action="store_true", help="timpa hasil lama alih-alih melanjutkan")
+    args = parser.parse_args()
+    args.model = args.model or default_model_path(args.backend)
+    output = args.output or os.path.splitext(args.input)[0] + ".scored.jsonl"
+
+    setup_nltk()
+    writer = ResultWriter(output, resume=not args.restart)
+    if writer.done:
+        print(f"Melanjutkan dari baris {writer.done} ({output})", file=sys.stderr)
+
+    # Pool dibuat sebelum model dimuat; "spawn" agar worker tidak mewarisi state TensorFlow
+    executor = ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(args.vocab, args.long_documents),
+    )
+    detector = startup.load_detector(args.model, args.vocab, backend=args.backend, long_documents=args.long_documents)
+
+    # Jumlah tugas yang sedang berjalan dibatasi agar memori tetap datar untuk input sebesar apa pun
+    max_inflight = args.workers * 2
+    inflight = deque()
+    start = time.perf_counter()
+    scored = 0
+
+    def drain():
+        nonlocal scored
+        first_row, ids, future = inflight.popleft()
+        writer.write(score_batch(detector, first_row, ids, future.result()))
+        scored += len(ids)
+
+    try:
+        for offset, ids, texts in read_chunks(args.input, args.text_column, args.id_column, args.chunk_size, writer.done):
+            for i in range(0, len(texts), args.batch_size):
+                inflight.append((offset + i, ids[i:i + args.batch_size], executor.submit(_encode, texts[i:i + args.batch_size])))
+                if len(inflight) >= max_inflight:
+                    drain()
+            elapsed = time.perf_counter() - start
+            print(f"{writer.done} dokumen ditulis, {scored / elapsed:.0f} dok/detik", file=sys.stderr)
+        while inflight:
+            drain()
+    except KeyboardInterrupt:
+        print(f"Dihentikan; jalankan ulang perintah yang sama untuk melanjutkan dari baris {writer.done}", file=sys.stderr)
+        writer.close()
+        for process in multiprocessing.active_children():
+            process.terminate()
+        executor.shutdown(wait=True, cancel_futures=True)
+        sys.exit(130)
+
+    executor.shutdown()
+    writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"Selesai: {scored} dokumen dalam {elapsed:.1f} detik ({scored / max(elapsed, 1e-9):.0f} dok/detik) -> {output}")
+
+if __name__ == "__main__":
+    main()
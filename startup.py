@@ -0,0 +1,97 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupTimer:
+    """
+    Mencatat durasi setiap tahap startup (impor, data NLTK, model) untuk laporan waktu mulai
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.stages = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            with self._lock:
+                self.stages.append({"stage": name, "seconds": elapsed, "thread": threading.current_thread().name})
+
+    def report(self):
+        with self._lock:
+            stages = list(self.stages)
+        return {"stages": stages, "since_start": self.clock() - self.started}
+
+    def format_report(self):
+        report = self.report()
+        lines = ["Laporan startup Validin:"]
+        for item in report["stages"]:
+            lines.append(f"  {item['stage']:<20} {item['seconds'] * 1000:9.1f} ms  [{item['thread']}]")
+        lines.append(f"  {'sejak proses mulai':<20} {report['since_start'] * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+# Timer bersama untuk seluruh proses
+timer = StartupTimer()
+
+def load_detector(model_path=None, vocab_path=None, cache=None, warmup=True, backend=None, **options):
+    """
+    Memuat kosakata, TensorFlow (khusus backend keras) dan model sambil mencatat waktunya;
+    dipakai app.py di thread latar. options diteruskan ke HoaxDetector.
+    """
+    import backends
+    import pipeline
+    import vocab
+
+    backend = backend or backends.MODEL_BACKEND
+    with timer.stage("kosakata"):
+        vocabulary = vocab.load_vocabulary(vocab_path or vocab.VOCAB_PATH)
+    if backend == "keras":
+        with timer.stage("impor tensorflow"):
+            import tensorflow  # noqa: F401
+    with timer.stage(f"model ({backend})"):
+        model = backends.load_backend(backend, model_path)
+    detector = pipeline.HoaxDetector(model, vocabulary, cache=cache, **options)
+    if warmup:
+        with timer.stage("pemanasan"):
+            detector.warmup()
+    return detector
+
+def main():
+    parser = argparse.ArgumentParser(description="Mengukur waktu startup Validin atau menyiapkan data NLTK offline")
+    parser.add_argument("--fetch-nltk", action="store_true", help="unduh resource NLTK ke direktori bundel lalu keluar")
+    parser.add_argument("--backend", default=None, help="keras (default) atau numpy")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--vocab", default=None)
+    parser.add_argument("--no-warmup", action="store_true")
+    parser.add_argument("--json", action="store_true", help="cetak laporan sebagai JSON")
+    args = parser.parse_args()
+
+    with timer.stage("impor pipeline"):
+        import pipeline
+
+    if args.fetch_nltk:
+        pipeline.download_nltk_data()
+        print(f"Resource NLTK {', '.join(pipeline.NLTK_RESOURCES)} disimpan di {pipeline.nltk_data_dir}")
+        return
+
+    with timer.stage("data nltk"):
+        pipeline.setup_nltk(allow_download=False)
+    load_detector(args.model, args.vocab, warmup=not args.no_warmup, backend=args.backend)
+
+    if args.json:
+        json.dump(timer.report(), sys.stdout, indent=2)
+        print()
+    else:
+        print(timer.format_report())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import pytest
+
+import backends
+import grok
+import pipeline
+from benchmarks.standin import write_standin_numpy
+from grok_stub import start_stub
+from health import CircuitBreaker
+from metrics import Registry
+from rate_limit import RateLimiter, RetryPolicy
+from vocab import VOCAB_PATH, load_vocabulary
+
+@pytest.fixture(scope="session")
+def nltk_data():
+    """
+    Stopword NLTK dari folder bundel (atau NLTK_DATA_DIR); pengujian gagal, bukan dilewati,
+    jika data belum disiapkan dengan 'python startup.py --fetch-nltk'
+    """
+    try:
+        pipeline.setup_nltk()
+    except LookupError as e:
+        pytest.fail(str(e), pytrace=False)
+    return pipeline.stop_words
+
+@pytest.fixture(scope="session")
+def standin_model(tmp_path_factory):
+    """
+    Model pengganti backend numpy (arsitektur sama, bobot acak), tanpa TensorFlow
+    """
+    return backends.NumpyBackend(write_standin_numpy(str(tmp_path_factory.mktemp("standin") / "standin.npz")))
+
+@pytest.fixture(scope="session")
+def standin_vocabulary():
+    return load_vocabulary(VOCAB_PATH)
+
+@pytest.fixture
+def make_detector(standin_model, standin_vocabulary, nltk_data):
+    """
+    Membuat HoaxDetector di atas model pengganti dengan registry metrik tersendiri
+    """
+    def make(model=standin_model, **options):
+        options.setdefault("metrics", Registry(enabled=True))
+        return pipeline.HoaxDetector(model, standin_vocabulary, **options)
+    return make
+
+@pytest.fixture
+def stub(monkeypatch):
+    """
+    Server Grok tiruan lokal; klien diarahkan ke sana dengan breaker, limiter dan statistik baru
+    """
+    servers = []
+
+    def start(**config):
+        server, url = start_stub(**config)
+        servers.append(server)
+        monkeypatch.setattr(grok, "GROK_API_URL", url)
+        monkeypatch.setattr(grok, "GROK_API_KEY", "stub")
+        return server.RequestHandlerClass.config
+
+    monkeypatch.setattr(grok, "breaker", CircuitBreaker(failure_threshold=grok.FAILURE_THRESHOLD, recovery_timeout=60.0))
+    monkeypatch.setattr(grok, "limiter", RateLimiter(600, None))
+    monkeypatch.setattr(grok, "retry_policy", RetryPolicy(max_retries=grok.MAX_RETRIES, base_delay=0.01))
+    monkeypatch.setattr(grok, "client_stats", grok.ClientStats())
+    monkeypatch.setattr(grok, "READ_TIMEOUT", 5)
+    monkeypatch.setattr(grok, "REQUEST_DEADLINE", 10.0)
+    yield start
+    for server in servers:
+        server.shutdown()
@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import backends
+import pipeline
+from benchmarks.standin import build_standin_keras, write_standin_numpy
+
+# Toleransi prediction[:, 1] terhadap Keras, sama dengan default 'python backends.py'
+FLOAT_TOLERANCE = 1e-4
+INT8_TOLERANCE = 0.02
+
+@pytest.fixture(scope="module")
+def keras_model():
+    pytest.importorskip("tensorflow")
+    if os.path.exists(backends.MODEL_PATH):
+        return pipeline.load_lstm_model(backends.MODEL_PATH)
+    # Tanpa file model asli: arsitektur sama dengan bobot acak
+    return build_standin_keras(seed=0)
+
+@pytest.fixture(scope="module")
+def exported(keras_model, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("numpy_backend")
+    paths = {}
+    for quantize in (False, True):
+        path = str(directory / f"model{'_int8' if quantize else ''}.npz")
+        backends.export_numpy(out_path=path, quantize=quantize, model=keras_model)
+        paths[quantize] = path
+    return paths
+
+def edge_matrix():
+    """
+    Baris kosong (semua padding), satu token, panjang penuh dan id terbesar
+    """
+    matrix = np.zeros((4, pipeline.max_len), dtype=np.int32)
+    matrix[1, -1] = 1
+    matrix[2] = np.arange(pipeline.max_len) % (pipeline.max_features - 1) + 1
+    matrix[3, -5:] = pipeline.max_features - 1
+    return matrix
+
+def test_numpy_backend_matches_keras(keras_model, exported):
+    assert backends.check_parity(keras_model, backends.NumpyBackend(exported[False])) <= FLOAT_TOLERANCE
+
+def test_int8_backend_within_tolerance(keras_model, exported):
+    assert backends.check_parity(keras_model, backends.NumpyBackend(exported[True])) <= INT8_TOLERANCE
+
+def test_int8_projection_stays_int8(monkeypatch):
+    rng = np.random.default_rng(0)
+    table = backends._quantize(rng.normal(size=(50, 8)).astype(np.float32))
+    kernel = backends._quantize(rng.normal(size=(8, 16)).astype(np.float32))
+    bias = rng.normal(size=16).astype(np.float32)
+    expected = backends._quantize(table[0] * table[1] @ (kernel[0] * kernel[1]) + bias)
+    # Blok kecil agar batas antarblok ikut diuji
+    monkeypatch.setattr(backends, "PROJECTION_BLOCK_ROWS", 7)
+    q, scale = backends.NumpyBackend._projection(table, kernel, bias)
+    assert q.dtype == np.int8 and scale.dtype == np.float32
+    np.testing.assert_allclose(scale, expected[1], rtol=1e-5)
+    assert np.abs(q.astype(np.int32) - expected[0]).max() <= 1
+
+def test_numpy_backend_matches_keras_on_edge_rows(keras_model, exported):
+    matrix = edge_matrix()
+    expected = keras_model.predict(matrix, batch_size=len(matrix), verbose=0)
+    actual = backends.NumpyBackend(exported[False]).predict(matrix, batch_size=len(matrix), verbose=0)
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, atol=FLOAT_TOLERANCE)
+    # Satu baris sendiri harus sama dengan baris itu di dalam batch
+    single = backends.NumpyBackend(exported[False]).predict(matrix[2:3], batch_size=1, verbose=0)
+    np.testing.assert_allclose(single, actual[2:3], atol=1e-6)
+
+def test_numpy_backend_does_not_import_tensorflow(tmp_path):
+    path = write_standin_numpy(str(tmp_path / "standin.npz"))
+    code = (
+        "import sys, numpy as np, backends, pipeline\n"
+        f"model = backends.load_backend('numpy', {path!r})\n"
+        "probs = model.predict(np.zeros((2, pipeline.max_len), dtype=np.int32), batch_size=2, verbose=0)\n"
+        "assert probs.shape == (2, 2)\n"
+        "assert 'tensorflow' not in sys.modules, 'tensorflow diimpor'\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        backends.load_backend("onnx", "model.onnx")
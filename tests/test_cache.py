@@ -0,0 +1,129 @@
+import time
+
+import pytest
+
+import cache
+from cache import PredictionCache, SqliteStore, TieredCache, TTLCache
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def wall_clock(monkeypatch):
+    """
+    Mengganti time.time() yang dipakai SqliteStore agar masa berlaku dapat diuji tanpa menunggu
+    """
+    clock = FakeClock(time.time())
+    monkeypatch.setattr(cache.time, "time", clock)
+    return clock
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    memory = TTLCache(maxsize=10, ttl=5.0, clock=clock)
+    memory.set("a", 1)
+
+    clock.now += 4.9
+    assert memory.get("a") == 1
+    clock.now += 0.1
+    assert memory.get("a") is None
+    assert len(memory) == 0
+
+def test_ttl_cache_without_ttl_never_expires():
+    clock = FakeClock()
+    memory = TTLCache(maxsize=10, ttl=None, clock=clock)
+    memory.set("a", 1)
+    clock.now += 10 ** 9
+    assert memory.get("a") == 1
+
+def test_ttl_cache_evicts_least_recently_used():
+    memory = TTLCache(maxsize=2, ttl=None)
+    memory.set("a", 1)
+    memory.set("b", 2)
+    # Akses membuat "a" paling baru dipakai, jadi "b" yang dikeluarkan
+    assert memory.get("a") == 1
+    memory.set("c", 3)
+
+    assert memory.get("b") is None
+    assert memory.get("a") == 1 and memory.get("c") == 3
+    assert memory.evictions == 1
+
+def test_tiered_cache_persists_across_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = TieredCache(maxsize=10, ttl=60.0, path=path)
+    first.set("k", {"hoax_prob": 0.75})
+    first.disk.close()
+
+    second = TieredCache(maxsize=10, ttl=60.0, path=path)
+    assert second.get("k") == {"hoax_prob": 0.75}
+    # Hit disk pertama lalu dinaikkan ke memori
+    assert second.get("k") == {"hoax_prob": 0.75}
+    assert second.get("lain") is None
+    stats = second.stats()
+    assert (stats["disk_hits"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+def test_sqlite_store_expires_and_purges(tmp_path, wall_clock):
+    store = SqliteStore(str(tmp_path / "cache.db"), ttl=10.0)
+    store.set("a", 1)
+    store.set("b", 2)
+
+    wall_clock.now += 11.0
+    assert store.get("a") is None
+    store.purge_expired()
+    count = store._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    assert count == 0
+
+def test_sqlite_store_keeps_most_recently_accessed_rows(tmp_path, wall_clock):
+    store = SqliteStore(str(tmp_path / "cache.db"), max_rows=2)
+    store.set("a", 1)
+    wall_clock.now += 1
+    store.set("b", 2)
+    wall_clock.now += 1
+    assert store.get("a") == 1
+    wall_clock.now += 1
+    store.set("c", 3)
+
+    assert store.get("b") is None
+    assert store.get("a") == 1 and store.get("c") == 3
+
+def test_prediction_cache_key_depends_on_model_version():
+    tokens = ["presiden", "umumkan", "vaksin"]
+    assert PredictionCache("v1").key(tokens) == PredictionCache("v1").key(list(tokens))
+    assert PredictionCache("v1").key(tokens) != PredictionCache("v2").key(tokens)
+    assert PredictionCache("v1").key(tokens) != PredictionCache("v1").key(tokens[::-1])
+
+class CountingModel:
+    """
+    Membungkus model pengganti dan menghitung baris yang benar-benar dijalankan
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.rows = 0
+
+    def predict_on_batch(self, padded):
+        self.rows += len(padded)
+        return self.model.predict_on_batch(padded)
+
+def test_detector_reuses_cached_prediction(standin_model, make_detector, tmp_path):
+    model = CountingModel(standin_model)
+    path = str(tmp_path / "predictions.db")
+    detector = make_detector(model, cache=PredictionCache("standin", path=path))
+    text = "Presiden umumkan vaksin gratis untuk seluruh warga mulai besok"
+
+    first = detector.predict_batch([text, text])
+    assert model.rows == 1
+    assert first[0] == first[1]
+    # Teks yang sama setelah normalisasi memakai kunci yang sama
+    assert detector.predict_batch(["  PRESIDEN umumkan vaksin gratis untuk seluruh warga mulai besok!!"]) == first[:1]
+    assert model.rows == 1
+    assert detector.metrics.counter("validin_predictions_total", source="cache") == 1
+
+    # Tier SQLite: detector baru dengan cache memori kosong tetap tidak memanggil model
+    restarted = make_detector(model, cache=PredictionCache("standin", path=path))
+    assert restarted.predict_batch([text]) == first[:1]
+    assert model.rows == 1
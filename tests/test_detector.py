@@ -0,0 +1,230 @@
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import pipeline
+from metrics import Registry
+from vocab import export_vocabulary, load_vocabulary
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="module")
+def vocab_path(tmp_path_factory):
+    """
+    Kosakata kecil dari tokenizer tiruan (tanpa TensorFlow)
+    """
+    words = ["berita", "yang", "presiden", "warga", "hoax", "vaksin", "sebarkan", "resmi"]
+    tokenizer = SimpleNamespace(
+        word_index={"<OOV>": 1, **{word: i + 2 for i, word in enumerate(words)}},
+        num_words=None, oov_token="<OOV>", filters='!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n', lower=True, split=" ",
+    )
+    path = str(tmp_path_factory.mktemp("vocab") / "vocab.bin")
+    export_vocabulary(tokenizer, path)
+    return path
+
+def test_detector_loads_stop_words_before_building_encoder(vocab_path, nltk_data):
+    # Proses baru agar setup_nltk() belum pernah dipanggil sebelum HoaxDetector dibuat
+    code = (
+        "import pipeline\n"
+        "from vocab import load_vocabulary\n"
+        f"detector = pipeline.HoaxDetector(None, load_vocabulary({vocab_path!r}))\n"
+        "assert 'yang' in pipeline.stop_words\n"
+        "assert detector.encoder.stop_words == pipeline.stop_words\n"
+        "assert detector.encoder.token_ids(['berita', 'yang']) == [2]\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+class PlainModel:
+    """
+    Model tanpa predict_ragged, agar jalur pemisahan per kelompok lebar ikut diuji
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.widths = []
+
+    def predict_on_batch(self, padded):
+        self.widths.append(padded.shape[1])
+        return self.model.predict_on_batch(padded)
+
+class PaddingSensitiveModel:
+    """
+    Skor bergantung pada jumlah padding di depan, sehingga tidak ada margin yang lolos kalibrasi
+    """
+
+    def predict_on_batch(self, padded):
+        hoax = (padded == 0).mean(axis=1)
+        return np.stack([1 - hoax, hoax], axis=1)
+
+def random_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, pipeline.max_len + 1, size=n).astype(np.int32)
+    matrix = np.zeros((n, pipeline.max_len), dtype=np.int32)
+    for row, length in enumerate(lengths.tolist()):
+        matrix[row, pipeline.max_len - length:] = rng.integers(1, pipeline.max_features, size=length)
+    return matrix, lengths
+
+@pytest.mark.parametrize("rows", [5, pipeline.BUCKET_SPLIT_MIN_ROWS + 20])
+@pytest.mark.parametrize("ragged", [True, False])
+def test_bucketed_predict_matches_full_width(standin_model, make_detector, rows, ragged):
+    model = standin_model if ragged else PlainModel(standin_model)
+    detector = make_detector(model)
+    assert detector.calibrate_buckets() is not None
+    matrix, lengths = random_rows(rows)
+
+    full = detector.predict_proba(matrix)
+    if not ragged:
+        model.widths.clear()
+    bucketed = detector.predict_proba(matrix, lengths)
+
+    assert bucketed.shape == (rows,)
+    np.testing.assert_allclose(bucketed, full, atol=10 * pipeline.BUCKET_TOLERANCE)
+    if not ragged:
+        # Lebar yang dijalankan hanya lebar kelompok hasil kalibrasi, bukan selalu max_len
+        assert set(model.widths) <= set(detector._widths.tolist())
+
+def test_bucketed_predict_keeps_row_order(standin_model, make_detector):
+    detector = make_detector(PlainModel(standin_model))
+    detector.calibrate_buckets()
+    matrix, lengths = random_rows(pipeline.BUCKET_SPLIT_MIN_ROWS + 20, seed=1)
+    order = np.argsort(lengths)
+
+    np.testing.assert_allclose(
+        detector.predict_proba(matrix[order], lengths[order]),
+        detector.predict_proba(matrix, lengths)[order],
+        atol=1e-6,
+    )
+
+def test_padding_sensitive_model_uses_full_width(make_detector):
+    model = PaddingSensitiveModel()
+    detector = make_detector(model)
+    assert detector.calibrate_buckets() is None
+    matrix, lengths = random_rows(8)
+    np.testing.assert_array_equal(detector.predict_proba(matrix, lengths), model.predict_on_batch(matrix)[:, 1])
+
+class MaxIdModel:
+    """
+    Skor setiap baris = id terbesar di baris itu / max_features, sehingga skor tiap jendela dapat dihitung ulang
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_on_batch(self, padded):
+        self.batches.append(len(padded))
+        hoax = padded.max(axis=1) / pipeline.max_features
+        return np.stack([1 - hoax, hoax], axis=1)
+
+def window_scores(ids, overlap=pipeline.WINDOW_OVERLAP):
+    windows = list(pipeline.iter_windows(iter(ids), pipeline.max_len, overlap))
+    scores = np.array([max(window) / pipeline.max_features for window, _ in windows])
+    weights = np.array([fresh for _, fresh in windows], dtype=np.float64)
+    return scores, weights
+
+@pytest.mark.parametrize("n_ids", [40, pipeline.max_len, pipeline.max_len + 1, 12345])
+def test_score_windows_combine_rules(make_detector, n_ids):
+    model = MaxIdModel()
+    detector = make_detector(model)
+    ids = np.random.default_rng(n_ids).integers(1, pipeline.max_features, size=n_ids).tolist()
+    scores, weights = window_scores(ids)
+
+    assert detector.score_windows(iter(ids), "max") == pytest.approx(scores.max())
+    assert detector.score_windows(iter(ids), "mean") == pytest.approx(scores.mean())
+    assert detector.score_windows(iter(ids), "weighted") == pytest.approx(scores @ weights / weights.sum())
+    # Jendela diskor per batch berukuran tetap, tidak sekaligus
+    assert max(model.batches) <= pipeline.MAX_WINDOWS_PER_BATCH
+
+def test_weighted_rule_discounts_overlapping_tail(make_detector):
+    detector = make_detector(MaxIdModel())
+    # Jendela terakhir hanya membawa 10 token baru yang berisi id terbesar
+    ids = [1] * (pipeline.max_len + 10)
+    ids[-1] = pipeline.max_features - 1
+    scores, weights = window_scores(ids)
+    assert weights.tolist() == [pipeline.max_len, 10]
+
+    weighted = detector.score_windows(iter(ids), "weighted")
+    assert detector.score_windows(iter(ids), "mean") > weighted > scores.min()
+
+def test_score_windows_without_ids_returns_none(make_detector):
+    detector = make_detector(MaxIdModel())
+    assert all(detector.score_windows(iter([]), rule) is None for rule in pipeline.WINDOW_COMBINE_RULES)
+
+def test_unknown_combine_rule_is_rejected(make_detector):
+    with pytest.raises(ValueError):
+        make_detector(MaxIdModel(), long_documents="median")
+
+def test_predict_batch_scores_long_documents_by_window(make_detector, standin_vocabulary):
+    words = [word for word in standin_vocabulary.words[:2000] if word.isalpha()]
+    long_text = " ".join(words[:pipeline.max_len * 3])
+    short_text = " ".join(words[:20])
+    truncating = make_detector()
+    windowed = make_detector(long_documents="max")
+
+    long_verdict, short_verdict = windowed.predict_batch([long_text, short_text])
+    ids = windowed.encoder.token_ids(pipeline.normalize(long_text))
+    assert len(ids) > pipeline.max_len
+    assert long_verdict["hoax_prob"] == pytest.approx(windowed.score_windows(iter(ids), "max"), abs=1e-4)
+    # Teks pendek tetap diskor seperti tanpa mode dokumen panjang
+    assert short_verdict == truncating.predict_batch([short_text])[0]
+    assert windowed.metrics.counter("validin_predictions_total", source="model") == 2
+
+class WeightModel:
+    """
+    Skor = 0.4 + jumlah bobot token di baris, sehingga kontribusi tiap token pada explain() dapat dihitung
+    """
+
+    def __init__(self, vocabulary, weights):
+        self.weights = np.zeros(pipeline.max_features, dtype=np.float32)
+        for word, weight in weights.items():
+            self.weights[vocabulary.get(word)] = weight
+
+    def predict_on_batch(self, padded):
+        hoax = 0.4 + self.weights[padded].sum(axis=1)
+        return np.stack([1 - hoax, hoax], axis=1)
+
+@pytest.fixture
+def weighted_detector(vocab_path, nltk_data):
+    vocabulary = load_vocabulary(vocab_path)
+    model = WeightModel(vocabulary, {"hoax": 0.3, "sebarkan": 0.2, "resmi": -0.25})
+    return pipeline.HoaxDetector(model, vocabulary, metrics=Registry(enabled=True))
+
+def test_explain_orders_tokens_by_contribution(weighted_detector):
+    explanation = weighted_detector.explain("Berita yang HOAX: presiden resmi, sebarkan! warga", budget_ms=None, top_k=10)
+
+    assert explanation["hoax_prob"] == pytest.approx(0.65)
+    # Stopword 'yang' dibuang sebelum penjelasan; satu varian per token
+    assert (explanation["span"], explanation["variants"]) == (1, 6)
+    assert [(token["text"], token["delta"]) for token in explanation["tokens"]] == [
+        ("hoax", pytest.approx(0.3)),
+        ("resmi", pytest.approx(-0.25)),
+        ("sebarkan", pytest.approx(0.2)),
+        # Kontribusi yang sama tetap dalam urutan teks
+        ("berita", pytest.approx(0.0)),
+        ("presiden", pytest.approx(0.0)),
+        ("warga", pytest.approx(0.0)),
+    ]
+    assert [token["text"] for token in weighted_detector.explain("berita hoax resmi sebarkan", top_k=2)["tokens"]] == ["hoax", "resmi"]
+
+def test_explain_groups_tokens_beyond_max_variants(weighted_detector):
+    text = "berita presiden warga hoax vaksin sebarkan resmi berita warga vaksin"
+
+    explanation = weighted_detector.explain(text, max_variants=4, budget_ms=None, top_k=10)
+    assert (explanation["span"], explanation["variants"]) == (3, 4)
+    assert [token["text"] for token in explanation["tokens"]] == [
+        "hoax vaksin sebarkan", "resmi berita warga", "berita presiden warga", "vaksin",
+    ]
+    assert explanation["tokens"][0]["delta"] == pytest.approx(0.5)
+    assert explanation["tokens"][1]["delta"] == pytest.approx(-0.25)
+
+    # Anggaran waktu membatasi varian: satu baris untuk teks utuh, sisanya varian
+    weighted_detector._explain_row_ms = 10.0
+    explanation = weighted_detector.explain(text, budget_ms=30.0)
+    assert (explanation["span"], explanation["variants"]) == (5, 2)
+
+def test_explain_without_known_tokens_returns_none(weighted_detector):
+    assert weighted_detector.explain("") is None
+    assert weighted_detector.explain("yang dan !!! ...") is None
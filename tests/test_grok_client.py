@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+import grok
+from rate_limit import RetryPolicy, TokenBucket
+
+def test_retry_after_is_honored(stub, monkeypatch):
+    monkeypatch.setattr(grok, "MAX_RETRIES", 2)
+    config = stub(rate_limit_ratio=1.0, retry_after=1)
+
+    start = time.monotonic()
+    result = grok.get_grok_recommendations("teks berita", 1, 90.0)
+    elapsed = time.monotonic() - start
+
+    assert result.startswith("Error:") and "429" in result
+    assert config.requests == 2
+    # Retry kedua baru dikirim setelah max(Retry-After, backoff), jeda yang sama dengan limiter
+    assert 1.0 <= elapsed < 2.0
+    assert grok.client_stats.counters["rate_limited"] == 2
+    # Retry-After juga menahan permintaan lain di proses ini lewat rate limiter
+    assert not grok.limiter.acquire(timeout=0)
+
+def test_deadline_fails_fast_when_retry_after_exceeds_it(stub, monkeypatch):
+    monkeypatch.setattr(grok, "REQUEST_DEADLINE", 2.0)
+    config = stub(rate_limit_ratio=1.0, retry_after=30)
+
+    start = time.monotonic()
+    result = grok.get_grok_recommendations("teks berita", 1, 90.0)
+    elapsed = time.monotonic() - start
+
+    assert result.startswith("Error:")
+    assert config.requests == 1
+    assert elapsed < 1.0
+    assert grok.client_stats.counters["deadline"] == 1
+
+def test_stream_stops_at_deadline(stub, monkeypatch):
+    monkeypatch.setattr(grok, "REQUEST_DEADLINE", 0.5)
+    # Setiap potongan datang jauh di bawah READ_TIMEOUT, tetapi seluruh stream butuh > 5 detik
+    stub(chunk_delay=0.2, chunk_size=4)
+
+    chunks = []
+    start = time.monotonic()
+    with pytest.raises(grok.GrokError, match="Timeout"):
+        for chunk in grok.stream_grok_recommendations("teks berita", 1, 90.0, stats=None):
+            chunks.append(chunk)
+    elapsed = time.monotonic() - start
+
+    assert chunks
+    assert elapsed < 1.0
+    assert grok.client_stats.counters["stream_deadline"] == 1
+
+def test_breaker_opened_during_retry_is_labelled(stub, monkeypatch):
+    class OpeningPolicy(RetryPolicy):
+        # Permintaan lain membuka sirkuit selama jeda retry
+        def delay(self, attempt, retry_after=None):
+            for _ in range(grok.FAILURE_THRESHOLD):
+                grok.breaker.record_failure()
+            return 0.0
+
+    monkeypatch.setattr(grok, "retry_policy", OpeningPolicy())
+    stub(rate_limit_ratio=1.0, retry_after=0)
+
+    result = grok.get_grok_recommendations("teks berita", 1, 90.0)
+
+    assert result == f"Error: {grok.CIRCUIT_OPEN_MESSAGE}"
+    assert grok.client_stats.counters["circuit_open"] == 1
+    assert "deadline" not in grok.client_stats.counters
+
+def test_missing_api_key_uses_fallback(stub, monkeypatch):
+    config = stub()
+    monkeypatch.setattr(grok, "GROK_API_KEY", None)
+
+    assert not grok.grok_available()
+    assert grok.get_grok_recommendations("teks berita", 1, 90.0) == f"Error: {grok.MISSING_KEY_MESSAGE}"
+    with pytest.raises(grok.GrokError):
+        next(grok.stream_grok_recommendations("teks berita", 1, 90.0, stats=None))
+    assert config.requests == 0
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate=10, capacity=1)
+    assert bucket.acquire()
+
+    start = time.monotonic()
+    assert bucket.acquire(timeout=1.0)
+    assert 0.05 <= time.monotonic() - start < 0.5
+
+def test_token_bucket_rejects_after_timeout():
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.acquire()
+
+    start = time.monotonic()
+    assert not bucket.acquire(timeout=0.05)
+    assert time.monotonic() - start < 0.5
+    assert bucket.stats()["rejected"] == 1
+
+def test_token_bucket_pause_holds_requests():
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.pause(0.3)
+
+    assert not bucket.acquire(timeout=0.05)
+    start = time.monotonic()
+    assert bucket.acquire(timeout=1.0)
+    assert time.monotonic() - start >= 0.2
@@ -0,0 +1,129 @@
+import re
+import urllib.error
+import urllib.request
+
+import pytest
+
+from cache import PredictionCache
+from metrics import Registry, cache_collector, start_metrics_server
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})? (\S+)$')
+
+class StepClock:
+    """
+    Jam tiruan: setiap tahap berlangsung tepat step detik
+    """
+
+    def __init__(self, step):
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+def families(text):
+    """
+    Memeriksa struktur eksposisi Prometheus dan mengembalikan {nama: jenis}
+    """
+    kinds, seen, current = {}, [], None
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name not in kinds, f"TYPE ganda untuk {name}"
+            kinds[name] = kind
+            seen.append(name)
+            current = name
+        elif line.startswith("# HELP "):
+            continue
+        else:
+            match = SAMPLE.match(line)
+            assert match, f"baris tidak valid: {line!r}"
+            family = re.sub(r"_(bucket|sum|count)$", "", match.group(1)) if kinds.get(current) == "histogram" else match.group(1)
+            # Sampel satu metrik harus berada tepat di bawah TYPE-nya
+            assert family == current, f"{match.group(1)} di luar kelompok {current}"
+            float(match.group(3).replace("+Inf", "inf"))
+    return kinds
+
+def test_render_histogram_counters_and_ratio():
+    registry = Registry(enabled=True, buckets=(0.01, 0.1), clock=StepClock(0.05))
+    for _ in range(3):
+        with registry.stage("inference"):
+            pass
+    with pytest.raises(RuntimeError):
+        with registry.stage("encode"):
+            raise RuntimeError("gagal")
+    registry.incr("validin_recommendations_total", 3, source="grok")
+    registry.incr("validin_recommendations_total", source="fallback")
+    registry.incr("validin_predictions_total", source='ca"che\n')
+
+    text = registry.render()
+    lines = text.splitlines()
+
+    assert 'validin_stage_duration_seconds_bucket{stage="inference",le="0.01"} 0' in lines
+    assert 'validin_stage_duration_seconds_bucket{stage="inference",le="0.1"} 3' in lines
+    assert 'validin_stage_duration_seconds_bucket{stage="inference",le="+Inf"} 3' in lines
+    assert 'validin_stage_duration_seconds_count{stage="inference"} 3' in lines
+    total = next(line for line in lines if line.startswith('validin_stage_duration_seconds_sum{stage="inference"}'))
+    assert float(total.split()[-1]) == pytest.approx(0.15)
+    assert 'validin_stage_errors_total{stage="encode"} 1' in lines
+    # Label diurutkan dan di-escape
+    assert lines.index('validin_recommendations_total{source="fallback"} 1') < lines.index('validin_recommendations_total{source="grok"} 3')
+    assert 'validin_predictions_total{source="ca\\"che\\n"} 1' in lines
+    assert "validin_fallback_ratio 0.25" in lines
+    assert families(text) == {
+        "validin_stage_duration_seconds": "histogram",
+        "validin_predictions_total": "counter",
+        "validin_recommendations_total": "counter",
+        "validin_stage_errors_total": "counter",
+        "validin_fallback_ratio": "gauge",
+    }
+    assert text.endswith("\n")
+
+def test_collectors_sharing_a_metric_are_grouped():
+    registry = Registry(enabled=True)
+    predictions, recommendations = PredictionCache("v1"), PredictionCache("v1")
+    predictions.set("a", 0.5)
+    predictions.get("a")
+    recommendations.get("b")
+    registry.add_collector(cache_collector("prediction", predictions))
+    registry.add_collector(cache_collector("recommendation", recommendations))
+
+    text = registry.render()
+    kinds = families(text)
+    assert kinds["validin_cache_hits_total"] == "counter" and kinds["validin_cache_entries"] == "gauge"
+    assert 'validin_cache_hits_total{cache="prediction",tier="memory"} 1' in text
+    assert 'validin_cache_misses_total{cache="recommendation"} 1' in text
+
+def test_disabled_registry_renders_only_ratio():
+    registry = Registry(enabled=False)
+    with registry.stage("inference"):
+        pass
+    registry.incr("validin_predictions_total", source="model")
+    assert registry.render() == "# HELP validin_fallback_ratio Proporsi rekomendasi yang memakai rekomendasi cadangan\n# TYPE validin_fallback_ratio gauge\nvalidin_fallback_ratio 0.0\n"
+
+def test_detector_stages_are_rendered(make_detector):
+    detector = make_detector()
+    detector.predict_batch(["Presiden umumkan vaksin gratis untuk seluruh warga", ""])
+
+    text = detector.metrics.render()
+    families(text)
+    for stage in ("preprocess", "encode", "inference"):
+        assert f'validin_stage_duration_seconds_count{{stage="{stage}"}} 1' in text
+    assert 'validin_predictions_total{source="model"} 1' in text
+    assert 'validin_predictions_total{source="unprocessable"} 1' in text
+
+def test_metrics_server_binds_loopback_by_default():
+    registry = Registry(enabled=True)
+    registry.incr("validin_predictions_total", source="model")
+    server = start_metrics_server(port=0, registry=registry)
+    try:
+        host, port = server.server_address[:2]
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert response.read().decode("utf-8") == registry.render()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/lain", timeout=5)
+    finally:
+        server.shutdown()
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+import pipeline
+from benchmarks.corpus import generate_corpus
+from near_duplicates import MIN_TOKENS, NearDuplicateIndex, reference
+
+@pytest.fixture(scope="module")
+def texts():
+    # Hanya teks yang cukup panjang agar selalu punya signature
+    corpus = generate_corpus(200, max_words=120, seed=11)
+    return [text for text in corpus if len(set(pipeline.normalize(text))) >= 4 * MIN_TOKENS][:60]
+
+def tokens_of(text):
+    return pipeline.normalize(text)
+
+def edited(text):
+    """
+    Versi berita berantai yang sedikit diubah: satu kata diganti dan ajakan menyebarkan ditambah
+    """
+    words = text.split()
+    words[len(words) // 2] = "diganti"
+    return " ".join(words) + " 😱 SEBARKAN!!!"
+
+def filled_index(texts, **options):
+    index = NearDuplicateIndex(capacity=64, **options)
+    for i, text in enumerate(texts):
+        assert index.add(tokens_of(text), i / 100)
+    return index
+
+def test_lookup_finds_exact_and_edited_copies(texts):
+    index = filled_index(texts[:40])
+
+    exact = index.lookup(tokens_of(texts[7]))
+    assert exact is not None and exact.hoax_prob == pytest.approx(0.07)
+    assert exact.similarity == pytest.approx(1.0)
+    assert exact.ref == reference(tokens_of(texts[7]))
+
+    near = index.lookup(tokens_of(edited(texts[7])))
+    assert near is not None and near.seq == exact.seq and near.similarity >= index.threshold
+
+    assert all(index.lookup(tokens_of(text)) is None for text in texts[40:])
+    assert index.stats()["hits"] == 2 and index.stats()["misses"] == 20
+
+def test_short_texts_are_not_indexed():
+    index = NearDuplicateIndex(capacity=8)
+    tokens = [f"kata{i}" for i in range(MIN_TOKENS - 1)]
+    assert not index.add(tokens, 0.5)
+    assert index.lookup(tokens) is None and len(index) == 0
+
+def test_oldest_entries_are_evicted_first(texts):
+    index = NearDuplicateIndex(capacity=16)
+    for i, text in enumerate(texts[:20]):
+        index.add(tokens_of(text), i / 100)
+
+    assert len(index) == 16
+    assert all(index.lookup(tokens_of(text)) is None for text in texts[:4])
+    assert all(index.lookup(tokens_of(text)).hoax_prob == pytest.approx(i / 100) for i, text in enumerate(texts[4:20], 4))
+
+def test_recommendation_is_attached_to_matching_entry(texts):
+    index = filled_index(texts[:10])
+    assert index.attach_recommendation(tokens_of(texts[3]), 1, "## Rekomendasi")
+    assert not index.attach_recommendation(tokens_of(texts[50]), 1, "tidak ada entrinya")
+
+    match = index.lookup(tokens_of(edited(texts[3])))
+    assert (match.recommendation_class, match.recommendation) == (1, "## Rekomendasi")
+    assert index.lookup(tokens_of(texts[4])).recommendation is None
+
+def test_snapshot_round_trip(texts, tmp_path):
+    path = str(tmp_path / "index.npz")
+    index = filled_index(texts[:30], model_version="v1", max_recommendations=2)
+    for i in (1, 2, 3):
+        index.attach_recommendation(tokens_of(texts[i]), i % 2, f"rekomendasi {i}")
+    index.save(path)
+
+    loaded = NearDuplicateIndex.load(path)
+    assert len(loaded) == len(index) and loaded.count == index.count
+    assert loaded.model_version == "v1"
+    for name in ("signatures", "seqs", "hoax_probs", "refs", "heads", "chains"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(index, name))
+    # Hanya max_recommendations teks terbaru yang disimpan
+    assert dict(loaded.recommendations) == dict(index.recommendations)
+    assert len(loaded.recommendations) == 2
+    for text in texts[:30] + [edited(texts[3])]:
+        expected, actual = index.lookup(tokens_of(text)), loaded.lookup(tokens_of(text))
+        assert (actual.ref, actual.similarity, actual.hoax_prob, actual.recommendation) == \
+            (expected.ref, expected.similarity, expected.hoax_prob, expected.recommendation)
+
+    # Indeks baru tetap dapat ditambah setelah dimuat
+    assert loaded.add(tokens_of(texts[40]), 0.9)
+    assert loaded.lookup(tokens_of(texts[40])).hoax_prob == pytest.approx(0.9)
+
+def test_open_ignores_incompatible_snapshots(texts, tmp_path):
+    path = str(tmp_path / "index.npz")
+    filled_index(texts[:10], model_version="v1").save(path)
+
+    assert len(NearDuplicateIndex.open(path, model_version="v1", capacity=64)) == 10
+    assert len(NearDuplicateIndex.open(path, model_version="v2", capacity=64)) == 0
+    assert len(NearDuplicateIndex.open(path, model_version="v1", capacity=128)) == 0
+    assert NearDuplicateIndex.open(path, model_version="v1", capacity=64, threshold=0.95).threshold == 0.95
+
+def test_detector_reuses_near_duplicate_score(texts, make_detector, nltk_data):
+    index = NearDuplicateIndex(capacity=64, stop_words=nltk_data)
+    detector = make_detector(near_duplicates=index)
+
+    original = detector.predict_batch([texts[0]])[0]
+    copy = detector.predict_batch([edited(texts[0])])[0]
+
+    assert copy["hoax_prob"] == original["hoax_prob"]
+    assert copy["match"]["ref"] == reference(tokens_of(texts[0]))
+    assert detector.metrics.counter("validin_predictions_total", source="near_duplicate") == 1
@@ -0,0 +1,56 @@
+import pytest
+
+import pipeline
+from benchmarks.bench_preprocess import legacy_preprocess
+from benchmarks.corpus import NOISE, generate_corpus
+
+# Kasus tepi untuk normalizer satu langkah: kontraksi yang dipecah word_tokenize, URL dan
+# mention, tab dan baris baru, huruf unicode yang berubah panjang saat lower(), teks kosong
+EDGE_CASES = [
+    "",
+    "   ",
+    "\t\n",
+    "Cannot believe it, gonna WANNA gimme lemme gotta",
+    "cannotx wanna_ gonna2 GoNnA",
+    "cek https://t.co/abc123 dan http://bit.ly/x?y=1 atau www.contoh.com",
+    "café://x a_b://c snake_case e-mail",
+    "@kominfo @user_01 menurut @Sumber123 beredar",
+    "kolom\tsatu\t\tdua\nbaris baru\r\nlagi",
+    "İstanbul \u212a naïve Ünïcödé straße ǅemal",
+    "😱🙏 sebarkan!!! penting??? ...",
+    "Rp10.000 50% 2024 #hoax -- (resmi) \"klarifikasi\" 'fakta'",
+    "tanpaspasisamasekali" * 20,
+]
+
+@pytest.fixture(scope="module")
+def legacy(nltk_data):
+    # Pipeline lama butuh punkt_tab; ikut diunduh oleh 'python startup.py --fetch-nltk'
+    return legacy_preprocess
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_preprocess_matches_legacy_on_edge_cases(legacy, text):
+    assert pipeline.preprocess(text) == legacy(text)
+
+@pytest.mark.parametrize("noise", NOISE)
+def test_preprocess_matches_legacy_on_noise_tokens(legacy, noise):
+    text = f"berita {noise} viral{noise}warga {noise}"
+    assert pipeline.preprocess(text) == legacy(text)
+
+def test_preprocess_matches_legacy_on_corpus(legacy):
+    corpus = generate_corpus(500, max_words=200, seed=1)
+    mismatches = [text for text in corpus if pipeline.preprocess(text) != legacy(text)]
+    assert not mismatches
+
+def test_normalize_keeps_stop_words(nltk_data):
+    text = "Ini adalah berita yang VIRAL di media sosial"
+    tokens = pipeline.normalize(text)
+    assert tokens == pipeline.clean(text).split()
+    assert [t for t in tokens if t not in nltk_data] == pipeline.preprocess(text)
+
+def test_iter_tokens_matches_normalize_across_chunk_boundaries(nltk_data):
+    for text in EDGE_CASES + generate_corpus(50, max_words=300, seed=2):
+        assert list(pipeline.iter_tokens(text, chunk_size=7)) == pipeline.normalize(text)
+
+def test_batch_helpers_match_single_text(nltk_data):
+    assert pipeline.preprocess_batch(EDGE_CASES) == [pipeline.preprocess(t) for t in EDGE_CASES]
+    assert pipeline.normalize_batch(EDGE_CASES) == [pipeline.normalize(t) for t in EDGE_CASES]
@@ -0,0 +1,136 @@
+import threading
+
+import pytest
+
+import grok
+import recommendations
+from cache import RecommendationCache
+from grok_stub import DEFAULT_REPLY
+from metrics import Registry
+from recommendations import RecommendationService
+
+TEXT = "Presiden umumkan vaksin gratis untuk seluruh warga mulai besok, sebarkan!"
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = Registry(enabled=True)
+    monkeypatch.setattr(recommendations, "metrics", registry)
+    return registry
+
+@pytest.fixture
+def service(registry):
+    services = []
+
+    def make(**options):
+        service = RecommendationService(max_workers=4, **options)
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.close()
+
+def submit_concurrently(service, requests):
+    """
+    Mengirim semua permintaan sekaligus dari thread terpisah, seperti beberapa sesi Streamlit
+    """
+    results = [None] * len(requests)
+    barrier = threading.Barrier(len(requests))
+
+    def run(index, args):
+        barrier.wait()
+        results[index] = service.submit(*args)
+
+    threads = [threading.Thread(target=run, args=item) for item in enumerate(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_identical_requests_share_one_grok_call(stub, service, registry, make_detector):
+    config = stub(chunk_delay=0.02, chunk_size=8)
+    verdict = make_detector().predict_batch([TEXT])[0]
+    pred_class, pred_prob = int(verdict["label"] == "HOAX"), verdict["confidence"]
+    service = service()
+
+    # Teks sama setelah normalisasi dan kepercayaan di kelompok yang sama digabung
+    pendings = submit_concurrently(service, [(TEXT, pred_class, pred_prob)] * 5 + [(TEXT.upper(), pred_class, pred_prob)])
+    assert all(pending is pendings[0] for pending in pendings)
+    assert pendings[0].wait(5.0)
+
+    assert pendings[0].error is None and pendings[0].text == DEFAULT_REPLY
+    assert config.requests == 1
+    assert service.stats()["submitted"] == 1 and service.stats()["coalesced"] == 5
+    assert pendings[0].waiters == 6
+    assert registry.counter("validin_recommendations_total", source="grok") == 6
+
+def test_different_verdicts_are_not_coalesced(stub, service):
+    config = stub(chunk_delay=0.02)
+    service = service()
+
+    pendings = submit_concurrently(service, [(TEXT, 1, 91.0), (TEXT, 1, 95.0), (TEXT, 1, 71.0), (TEXT, 0, 91.0)])
+    for pending in pendings:
+        assert pending.wait(5.0) and pending.error is None
+
+    # 91 dan 95 berada di kelompok kepercayaan yang sama (CONFIDENCE_BUCKET)
+    assert pendings[0] is pendings[1]
+    assert len({id(pending) for pending in pendings}) == 3
+    assert config.requests == 3
+
+def test_finished_recommendation_is_served_from_cache(stub, service, registry):
+    config = stub()
+    service = service(cache=RecommendationCache(grok.PROMPT_VERSION))
+
+    first = service.submit(TEXT, 1, 90.0)
+    assert first.wait(5.0) and not first.cached
+    second = service.submit(TEXT, 1, 90.0)
+
+    assert second is not first and second.cached
+    assert second.text == first.text
+    assert config.requests == 1
+    assert registry.counter("validin_recommendations_total", source="cache") == 1
+
+def test_unavailable_and_full_queue_fall_back(stub, service, registry, monkeypatch):
+    stub(chunk_delay=0.2)
+    service = service(max_pending=1)
+
+    busy = service.submit(TEXT, 1, 90.0)
+    assert service.submit("Berita lain tentang harga beras", 0, 80.0) is None
+    assert service.stats()["rejected"] == 1
+    assert registry.counter("validin_fallback_total", reason="queue_full") == 1
+
+    monkeypatch.setattr(grok, "GROK_API_KEY", None)
+    assert service.submit("Berita ketiga", 0, 80.0) is None
+    assert registry.counter("validin_fallback_total", reason="unavailable") == 1
+    assert busy.wait(5.0)
+
+def test_recommendation_cache_survives_restart(stub, service, tmp_path):
+    config = stub()
+    path = str(tmp_path / "recommendations.db")
+    first = service(cache=RecommendationCache(grok.PROMPT_VERSION, path=path)).submit(TEXT, 1, 90.0)
+    assert first.wait(5.0) and first.error is None
+
+    # Proses baru: cache memori kosong, jawaban dibaca dari SQLite
+    restarted = service(cache=RecommendationCache(grok.PROMPT_VERSION, path=path))
+    assert restarted.submit("  presiden UMUMKAN vaksin gratis untuk seluruh warga mulai besok sebarkan", 1, 92.0).cached
+    assert config.requests == 1
+
+    # Kelas prediksi, kelompok kepercayaan atau versi prompt yang berbeda tidak memakai jawaban itu
+    assert not restarted.submit(TEXT, 0, 90.0).cached
+    assert not restarted.submit(TEXT, 1, 75.0).cached
+    assert not service(cache=RecommendationCache(grok.PROMPT_VERSION + 1, path=path)).submit(TEXT, 1, 90.0).cached
+
+def test_failed_recommendation_is_not_cached(stub, service, monkeypatch):
+    config = stub(rate_limit_ratio=1.0, retry_after=0)
+    monkeypatch.setattr(grok, "MAX_RETRIES", 1)
+    cache = RecommendationCache(grok.PROMPT_VERSION)
+    service = service(cache=cache)
+
+    failed = service.submit(TEXT, 1, 90.0)
+    assert failed.wait(5.0) and failed.error is not None
+    assert len(cache.memory) == 0
+
+    config.rate_limit_ratio = 0.0
+    retried = service.submit(TEXT, 1, 90.0)
+    assert retried.wait(5.0) and retried.error is None and not retried.cached
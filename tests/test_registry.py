@@ -0,0 +1,132 @@
+import threading
+
+import pytest
+
+import registry
+import startup
+from benchmarks.corpus import generate_corpus
+from benchmarks.standin import write_standin_numpy
+from metrics import Registry
+from registry import ModelManager, ModelRegistry
+from vocab import VOCAB_PATH
+
+class GatedModel:
+    """
+    Model yang menahan prediksi sampai gate dibuka, untuk permintaan yang sedang berjalan saat versi ditukar
+    """
+
+    def __init__(self, model, gate):
+        self.model = model
+        self.gate = gate
+        self.entered = threading.Event()
+
+    def predict_on_batch(self, padded):
+        self.entered.set()
+        self.gate.wait(5)
+        return self.model.predict_on_batch(padded)
+
+@pytest.fixture
+def models(tmp_path, monkeypatch, nltk_data):
+    """
+    Registry berisi v1 dan v2 (model pengganti dengan bobot berbeda) serta v-rusak yang gagal dimuat
+    """
+    monkeypatch.setattr(registry, "metrics", Registry(enabled=True))
+    models = ModelRegistry(str(tmp_path / "models"))
+    for version, seed, threshold in (("v1", 0, 0.5), ("v2", 1, 0.7)):
+        path = write_standin_numpy(str(tmp_path / f"{version}.npz"), seed=seed)
+        models.publish(version, path, VOCAB_PATH, "numpy", threshold)
+    broken = tmp_path / "broken.npz"
+    broken.write_bytes(b"bukan arsip npz")
+    models.publish("v-rusak", str(broken), VOCAB_PATH, "numpy", 0.5)
+    return models
+
+def make_manager(models, gate=None):
+    def load(manifest, shadow):
+        detector = startup.load_detector(
+            manifest["model"], manifest["vocab"], backend=manifest["backend"],
+            threshold=manifest["threshold"], metrics=Registry(enabled=True),
+        )
+        if gate is not None:
+            detector.model = GatedModel(detector.model, gate)
+        return detector
+    return ModelManager(models, load)
+
+def test_reload_swaps_to_promoted_version(models):
+    texts = generate_corpus(8, max_words=80, seed=21)
+    manager = make_manager(models)
+    with pytest.raises(LookupError):
+        manager.reload()
+
+    models.promote("v1")
+    assert manager.reload() == "v1"
+    first = manager.predict_batch(texts)
+    assert manager.threshold == 0.5
+    # Tanpa perubahan CURRENT tidak ada yang dimuat ulang
+    detector = manager.detector
+    assert manager.reload() == "v1" and manager.detector is detector
+
+    models.promote("v2")
+    assert manager.reload() == "v2"
+    second = manager.predict_batch(texts)
+    assert manager.threshold == 0.7
+    assert any(first) and first != second
+    assert manager.stats() == {"version": "v2", "swaps": 2, "shadow": None}
+    assert registry.metrics.counter("validin_model_swaps_total") == 2
+
+def test_failed_load_keeps_serving_previous_version(models):
+    texts = generate_corpus(4, max_words=80, seed=22)
+    manager = make_manager(models)
+    models.promote("v1")
+    manager.reload()
+    expected = manager.predict_batch(texts)
+
+    models.promote("v-rusak")
+    with pytest.raises(Exception):
+        manager.reload()
+    assert manager.version == "v1" and manager.swaps == 1
+    assert manager.predict_batch(texts) == expected
+
+    # Versi valid berikutnya tetap dapat diaktifkan
+    models.promote("v2")
+    assert manager.reload() == "v2" and manager.swaps == 2
+
+def test_watcher_reports_failed_load_and_picks_up_next_version(models, capsys):
+    manager = make_manager(models)
+    models.promote("v1")
+    manager.reload()
+
+    models.promote("v-rusak")
+    manager.start_watching(interval=0.05)
+    threading.Event().wait(0.3)
+    assert manager.version == "v1"
+    assert "Traceback" in capsys.readouterr().err
+
+    models.promote("v2")
+    for _ in range(100):
+        if manager.version == "v2":
+            break
+        threading.Event().wait(0.05)
+    assert manager.version == "v2"
+
+def test_in_flight_request_finishes_on_old_version(models):
+    texts = generate_corpus(4, max_words=80, seed=23)
+    gate = threading.Event()
+    manager = make_manager(models, gate)
+    models.promote("v1")
+    manager.reload()
+    old = manager.detector
+    gate.set()
+    expected = old.predict_batch(texts)
+    gate.clear()
+
+    results = []
+    request = threading.Thread(target=lambda: results.append(manager.predict_batch(texts)))
+    request.start()
+    assert old.model.entered.wait(5)
+    models.promote("v2")
+    manager.reload()
+    gate.set()
+    request.join(5)
+
+    assert manager.version == "v2" and manager.detector is not old
+    assert results == [expected]
@@ -0,0 +1,103 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.standin import write_standin_numpy
+from score import ResultWriter, read_chunks
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def rows(first, count):
+    return [{"row": i, "id": f"doc-{i}", "hoax_prob": 0.5, "label": "VALID", "confidence": 50.0} for i in range(first, first + count)]
+
+def test_jsonl_writer_drops_torn_line_and_resumes(tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    writer = ResultWriter(path)
+    writer.write(rows(0, 3))
+    writer.close()
+    # Proses terhenti di tengah penulisan baris keempat
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write('{"row": 3, "id": "doc-')
+
+    writer = ResultWriter(path)
+    assert writer.done == 3
+    writer.write(rows(3, 2))
+    writer.close()
+    with open(path, encoding="utf-8") as handle:
+        assert [json.loads(line)["row"] for line in handle] == [0, 1, 2, 3, 4]
+
+def test_csv_writer_counts_records_not_lines(tmp_path):
+    path = str(tmp_path / "out.csv")
+    writer = ResultWriter(path)
+    batch = rows(0, 3)
+    batch[1]["id"] = "id dengan\nbaris baru"
+    writer.write(batch)
+    writer.close()
+
+    writer = ResultWriter(path)
+    assert writer.done == 3
+    writer.write(rows(3, 1))
+    writer.close()
+    with open(path, encoding="utf-8", newline="") as handle:
+        records = list(csv.DictReader(handle))
+    assert [record["row"] for record in records] == ["0", "1", "2", "3"]
+    assert records[1]["id"] == "id dengan\nbaris baru"
+
+def test_restart_overwrites_previous_results(tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    writer = ResultWriter(path)
+    writer.write(rows(0, 3))
+    writer.close()
+    assert ResultWriter(path, resume=False).done == 0
+    assert os.path.getsize(path) == 0
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl"])
+def test_read_chunks_skips_records(tmp_path, extension):
+    path = str(tmp_path / f"in{extension}")
+    texts = [f"berita {i}\nbaris kedua\n\nbaris keempat" for i in range(10)]
+    if extension == ".csv":
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["id", "text"])
+            writer.writerows([[f"doc-{i}", text] for i, text in enumerate(texts)])
+    else:
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps({"id": f"doc-{i}", "text": text}) + "\n" for i, text in enumerate(texts))
+
+    chunks = list(read_chunks(path, "text", "id", chunk_size=3, skip=4))
+    assert [offset for offset, _, _ in chunks] == [4, 6, 9]
+    assert [doc_id for _, ids, _ in chunks for doc_id in ids] == [f"doc-{i}" for i in range(4, 10)]
+    assert [text for _, _, chunk in chunks for text in chunk] == texts[4:]
+
+def run_score(input_path, output_path, model_path):
+    subprocess.run(
+        [sys.executable, "score.py", input_path, "--output", output_path, "--id-column", "id",
+         "--backend", "numpy", "--model", model_path, "--workers", "1", "--batch-size", "8", "--chunk-size", "16"],
+        cwd=ROOT, check=True, capture_output=True,
+    )
+    with open(output_path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+def test_interrupted_run_resumes_to_same_output(tmp_path, nltk_data):
+    model_path = write_standin_numpy(str(tmp_path / "standin.npz"))
+    input_path = str(tmp_path / "corpus.csv")
+    with open(input_path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["id", "text"])
+        # Teks berkutip dengan baris baru, agar resume terbukti dihitung per record
+        writer.writerows([[f"doc-{i}", text.replace(" ", "\n", 1)] for i, text in enumerate(generate_corpus(40, max_words=80, seed=7))])
+
+    expected = run_score(input_path, str(tmp_path / "full.jsonl"), model_path)
+    assert [row["row"] for row in expected] == list(range(40))
+
+    # Hasil parsial: 13 baris lengkap dan satu baris terpotong
+    partial = str(tmp_path / "partial.jsonl")
+    with open(partial, "w", encoding="utf-8") as handle:
+        handle.writelines(json.dumps(row) + "\n" for row in expected[:13])
+        handle.write(json.dumps(expected[13])[:20])
+    assert run_score(input_path, partial, model_path) == expected
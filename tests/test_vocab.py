@@ -0,0 +1,109 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import pipeline
+from benchmarks.corpus import generate_corpus
+from encoder import SequenceEncoder
+from tests.test_preprocess import EDGE_CASES
+from vocab import TOKENIZER_PATH, VOCAB_PATH, export_vocabulary, load_tokenizer, load_vocabulary
+
+@pytest.fixture(scope="module")
+def vocabulary():
+    if not os.path.exists(VOCAB_PATH):
+        pytest.skip(f"{VOCAB_PATH} tidak ditemukan")
+    return load_vocabulary(VOCAB_PATH)
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    pytest.importorskip("tensorflow")
+    if not os.path.exists(TOKENIZER_PATH):
+        pytest.skip(f"{TOKENIZER_PATH} tidak ditemukan")
+    return load_tokenizer(TOKENIZER_PATH)
+
+@pytest.fixture(scope="module")
+def encoder(vocabulary, nltk_data):
+    return SequenceEncoder(vocabulary, nltk_data, max_len=pipeline.max_len)
+
+def pre_pad(sequences, max_len):
+    """
+    pad_sequences(padding='pre', truncating='pre') tanpa TensorFlow
+    """
+    matrix = np.zeros((len(sequences), max_len), dtype=np.int32)
+    for row, seq in enumerate(sequences):
+        seq = seq[-max_len:]
+        if seq:
+            matrix[row, max_len - len(seq):] = seq
+    return matrix
+
+def test_vocabulary_matches_tokenizer(vocabulary, tokenizer, nltk_data):
+    texts = [" ".join(pipeline.preprocess(text)) for text in generate_corpus(300, max_words=400, seed=3) + EDGE_CASES]
+    # Kata di luar num_words juga harus diperlakukan sama (OOV atau dibuang)
+    texts.append(" ".join(list(tokenizer.word_index)[::50]))
+    assert vocabulary.texts_to_sequences(texts) == tokenizer.texts_to_sequences(texts)
+    assert vocabulary.oov_id == (tokenizer.word_index.get(tokenizer.oov_token) if tokenizer.oov_token else None)
+
+def test_encoder_matches_texts_to_sequences(vocabulary, encoder, nltk_data):
+    texts = generate_corpus(300, max_words=600, seed=4) + EDGE_CASES
+    matrix, lengths = encoder.encode(pipeline.normalize_batch(texts))
+    sequences = vocabulary.texts_to_sequences([" ".join(pipeline.preprocess(text)) for text in texts])
+    assert matrix.dtype == np.int32
+    np.testing.assert_array_equal(matrix, pre_pad(sequences, pipeline.max_len))
+    np.testing.assert_array_equal(lengths, [min(len(seq), pipeline.max_len) for seq in sequences])
+
+def test_encoder_matches_pad_sequences(vocabulary, encoder, nltk_data):
+    sequence = pytest.importorskip("tensorflow.keras.preprocessing.sequence")
+    texts = generate_corpus(64, max_words=600, seed=5)
+    matrix, _ = encoder.encode(pipeline.normalize_batch(texts))
+    expected = sequence.pad_sequences(
+        vocabulary.texts_to_sequences([" ".join(pipeline.preprocess(text)) for text in texts]),
+        maxlen=pipeline.max_len, padding='pre',
+    )
+    np.testing.assert_array_equal(matrix, expected)
+
+def test_encoder_empty_and_unknown_text(encoder):
+    matrix, lengths = encoder.encode([[], ["zzzzqqq", "xxxyyy"], pipeline.normalize("\t \n")])
+    if encoder.oov_id is None:
+        assert not matrix.any()
+        assert lengths.tolist() == [0, 0, 0]
+    else:
+        assert lengths.tolist() == [0, 2, 0]
+
+def test_encoder_truncates_from_the_front(vocabulary, encoder):
+    words = [word for word in vocabulary.words if word not in encoder.stop_words][:pipeline.max_len + 50]
+    matrix, lengths = encoder.encode([words])
+    assert lengths[0] == pipeline.max_len
+    np.testing.assert_array_equal(matrix[0], [vocabulary.get(word) for word in words[-pipeline.max_len:]])
+
+def test_encoder_writes_into_given_buffer(encoder):
+    expected, _ = encoder.encode([["presiden", "warga"]])
+    out = np.full((1, pipeline.max_len), -1, dtype=np.int32)
+    matrix, _ = encoder.encode([["presiden", "warga"]], out=out)
+    assert matrix is out
+    np.testing.assert_array_equal(out, expected)
+
+def test_lookup_reads_sorted_table(tmp_path):
+    # Kata non-ASCII ikut diuji: pencarian biner membandingkan byte UTF-8
+    words = ["warga", "berita", "ünïcödé", "straße", "a", "zz", "0", "presiden", "naïve", "😱"]
+    tokenizer = SimpleNamespace(
+        word_index={word: i + 1 for i, word in enumerate(words)},
+        num_words=None, oov_token=None, filters="", lower=True, split=" ",
+    )
+    path = str(tmp_path / "vocab.bin")
+    export_vocabulary(tokenizer, path)
+    vocabulary = load_vocabulary(path)
+
+    assert list(vocabulary.words) == sorted(words)
+    assert len(vocabulary) == len(words)
+    for word, i in tokenizer.word_index.items():
+        assert vocabulary.get(word) == i and word in vocabulary
+    for word in ["", "b", "zzz", "wargaa", "Warga", "ñ"]:
+        assert vocabulary.get(word) is None and word not in vocabulary
+
+def test_encoder_memo_is_bounded(vocabulary):
+    encoder = SequenceEncoder(vocabulary, (), max_len=pipeline.max_len, memo_size=8)
+    words = list(vocabulary.words[:20]) + [f"oov{i}" for i in range(20)]
+    assert encoder.token_ids(words) == [i for i in (vocabulary.get(word) for word in words) if i is not None]
+    assert len(encoder._memo) <= 8
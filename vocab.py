@@ -0,0 +1,221 @@
+import argparse
+import json
+import mmap
+import os
+import pickle
+
+import numpy as np
+
+# Lokasi artefak kosakata hasil ekspor
+VOCAB_PATH = 'vocab.bin'
+TOKENIZER_PATH = 'tokenizer.pkl'
+
+# Format file:
+#   magic (8 byte) | panjang header (uint32) | header JSON | padding ke kelipatan 4
+#   offsets int32[count + 1] | ids int32[count] | blob UTF-8 kata-kata yang sudah diurutkan
+_MAGIC = b"VALIDINV"
+_FORMAT_VERSION = 1
+
+def _align(n):
+    return (n + 3) & ~3
+
+class WordTable:
+    """
+    Tabel kata terurut di dalam buffer (mmap); kata ke-i didekode hanya saat diakses
+    sehingga tabel tidak pernah disalin utuh ke heap Python
+    """
+
+    __slots__ = ("_buf", "_offsets", "_start")
+
+    def __init__(self, buf, offsets, start):
+        self._buf = buf
+        # memoryview memberi int Python langsung per indeks (jauh lebih murah daripada skalar numpy);
+        # tanpa salinan pada mesin little-endian
+        self._offsets = memoryview(np.ascontiguousarray(offsets, dtype=np.int32))
+        self._start = start
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("indeks kata di luar tabel")
+        return str(self._buf[self._start + self._offsets[i]:self._start + self._offsets[i + 1]], "utf-8")
+
+    def find(self, word):
+        """
+        Indeks kata lewat pencarian biner atas byte UTF-8 (urutan byte UTF-8 sama dengan
+        urutan str yang dipakai saat ekspor); -1 jika tidak ada
+        """
+        key = word.encode("utf-8")
+        buf, offsets, start = self._buf, self._offsets, self._start
+        lo, hi = 0, len(offsets) - 1
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if buf[start + offsets[mid]:start + offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(offsets) - 1 and buf[start + offsets[lo]:start + offsets[lo + 1]] == key:
+            return lo
+        return -1
+
+class Vocabulary:
+    """
+    Kosakata beku hasil ekspor Tokenizer Keras; hanya berisi kata yang dipakai model.
+    Kata dicari dengan pencarian biner langsung di WordTable (mmap), tanpa dict
+    """
+
+    __slots__ = ("words", "ids", "num_words", "oov_id", "filters", "lower", "split", "_translate")
+
+    def __init__(self, words, ids, num_words=None, oov_id=None, filters='', lower=True, split=' '):
+        self.words = words
+        self.ids = ids
+        self.num_words = num_words
+        self.oov_id = oov_id
+        self.filters = filters
+        self.lower = lower
+        self.split = split
+        self._translate = str.maketrans({c: split for c in filters})
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    def get(self, word, default=None):
+        i = self.words.find(word)
+        return int(self.ids[i]) if i >= 0 else default
+
+    def text_to_word_sequence(self, text):
+        """
+        Memecah teks dengan aturan yang sama seperti keras text_to_word_sequence
+        """
+        if self.lower:
+            text = text.lower()
+        text = text.translate(self._translate)
+        return [w for w in text.split(self.split) if w]
+
+    def texts_to_sequences(self, texts):
+        """
+        Pengganti Tokenizer.texts_to_sequences dengan hasil yang identik
+        """
+        sequences = []
+        # Kata yang berulang dalam satu panggilan cukup dicari sekali di tabel
+        seen = {}
+        for text in texts:
+            seq = []
+            for word in self.text_to_word_sequence(text):
+                i = seen.get(word, -1)
+                if i == -1:
+                    i = seen[word] = self.get(word)
+                if i is not None:
+                    seq.append(i)
+                elif self.oov_id is not None:
+                    seq.append(self.oov_id)
+            sequences.append(seq)
+        return sequences
+
+def load_tokenizer(path=TOKENIZER_PATH):
+    """
+    Memuat Tokenizer Keras dari pickle; hanya dipakai saat membangun artefak kosakata
+    """
+    with open(path, 'rb') as handle:
+        return pickle.load(handle)
+
+def export_vocabulary(tokenizer, path=VOCAB_PATH, num_words=None):
+    """
+    Menyimpan kosakata yang sudah dipangkas ke num_words sebagai file biner yang bisa di-mmap
+    """
+    num_words = num_words or tokenizer.num_words
+    oov_id = tokenizer.word_index.get(tokenizer.oov_token) if tokenizer.oov_token else None
+
+    # Tokenizer mengganti indeks >= num_words dengan OOV (atau membuangnya)
+    entries = sorted(
+        (word, i) for word, i in tokenizer.word_index.items()
+        if (num_words is None or i < num_words) and word != tokenizer.oov_token
+    )
+    encoded = [word.encode("utf-8") for word, _ in entries]
+    offsets = np.zeros(len(entries) + 1, dtype="<i4")
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    ids = np.array([i for _, i in entries], dtype="<i4")
+
+    header = json.dumps({
+        "version": _FORMAT_VERSION,
+        "count": len(entries),
+        "num_words": num_words,
+        "oov_id": oov_id,
+        "filters": tokenizer.filters,
+        "lower": tokenizer.lower,
+        "split": tokenizer.split,
+    }).encode("utf-8")
+    preamble = len(_MAGIC) + 4 + len(header)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(_MAGIC)
+        handle.write(np.uint32(len(header)).tobytes())
+        handle.write(header)
+        handle.write(b"\0" * (_align(preamble) - preamble))
+        handle.write(offsets.tobytes())
+        handle.write(ids.tobytes())
+        handle.write(b"".join(encoded))
+    os.replace(tmp_path, path)
+    return len(entries)
+
+def load_vocabulary(path=VOCAB_PATH):
+    """
+    Memuat artefak kosakata lewat mmap tanpa unpickle; tabel kata dan id tetap di mmap
+    """
+    with open(path, "rb") as handle:
+        buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buf[:len(_MAGIC)] != _MAGIC:
+        raise ValueError(f"{path} bukan file kosakata Validin")
+    header_len = int(np.frombuffer(buf, dtype="<u4", count=1, offset=len(_MAGIC))[0])
+    start = len(_MAGIC) + 4
+    header = json.loads(bytes(buf[start:start + header_len]).decode("utf-8"))
+    if header["version"] != _FORMAT_VERSION:
+        raise ValueError(f"Versi format kosakata {header['version']} tidak didukung")
+
+    count = header["count"]
+    offset = _align(start + header_len)
+    offsets = np.frombuffer(buf, dtype="<i4", count=count + 1, offset=offset)
+    offset += offsets.nbytes
+    ids = np.frombuffer(buf, dtype="<i4", count=count, offset=offset)
+    offset += ids.nbytes
+
+    return Vocabulary(
+        WordTable(buf, offsets, offset), ids,
+        num_words=header["num_words"],
+        oov_id=header["oov_id"],
+        filters=header["filters"],
+        lower=header["lower"],
+        split=header["split"],
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Ekspor kosakata ringkas dari tokenizer.pkl")
+    parser.add_argument("--tokenizer", default=TOKENIZER_PATH)
+    parser.add_argument("--out", default=VOCAB_PATH)
+    parser.add_argument("--num-words", type=int, default=None)
+    args = parser.parse_args()
+
+    tokenizer = load_tokenizer(args.tokenizer)
+    count = export_vocabulary(tokenizer, args.out, args.num_words)
+    vocabulary = load_vocabulary(args.out)
+
+    # Pastikan hasil ekspor memberi urutan indeks yang sama dengan Tokenizer asli
+    sample = [" ".join(list(tokenizer.word_index)[:20000:7])]
+    if vocabulary.texts_to_sequences(sample) != tokenizer.texts_to_sequences(sample):
+        raise SystemExit("Hasil ekspor tidak cocok dengan tokenizer asli")
+
+    print(f"{count} kata ditulis ke {args.out} ({os.path.getsize(args.out)} byte)")
+
+if __name__ == "__main__":
+    main()